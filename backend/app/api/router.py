@@ -1,12 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 
+from .routes.admin import router as admin_router
 from .routes.fires import router as fires_router
 from ..core.config import settings
+from ..core.metrics import render_metrics
 from utils.data_availability import check_data_availability
 from utils.http_exceptions import HTTPExceptionFactory
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(fires_router)
+api_router.include_router(admin_router)
 
 
 @api_router.get("/health", tags=["system"])
@@ -15,6 +19,21 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@api_router.get("/warmup", tags=["system"])
+async def warmup_status(request: Request) -> dict:
+    """Progress of the background cache warm-up."""
+    warmer = getattr(request.app.state, "warmer", None)
+    if warmer is None:
+        return {"state": "disabled"}
+    return warmer.status()
+
+
+@api_router.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of latency histograms, upstream bytes and cache ratios."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @api_router.get("/debug/availability", tags=["system"])
 async def debug_availability(sensor: str = "ALL") -> dict[str, tuple[str, str]]:
     """Return FIRMS availability metadata for the configured MAP key.
@@ -27,7 +46,7 @@ async def debug_availability(sensor: str = "ALL") -> dict[str, tuple[str, str]]:
         raise HTTPExceptionFactory.service_unavailable(str(exc)) from exc
 
     try:
-        return check_data_availability(key, sensor)
+        return check_data_availability(key, sensor, base_url=settings.firms_base_url)
     except Exception as exc:  # pragma: no cover - passthrough diagnostics
         raise HTTPExceptionFactory.service_unavailable(
             "Failed to query FIRMS availability. Check your MAP key and network access.",
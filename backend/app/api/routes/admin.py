@@ -0,0 +1,83 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Query
+
+from ...core.auth import require_admin
+from ...services.cache_admin import (
+    AvailabilityLayer,
+    CacheAdmin,
+    CacheSelector,
+    CountriesLayer,
+    TTLCacheLayer,
+)
+from utils.http_exceptions import HTTPExceptionFactory
+from .fires import _parse_bbox, density, service
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+caches = CacheAdmin()
+caches.register("availability", AvailabilityLayer())
+caches.register("countries", CountriesLayer())
+caches.register("partitions", TTLCacheLayer(service.partitions.entries, keyed=True, stats=service.partitions.stats))
+caches.register("responses", TTLCacheLayer(service.pages.results))
+caches.register("tiles", TTLCacheLayer(density.cache, keyed=True))
+
+
+def cache_selector(
+    source: str | None = Query(default=None),
+    start_date: str | None = Query(default=None),
+    end_date: str | None = Query(default=None),
+    day: str | None = Query(default=None, description="Shorthand for start_date=end_date=day"),
+    bbox: str | None = Query(default=None, description="west,south,east,north; entries intersecting it"),
+) -> CacheSelector:
+    start_date, end_date = (day, day) if day else (start_date, end_date)
+    west, south, east, north = _parse_bbox(bbox)
+    return CacheSelector(
+        source=source.upper() if source else None,
+        start=service._parse_date(start_date) if start_date else None,
+        end=service._parse_date(end_date) if end_date else None,
+        area=None if west is None else (west, south, east, north),
+    )
+
+
+def _layer(name: str):
+    layer = caches.layers.get(name)
+    if layer is None:
+        raise HTTPExceptionFactory.not_found(f"Unknown cache layer {name!r}", details=sorted(caches.layers))
+    return layer
+
+
+@router.get("/cache")
+async def list_caches() -> Dict[str, Any]:
+    """Entries, approximate bytes, hit/miss/eviction counters, TTL and age histogram per layer."""
+    return {"layers": caches.describe()}
+
+
+@router.get("/cache/{name}")
+async def get_cache(name: str) -> Dict[str, Any]:
+    return _layer(name).describe()
+
+
+@router.delete("/cache")
+async def invalidate_caches(selector: CacheSelector = Depends(cache_selector)) -> Dict[str, Any]:
+    """Invalidate matching entries in every layer, e.g. after FIRMS reprocessed a day.
+
+    Layers whose keys carry no source/day/region are only flushed when no
+    filter is given; the availability cache is cleared by ``source`` alone.
+    """
+    return {"removed": caches.invalidate(selector)}
+
+
+@router.delete("/cache/{name}")
+async def invalidate_cache(name: str, selector: CacheSelector = Depends(cache_selector)) -> Dict[str, Any]:
+    return {"removed": {name: _layer(name).invalidate(selector)}}
+
+
+@router.put("/cache/{name}/ttl")
+async def set_cache_ttl(
+    name: str,
+    seconds: float = Query(gt=0, description="New TTL; lasts until restart"),
+) -> Dict[str, Any]:
+    layer = _layer(name)
+    layer.set_ttl(seconds)
+    return layer.describe()
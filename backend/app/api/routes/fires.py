@@ -1,11 +1,91 @@
-from fastapi import APIRouter, Query, Request, Response
-from fastapi.responses import StreamingResponse
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from ...services.fires import FireService
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from ...schemas.fires import FireBatchRequest
+from ...services.density import DensityService, render
+from ...clients.firms import record_id
+from ...services.delta import decode_version, diff, encode_version
+from ...services.fires import COUNTRY_BBOX, FireQueryContext, FireService
+from ...services.live import LiveHub
+from ...services.pages import DEFAULT_PAGE_SIZE, RowKey, decode_cursor
+from utils.http_exceptions import HTTPExceptionFactory
 from ...core.config import settings
 
 router = APIRouter(prefix="/fires", tags=["fires"])
 service = FireService()
+density = DensityService(service)
+live = LiveHub(service, interval=settings.live_poll_interval, tile_degrees=settings.live_tile_degrees)
+
+# Query parameters that change which records a result holds, beyond area and dates
+FILTER_PARAMS = ("minConfidence", "minFrp", "maxFrp", "daynight", "satellite", "timeFrom", "timeTo")
+# Everything a cursor needs to re-run its query on any worker
+CURSOR_PARAMS = (
+    "country", "west", "south", "east", "north", "start_date", "end_date", "sourcePriority", *FILTER_PARAMS
+)
+
+# Comment line sent on idle live streams so proxies keep the connection open
+LIVE_KEEPALIVE_SECONDS = 15.0
+
+
+def record_filter(
+    min_confidence: str | None = Query(default=None, alias="minConfidence"),
+    min_frp: float | None = Query(default=None, alias="minFrp", ge=0),
+    max_frp: float | None = Query(default=None, alias="maxFrp", ge=0),
+    daynight: str | None = Query(default=None, pattern=r"^[DNdn]$"),
+    satellite: str | None = Query(default=None),
+    time_from: str | None = Query(default=None, alias="timeFrom"),
+    time_to: str | None = Query(default=None, alias="timeTo"),
+) -> Optional[Callable[[Dict], bool]]:
+    """Shared filter parameters, compiled once per request into a row predicate."""
+    return service.compile_filter(
+        min_confidence=min_confidence,
+        min_frp=min_frp,
+        max_frp=max_frp,
+        daynight=daynight,
+        satellite=satellite,
+        time_from=time_from,
+        time_to=time_to,
+    )
+
+
+def _cursor_filter(query: Dict[str, str]) -> Optional[Callable[[Dict], bool]]:
+    """:func:`record_filter` for the filter parameters carried by a cursor."""
+    min_frp, max_frp = query.get("minFrp"), query.get("maxFrp")
+    return record_filter(
+        min_confidence=query.get("minConfidence"),
+        min_frp=float(min_frp) if min_frp else None,
+        max_frp=float(max_frp) if max_frp else None,
+        daynight=query.get("daynight"),
+        satellite=query.get("satellite"),
+        time_from=query.get("timeFrom"),
+        time_to=query.get("timeTo"),
+    )
+
+
+def request_deadline(
+    deadline_ms: int | None = Query(default=None, alias="deadlineMs", ge=1, le=600000),
+) -> Optional[float]:
+    """Monotonic time by which upstream data must arrive, from ``deadlineMs`` or REQUEST_DEADLINE_MS."""
+    budget = deadline_ms or settings.request_deadline_ms
+    return time.monotonic() + budget / 1000 if budget else None
+
+
+def _mark_partial(result: Response, ctx: Optional[FireQueryContext]) -> Response:
+    """Flag a response built without some upstream segments, naming them as ``first/last`` days."""
+    if ctx is not None and ctx.missing:
+        result.headers["X-Partial-Result"] = "true"
+        result.headers["X-Missing-Segments"] = ",".join(
+            f"{first.isoformat()}/{last.isoformat()}" for first, last in ctx.missing
+        )
+    return result
 
 
 @router.get("")
@@ -22,7 +102,47 @@ async def get_fires(
     source_priority: str | None = Query(default=None, alias="sourcePriority"),
     format: str = Query(default="geojson", pattern=r"^(json|geojson)$"),
     max_concurrency: int = Query(default=None, alias="maxConcurrency", ge=1, le=20),
+    fields: str | None = Query(default=None),
+    precision: int | None = Query(default=None, ge=0, le=8),
+    group_by: str | None = Query(default=None, alias="groupBy", pattern=r"^day$"),
+    limit: int | None = Query(default=None, ge=1, le=10000),
+    cursor: str | None = Query(default=None),
+    since: str | None = Query(default=None, description="X-Version of a previous response"),
+    predicate: Optional[Callable[[Dict], bool]] = Depends(record_filter),
+    deadline: Optional[float] = Depends(request_deadline),
 ):
+    projection = service.parse_fields(fields)
+    ndjson = "application/x-ndjson" in request.headers.get("accept", "")
+    paged = limit is not None or cursor is not None
+    if paged and group_by == "day":
+        raise HTTPExceptionFactory.bad_request("limit and cursor cannot be combined with groupBy=day")
+    if since is not None and (paged or group_by == "day"):
+        raise HTTPExceptionFactory.bad_request("since cannot be combined with limit, cursor or groupBy")
+    previous = None
+    if since:
+        try:
+            previous = decode_version(since)
+        except ValueError as exc:
+            raise HTTPExceptionFactory.bad_request("Invalid version token") from exc
+    query = {k: v for k, v in request.query_params.items() if k in CURSOR_PARAMS}
+    after: Optional[RowKey] = None
+    if cursor is not None:
+        # Later pages follow the cursor's query; the request's own query params are not re-evaluated
+        limit = limit or DEFAULT_PAGE_SIZE
+        try:
+            query, after, result_id = decode_cursor(cursor)
+            page = service.pages.page(result_id, after, limit)
+            if page is not None:
+                return _page_response(page, format, projection, precision)
+            # Issued by another worker or no longer cached: re-run the query and resume after its last row
+            country, start_date, end_date = query.get("country"), query.get("start_date"), query.get("end_date")
+            west, south, east, north = (
+                float(query[k]) if k in query else None for k in ("west", "south", "east", "north")
+            )
+            source_priority = query.get("sourcePriority")
+            predicate = _cursor_filter(query)
+        except ValueError as exc:
+            raise HTTPExceptionFactory.bad_request("Invalid cursor") from exc
     ctx = await service.prepare_query(
         response=response,
         country=country,
@@ -36,19 +156,308 @@ async def get_fires(
     )
 
     if ctx is None:
+        if group_by == "day":
+            start, end = service._parse_date(start_date), service._parse_date(end_date)
+            return _day_response(service.bucket_by_day([], start, end), format, projection, precision, ndjson)
+        if paged:
+            return JSONResponse(service.empty_response(format), headers={"X-Total-Count": "0"})
         return service.empty_response(format)
+    ctx.fields, ctx.precision, ctx.predicate = projection, precision, predicate
+    ctx.deadline = deadline
+    ticket = await service.admit(ctx)
 
-    if "application/x-ndjson" in request.headers.get("accept", ""):
+    if ndjson and group_by is None and since is None and not paged:
         async def stream():
-            async for chunk in service.stream_ndjson(ctx):
-                yield chunk
+            try:
+                async for chunk in service.stream_ndjson(ctx):
+                    yield chunk
+            finally:
+                ticket.release()
+
+        # The background task also releases when the client leaves before the stream starts
+        return StreamingResponse(stream(), media_type="application/x-ndjson", background=BackgroundTask(ticket.release))
+
+    async with ticket:
+        if group_by == "day":
+            data = await service.fetch(ctx, max_concurrency=max_concurrency)
+            buckets = service.bucket_by_day(data, ctx.start, ctx.end)
+            return _mark_partial(_day_response(buckets, format, projection, precision, ndjson), ctx)
 
-        return StreamingResponse(stream(), media_type="application/x-ndjson")
+        if since is not None:
+            data = await service.fetch(ctx, max_concurrency=max_concurrency)
+            return _mark_partial(
+                _versioned_response(request, ctx, data, previous, format, projection, precision), ctx
+            )
 
-    data = await service.fetch(ctx, max_concurrency=max_concurrency)
+        if paged:
+            data = await service.fetch(ctx, max_concurrency=max_concurrency)
+            page = service.pages.materialize(query, data, after, limit)
+            return _mark_partial(_page_response(page, format, projection, precision), ctx)
+
+        data = await service.fetch(ctx, max_concurrency=max_concurrency)
+        # Already plain JSON types, so skip FastAPI's jsonable_encoder pass.
+        if format == "geojson":
+            return _mark_partial(JSONResponse(service.to_geojson(data, ctx.fields, ctx.precision)), ctx)
+        return _mark_partial(JSONResponse(service.project(data, ctx.fields, ctx.precision)), ctx)
+
+
+def _versioned_response(
+    request: Request,
+    ctx: FireQueryContext,
+    data: List[Dict],
+    previous: Optional[Tuple[str, Dict]],
+    format: str,
+    fields: Optional[Tuple[str, ...]],
+    precision: Optional[int],
+) -> Response:
+    """Result with feature ids and an ``X-Version`` token, or only its changes.
+
+    When ``previous`` (the decoded ``since`` token) is for the same query and
+    its partition versions are still known, the body holds just the records
+    added since then plus the ids of ``removed`` ones (``X-Delta: delta``);
+    otherwise it is the full result (``X-Delta: full``).
+    """
+    filters = sorted((k, v) for k, v in request.query_params.items() if k in FILTER_PARAMS)
+    identity = [ctx.selected_source, list(ctx.area), ctx.start.isoformat(), ctx.end.isoformat(), filters]
+    query = hashlib.sha1(json.dumps(identity).encode("utf-8")).hexdigest()[:16]
+    versions = service.partition_versions(ctx)
+    delta = None
+    headers = {}
+    if versions is not None:
+        headers["X-Version"] = encode_version(query, versions)
+        if previous is not None and previous[0] == query:
+            delta = diff(data, ctx.area, previous[1], versions, service.partitions)
+    headers["X-Delta"] = "full" if delta is None else "delta"
+    rows = data if delta is None else delta.added
     if format == "geojson":
-        return service.to_geojson(data)
-    return data
+        body: Any = service.to_geojson(rows, fields, precision, record_id)
+        if delta is not None:
+            body["removed"] = delta.removed
+    else:
+        body = service.project(rows, fields, precision, record_id)
+        if delta is not None:
+            body = {"added": body, "removed": delta.removed}
+    return JSONResponse(body, headers=headers)
+
+
+def _page_response(
+    page: Tuple[List[Dict], Optional[str], int],
+    format: str,
+    fields: Optional[Tuple[str, ...]],
+    precision: Optional[int],
+) -> Response:
+    """One page of a sorted result; ``X-Next-Cursor`` is set while rows remain."""
+    rows, next_cursor, total = page
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    if format == "geojson":
+        return JSONResponse(service.to_geojson(rows, fields, precision), headers=headers)
+    return JSONResponse(service.project(rows, fields, precision), headers=headers)
+
+
+def _day_response(
+    buckets: Dict[str, List[Dict]],
+    format: str,
+    fields: Optional[Tuple[str, ...]],
+    precision: Optional[int],
+    ndjson: bool,
+) -> Response:
+    """Encode ``groupBy=day`` output: one self-contained block per day.
+
+    Each block is ``{"date", "count", "data"}`` where ``data`` is a full
+    FeatureCollection (or record list for ``format=json``). As NDJSON every
+    block is its own line, so days can be decoded as they arrive.
+    """
+
+    def block(day: str, rows: List[Dict]) -> Dict[str, Any]:
+        if format == "geojson":
+            data = service.to_geojson(rows, fields, precision)
+            count = len(data["features"])
+        else:
+            data = service.project(rows, fields, precision)
+            count = len(data)
+        return {"date": day, "count": count, "data": data}
+
+    if ndjson:
+        def lines():
+            for day, rows in buckets.items():
+                yield (json.dumps(block(day, rows)) + "\n").encode("utf-8")
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    days = [block(day, rows) for day, rows in buckets.items()]
+    return JSONResponse(
+        {
+            "groupBy": "day",
+            "total": sum(d["count"] for d in days),
+            "counts": {d["date"]: d["count"] for d in days},
+            "days": days,
+        }
+    )
+
+
+@router.post("/batch")
+async def get_fires_batch(request: Request, body: FireBatchRequest):
+    """Run several fire queries at once, fetching each shared upstream URL only once.
+
+    Returns ``{"results": [...]}`` in query order, or with
+    ``Accept: application/x-ndjson`` one multiplexed stream of
+    ``{"query": i, "feature": ...}`` lines ending each query with
+    ``{"query": i, "done": true, ...}`` as soon as its data is ready.
+    """
+    projection = service.parse_fields(body.fields)
+    predicate = service.compile_filter(
+        min_confidence=body.min_confidence,
+        min_frp=body.min_frp,
+        max_frp=body.max_frp,
+        daynight=body.daynight,
+        satellite=body.satellite,
+        time_from=body.time_from,
+        time_to=body.time_to,
+    )
+
+    deadline = request_deadline(body.deadline_ms)
+    entries: List[Dict[str, Any]] = []
+    ctxs: List[FireQueryContext] = []
+    positions: List[int] = []
+    for index, query in enumerate(body.queries):
+        entry: Dict[str, Any] = {"index": index, "selected_source": None}
+        scratch = Response()
+        try:
+            ctx = await service.prepare_query(
+                response=scratch,
+                country=query.country,
+                west=query.west,
+                south=query.south,
+                east=query.east,
+                north=query.north,
+                start_date=query.start_date,
+                end_date=query.end_date,
+                source_priority=query.source_priority,
+            )
+        except HTTPException as exc:
+            entry["error"] = exc.detail
+            entries.append(entry)
+            continue
+        if ctx is None:
+            entry["note"] = scratch.headers.get("X-Data-Availability")
+        else:
+            ctx.fields, ctx.precision, ctx.predicate = projection, body.precision, predicate
+            ctx.deadline = deadline
+            entry["selected_source"] = ctx.selected_source
+            ctxs.append(ctx)
+            positions.append(index)
+        entries.append(entry)
+
+    def encode(records: List[Dict]) -> Any:
+        if body.format == "geojson":
+            return service.to_geojson(records, projection, body.precision)
+        return service.project(records, projection, body.precision)
+
+    # The batch is admitted as a whole, costing the sum of its queries
+    ticket = await service.admit(*ctxs)
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        async def stream():
+            try:
+                fetched = set(positions)
+                for entry in entries:
+                    if entry["index"] not in fetched:
+                        status = _entry_status(entry, 0)
+                        yield (json.dumps({"query": entry["index"], **status}) + "\n").encode("utf-8")
+                async for pos, records in service.iter_batch(ctxs, max_concurrency=body.max_concurrency):
+                    index = positions[pos]
+                    _note_missing(entries[index], ctxs[pos])
+                    encoded = encode(records)
+                    items = encoded["features"] if body.format == "geojson" else encoded
+                    for item in items:
+                        yield (json.dumps({"query": index, "feature": item}) + "\n").encode("utf-8")
+                    status = _entry_status(entries[index], len(items))
+                    yield (json.dumps({"query": index, **status}) + "\n").encode("utf-8")
+            finally:
+                ticket.release()
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson", background=BackgroundTask(ticket.release))
+
+    async with ticket:
+        results = await service.fetch_batch(ctxs, max_concurrency=body.max_concurrency)
+        for pos, records in enumerate(results):
+            _note_missing(entries[positions[pos]], ctxs[pos])
+            entries[positions[pos]]["data"] = encode(records)
+    for entry in entries:
+        if "data" not in entry and "error" not in entry:
+            entry["data"] = service.empty_response(body.format)
+    result = JSONResponse({"results": entries})
+    if any("missing_segments" in entry for entry in entries):
+        result.headers["X-Partial-Result"] = "true"
+    return result
+
+
+def _note_missing(entry: Dict[str, Any], ctx: FireQueryContext) -> None:
+    """List the ``first/last`` day ranges a sub-query lost to the batch deadline."""
+    if ctx.missing:
+        entry["missing_segments"] = [f"{first.isoformat()}/{last.isoformat()}" for first, last in ctx.missing]
+
+
+def _entry_status(entry: Dict[str, Any], count: int) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"done": True, "count": count, "selected_source": entry["selected_source"]}
+    for key in ("note", "error", "missing_segments"):
+        if key in entry:
+            status[key] = entry[key]
+    return status
+
+
+@router.get("/events")
+async def get_fire_events(
+    response: Response,
+    country: str | None = Query(default=None),
+    west: float | None = Query(default=None),
+    south: float | None = Query(default=None),
+    east: float | None = Query(default=None),
+    north: float | None = Query(default=None),
+    start_date: str | None = Query(default=None),
+    end_date: str | None = Query(default=None),
+    source_priority: str | None = Query(default=None, alias="sourcePriority"),
+    distance_km: float = Query(default=1.0, alias="distanceKm", gt=0, le=50),
+    gap_hours: float = Query(default=24.0, alias="gapHours", gt=0, le=240),
+    min_count: int = Query(default=1, alias="minCount", ge=1),
+    max_concurrency: int = Query(default=None, alias="maxConcurrency", ge=1, le=20),
+    predicate: Optional[Callable[[Dict], bool]] = Depends(record_filter),
+    deadline: Optional[float] = Depends(request_deadline),
+):
+    """Detections grouped into fire events by space-time adjacency.
+
+    Detections chain into one event while each step is within ``distanceKm``
+    and ``gapHours``; events come largest total FRP first.
+    """
+    ctx = await service.prepare_query(
+        response=response,
+        country=country,
+        west=west,
+        south=south,
+        east=east,
+        north=north,
+        start_date=start_date,
+        end_date=end_date,
+        source_priority=source_priority,
+    )
+    data: List[Dict] = []
+    if ctx is not None:
+        ctx.predicate, ctx.deadline = predicate, deadline
+        async with await service.admit(ctx):
+            data = await service.fetch(ctx, max_concurrency=max_concurrency)
+    events = await service.group_events(data, distance_km=distance_km, gap_hours=gap_hours, min_count=min_count)
+    result = JSONResponse(
+        {
+            "selected_source": ctx.selected_source if ctx is not None else None,
+            "distanceKm": distance_km,
+            "gapHours": gap_hours,
+            "detections": len(data),
+            "count": len(events),
+            "events": events,
+        }
+    )
+    return _mark_partial(result, ctx)
 
 
 @router.get("/stats")
@@ -65,6 +474,8 @@ async def get_fires_stats(
     frp_high: float = Query(default=20, alias="frpHigh"),
     frp_mid: float = Query(default=5, alias="frpMid"),
     max_concurrency: int = Query(default=None, alias="maxConcurrency", ge=1, le=20),
+    predicate: Optional[Callable[[Dict], bool]] = Depends(record_filter),
+    deadline: Optional[float] = Depends(request_deadline),
 ):
     ctx = await service.prepare_query(
         response=response,
@@ -80,10 +491,135 @@ async def get_fires_stats(
 
     data = []
     if ctx is not None:
-        data = await service.fetch(ctx, max_concurrency=max_concurrency)
+        ctx.predicate, ctx.deadline = predicate, deadline
+        async with await service.admit(ctx):
+            data = await service.fetch(ctx, max_concurrency=max_concurrency)
+        _mark_partial(response, ctx)
     return service.compute_stats(data, frp_mid=frp_mid, frp_high=frp_high)
 
 
+@router.get("/live")
+async def get_fires_live(
+    response: Response,
+    bbox: str | None = Query(default=None, description="west,south,east,north"),
+    country: str | None = Query(default=None),
+    source_priority: str | None = Query(default=None, alias="sourcePriority"),
+    fields: str | None = Query(default=None),
+    precision: int | None = Query(default=None, ge=0, le=8),
+    predicate: Optional[Callable[[Dict], bool]] = Depends(record_filter),
+):
+    """Server-Sent Events feed of new detections in a bbox or country.
+
+    The first ``backlog`` event carries what the shared tile pollers already
+    hold; each later ``detections`` event is a FeatureCollection of rows not
+    seen before. Responds 204 (which stops EventSource reconnects) when no
+    source covers today.
+    """
+    projection = service.parse_fields(fields)
+    west, south, east, north = _parse_bbox(bbox)
+    today = datetime.now().date().isoformat()
+    ctx = await service.prepare_query(
+        response=response,
+        country=country,
+        west=west,
+        south=south,
+        east=east,
+        north=north,
+        start_date=today,
+        end_date=today,
+        source_priority=source_priority,
+    )
+    if ctx is None:
+        return Response(status_code=204, headers={"X-Data-Availability": response.headers["X-Data-Availability"]})
+
+    def event(name: str, rows: List[Dict]) -> bytes:
+        data = json.dumps(service.to_geojson(rows, projection, precision))
+        return f"event: {name}\ndata: {data}\n\n".encode("utf-8")
+
+    async def events():
+        async with live.subscribe(ctx.selected_source, ctx.area, predicate) as (sub, backlog):
+            yield event("backlog", backlog)
+            while True:
+                try:
+                    rows = await asyncio.wait_for(sub.queue.get(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield event("detections", rows)
+
+    headers = {
+        "Cache-Control": "no-cache",
+        # Never gzipped: SelectiveGZipMiddleware passes text/event-stream through
+        "X-Accel-Buffering": "no",
+        "X-Live-Source": ctx.selected_source,
+    }
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
+@router.get("/live/status")
+async def get_fires_live_status() -> Dict[str, int]:
+    """Active tile pollers versus subscribers of the live feed."""
+    return live.status()
+
+
+def _parse_bbox(bbox: Optional[str]) -> Tuple[Optional[float], ...]:
+    if not bbox:
+        return None, None, None, None
+    try:
+        west, south, east, north = (float(part) for part in bbox.split(","))
+    except ValueError as exc:
+        raise HTTPExceptionFactory.bad_request("bbox must be west,south,east,north") from exc
+    return west, south, east, north
+
+
+@router.get("/density")
+async def get_fires_density(
+    response: Response,
+    bbox: str | None = Query(default=None, description="west,south,east,north"),
+    country: str | None = Query(default=None),
+    start_date: str | None = Query(default=None),
+    end_date: str | None = Query(default=None),
+    source_priority: str | None = Query(default=None, alias="sourcePriority"),
+    res: float = Query(default=0.25, gt=0, le=4, description="cell size in degrees"),
+    weight: str = Query(default="count", pattern=r"^(count|frp)$"),
+    max_concurrency: int = Query(default=None, alias="maxConcurrency", ge=1, le=20),
+):
+    """Binary heatmap grid: uint16 counts or float32 FRP sums, north row first.
+
+    Shape, snapped bbox and actual resolution are returned in ``X-Grid-*`` headers.
+    """
+    west, south, east, north = _parse_bbox(bbox)
+    ctx = await service.prepare_query(
+        response=response,
+        country=country,
+        west=west,
+        south=south,
+        east=east,
+        north=north,
+        start_date=start_date,
+        end_date=end_date,
+        source_priority=source_priority,
+    )
+    if ctx is None:
+        area = (west, south, east, north) if bbox else COUNTRY_BBOX[country.upper()]
+        grid = render([], area, res, weight)
+    else:
+        async with await service.admit(ctx):
+            grid = await density.grid(ctx, bbox=ctx.area, res=res, weight=weight, max_concurrency=max_concurrency)
+    headers = {
+        "X-Grid-Width": str(grid.width),
+        "X-Grid-Height": str(grid.height),
+        "X-Grid-Bbox": ",".join(f"{v:g}" for v in grid.bbox),
+        "X-Grid-Resolution": f"{grid.res:g}",
+        "X-Grid-Dtype": grid.dtype,
+        "X-Grid-Max": f"{grid.max_value:g}",
+        "X-Grid-Points": str(grid.points),
+    }
+    if "X-Data-Availability" in response.headers:
+        headers["X-Data-Availability"] = response.headers["X-Data-Availability"]
+    return Response(content=grid.data, media_type="application/octet-stream", headers=headers)
+
+
 @router.get("/debug/compose", tags=["debug"])
 async def debug_compose(
     response: Response,
@@ -111,4 +647,4 @@ async def debug_compose(
         return {"selected_source": None, "urls": [], "note": "No data for requested date range"}
     key = settings.map_key
     masked = [u.replace(key, "<MAP_KEY>") for u in ctx.urls]
-    return {"selected_source": ctx.selected_source, "urls": masked}
+    return {"selected_source": ctx.selected_source, "urls": masked, "plan": ctx.plan.describe()}
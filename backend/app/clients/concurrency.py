@@ -0,0 +1,158 @@
+"""Adaptive (AIMD) limit on concurrent upstream requests."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..core.metrics import UPSTREAM_CONCURRENCY_BACKOFFS, UPSTREAM_CONCURRENCY_LIMIT
+
+# FIRMS signals overload with these before it starts failing outright
+THROTTLE_STATUSES = frozenset({429, 503})
+# Calls within a factor of this in size (square-degree-days) share a latency baseline
+SIZE_CLASS_BASE = 4.0
+
+
+def size_class(size: Optional[float]) -> Optional[int]:
+    """Latency baseline bucket for a call covering ``size`` square-degree-days."""
+    if size is None or size <= 0:
+        return None
+    return int(math.floor(math.log(max(size, 1.0), SIZE_CLASS_BASE)))
+
+
+class AdaptiveLimiter:
+    """Additive-increase/multiplicative-decrease limit learned from upstream responses.
+
+    The limit bounds upstream calls in flight across every request of the
+    worker; each request's :class:`Gate` adds its own ``maxConcurrency`` cap
+    on top. Each successful response grows the limit by ``1 / limit`` (about
+    one slot per round of requests). A throttling status, a 5xx, a transport
+    error or time-to-headers above ``latency_tolerance`` times the best
+    latency seen for calls of a similar size cuts it by ``backoff``, at most
+    once per ``cooldown`` seconds so one burst of failures counts as one
+    signal. The limit stays within ``[floor, ceiling]``; ``ceiling`` is the
+    static configured value, and with ``adaptive=False`` the limit is pinned
+    to it.
+    """
+
+    def __init__(
+        self,
+        ceiling: int,
+        *,
+        floor: int = 1,
+        adaptive: bool = True,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0,
+        cooldown: float = 2.0,
+    ) -> None:
+        self.ceiling = max(1, ceiling)
+        self.floor = max(1, min(floor, self.ceiling))
+        self.adaptive = adaptive
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.limit = float(self.ceiling)
+        # Best time-to-headers per size class; small areas answer faster than continents
+        self.baselines: Dict[Optional[int], float] = {}
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_backoff = float("-inf")
+        UPSTREAM_CONCURRENCY_LIMIT.set(self.limit)
+
+    @property
+    def current(self) -> int:
+        return max(self.floor, int(self.limit))
+
+    def gate(self, cap: Optional[int] = None) -> "Gate":
+        """Bound one request's fan-out by ``cap`` on top of the shared adaptive limit."""
+        return Gate(self, min(self.ceiling, cap) if cap else self.ceiling)
+
+    def observe(self, latency: float, status: Optional[int], size: Optional[float] = None) -> None:
+        """Feed back one upstream outcome; ``status`` is ``None`` for transport errors.
+
+        ``size`` (square-degree-days of the call) picks the latency baseline
+        the call is compared against.
+        """
+        if not self.adaptive:
+            return
+        if status is None:
+            self._decrease("error")
+        elif status in THROTTLE_STATUSES:
+            self._decrease("throttled")
+        elif status >= 500:
+            self._decrease("error")
+        elif status < 400:
+            bucket = size_class(size)
+            baseline = self.baselines.get(bucket)
+            # The baseline drifts up slowly so one lucky fast response does not pin it
+            if baseline is None or latency < baseline:
+                baseline = latency
+            else:
+                baseline += (latency - baseline) * 0.01
+            self.baselines[bucket] = baseline
+            if latency > baseline * self.latency_tolerance:
+                self._decrease("latency")
+            else:
+                self._set(self.limit + 1.0 / self.limit)
+
+    async def _acquire(self, gate: "Gate") -> None:
+        while gate.inflight >= gate.capacity or self.inflight >= self.current:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+        gate.inflight += 1
+        self.inflight += 1
+
+    def _release(self, gate: "Gate") -> None:
+        gate.inflight -= 1
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Every waiter re-checks its own gate and the shared limit, oldest first
+        waiters, self._waiters = self._waiters, deque()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_backoff < self.cooldown:
+            return
+        self._last_backoff = now
+        UPSTREAM_CONCURRENCY_BACKOFFS.inc(reason=reason)
+        self._set(self.limit * self.backoff)
+
+    def _set(self, value: float) -> None:
+        grew = value > self.limit
+        self.limit = min(float(self.ceiling), max(float(self.floor), value))
+        UPSTREAM_CONCURRENCY_LIMIT.set(self.limit)
+        if grew:
+            self._wake()
+
+
+class Gate:
+    """One request's share of the limiter: at most ``cap`` of the worker-wide in-flight calls."""
+
+    def __init__(self, limiter: AdaptiveLimiter, cap: int) -> None:
+        self.limiter = limiter
+        self.cap = max(1, cap)
+        self.inflight = 0
+
+    @property
+    def capacity(self) -> int:
+        return min(self.cap, self.limiter.current)
+
+    async def __aenter__(self) -> "Gate":
+        await self.limiter._acquire(self)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.limiter._release(self)
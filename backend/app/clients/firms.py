@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
 import csv
 import io
 import json
 import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import AsyncGenerator, Dict, Iterable, List, Optional
+from functools import lru_cache
+from typing import AsyncGenerator, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
+from ..core.metrics import UPSTREAM_BYTES, UPSTREAM_SECONDS, record_stage, timed
+from .concurrency import AdaptiveLimiter
+
 FIELD_MAPPINGS = {
     "latitude": ["latitude", "lat"],
     "longitude": ["longitude", "lon", "long"],
@@ -24,29 +34,188 @@ FIELD_MAPPINGS = {
     "country_id": ["country_id", "country"],
 }
 
+REQUIRED_FIELDS = ("latitude", "longitude", "bright_ti4", "acq_date", "acq_time")
+
 logger = logging.getLogger(__name__)
 
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _executor(kind: str) -> Executor:
+    """Lazily create the shared parse pools (one per worker process)."""
+    global _thread_pool, _process_pool
+    if kind == "process":
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="firms-parse")
+    return _thread_pool
+
+
+def shutdown_parse_pools() -> None:
+    global _thread_pool, _process_pool
+    for pool in (_thread_pool, _process_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _thread_pool = _process_pool = None
+
+
+@lru_cache(maxsize=64)
+def call_size(url: str) -> Optional[float]:
+    """Square-degree-days an area URL covers (``.../area/csv/{key}/{source}/{area}/{days}[/{start}]``)."""
+    parts = url.split("?", 1)[0].rstrip("/").split("/")
+    try:
+        at = parts.index("area")
+        area, days = parts[at + 4], int(parts[at + 5])
+        if area == "world":
+            return 360.0 * 180.0 * days
+        west, south, east, north = (float(value) for value in area.split(","))
+    except (ValueError, IndexError):
+        return None
+    return max(0.0, east - west) * max(0.0, north - south) * days
+
+
+def _header_mapping(header: Tuple[str, ...]) -> Tuple[Tuple[str, int], ...]:
+    """Resolve ``FIELD_MAPPINGS`` against a CSV header once.
+
+    Mirrors :meth:`FIRMSClient._transform_row`: when several aliases of a field
+    are present, the last alias in ``FIELD_MAPPINGS`` wins.
+    """
+    lowered = [h.lower() for h in header]
+    mapping: List[Tuple[str, int]] = []
+    for target, sources in FIELD_MAPPINGS.items():
+        index = None
+        for src in sources:
+            if src.lower() in lowered:
+                index = lowered.index(src.lower())
+        if index is not None:
+            mapping.append((target, index))
+    return tuple(mapping)
+
+
+def parse_csv_rows(header: Tuple[str, ...], body: str, source: Optional[str]) -> List[Dict]:
+    """Parse header-less CSV ``body`` into normalised records.
+
+    Module-level so it can run in a thread or process pool.
+    """
+    mapping = _header_mapping(header)
+    records: List[Dict] = []
+    for values in csv.reader(io.StringIO(body)):
+        if not any(values):
+            continue
+        width = len(values)
+        record = {target: values[i] for target, i in mapping if i < width}
+        for field in REQUIRED_FIELDS:
+            record.setdefault(field, "")
+        if source:
+            record["source"] = source
+        records.append(record)
+    return records
+
+
+class CSVBatchDecoder:
+    """Incrementally turn CSV response bytes into line-aligned text blocks.
+
+    Bytes are decoded as they arrive; a row split across two network chunks is
+    held back until its newline shows up. Complete lines are accumulated until
+    at least ``block_chars`` are buffered and then released as one block for
+    :func:`parse_csv_rows`, so only the block in flight is held in memory.
+    FIRMS CSVs never quote newlines, so a line is always a row.
+    """
+
+    def __init__(self, block_chars: int) -> None:
+        self.block_chars = block_chars
+        self.header: Optional[Tuple[str, ...]] = None
+        self.head = ""  # start of the body, for error detection
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._lines: List[str] = []
+        self._buffered = 0
+        self._partial = ""
+
+    def feed(self, data: bytes) -> List[str]:
+        """Consume ``data``; return the blocks of complete rows that are now full."""
+        text = self._partial + self._decoder.decode(data)
+        cut = text.rfind("\n")
+        if cut == -1:
+            self._partial = text
+            return []
+        self._partial = text[cut + 1 :]
+        complete = text[: cut + 1]
+        if self.header is None:
+            self.head = complete[:1024]
+            first, _, complete = complete.partition("\n")
+            self.header = tuple(next(csv.reader([first]), []))
+        blocks: List[str] = []
+        pos = 0
+        while len(complete) - pos + self._buffered >= self.block_chars:
+            end = complete.find("\n", pos + max(self.block_chars - self._buffered, 1) - 1) + 1
+            self._lines.append(complete[pos:end])
+            blocks.append(self._take())
+            pos = end
+        if pos < len(complete):
+            self._lines.append(complete[pos:])
+            self._buffered += len(complete) - pos
+        return blocks
+
+    def close(self) -> Optional[str]:
+        """Flush the decoder and return whatever rows remain."""
+        tail = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        if tail:
+            if self.header is None:
+                self.head = tail[:1024]
+                self.header = tuple(next(csv.reader([tail]), []))
+            else:
+                self._lines.append(tail + "\n")
+                self._buffered += len(tail)
+        return self._take() if self._buffered else None
+
+    def _take(self) -> str:
+        block = "".join(self._lines)
+        self._lines = []
+        self._buffered = 0
+        return block
+
+
+async def _single_chunk(data: bytes) -> AsyncGenerator[bytes, None]:
+    yield data
+
 
 @dataclass
 class FIRMSClient:
     """HTTP client wrapper for FIRMS CSV endpoints."""
 
     timeout: int = 120
+    # Bodies above these sizes are parsed off the event loop, in threads or processes.
+    thread_parse_bytes: int = 256 * 1024
+    process_parse_bytes: int = 8 * 1024 * 1024
+    parse_chunk_bytes: int = 256 * 1024
+    # Process-pool blocks in flight per response; bounds memory held for parsing.
+    max_inflight_blocks: int = 4
+    # Fed every upstream outcome so it can adapt the request fan-out
+    limiter: Optional[AdaptiveLimiter] = None
 
     async def fetch_records(
-        self, url: str, source: str, *, client: Optional[httpx.AsyncClient] = None
+        self,
+        url: str,
+        source: str,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: Optional[float] = None,
     ) -> List[Dict]:
         own_client = False
         if client is None:
             client = httpx.AsyncClient(headers={"Accept-Encoding": "gzip, deflate"})
             own_client = True
         try:
-            resp = await client.get(url, timeout=self.timeout)
-            resp.raise_for_status()
-            text = resp.text
-            self._guard_invalid_key(text)
-            reader = csv.DictReader(io.StringIO(text))
-            return [self._transform_row(row, source) for row in reader if any(row.values())]
+            records: List[Dict] = []
+            async for batch in self.stream_batches(url, source, client=client, timeout=timeout):
+                records.extend(batch)
+            return records
         finally:
             if own_client:
                 await client.aclose()
@@ -54,18 +223,103 @@ class FIRMSClient:
     async def stream_records(
         self, url: str, source: str, *, client: httpx.AsyncClient
     ) -> AsyncGenerator[Dict, None]:
-        async with client.stream("GET", url, timeout=self.timeout) as resp:
-            resp.raise_for_status()
-            header: Optional[List[str]] = None
-            async for line in resp.aiter_lines():
-                if not line:
-                    continue
-                if header is None:
-                    header = next(csv.reader([line]))
-                    continue
-                values = next(csv.reader([line]))
-                row = dict(zip(header, values))
-                yield self._transform_row(row, source)
+        async for batch in self.stream_batches(url, source, client=client):
+            for record in batch:
+                yield record
+
+    async def stream_batches(
+        self, url: str, source: str, *, client: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> AsyncGenerator[List[Dict], None]:
+        """Stream ``url`` and yield normalised record batches as the body arrives.
+
+        ``timeout`` (seconds) tightens the client default, e.g. to what is left
+        of a request deadline.
+        """
+        started = time.perf_counter()
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        try:
+            async with client.stream("GET", url, timeout=timeout) as resp:
+                elapsed = time.perf_counter() - started
+                record_stage("upstream", elapsed)
+                UPSTREAM_SECONDS.observe(elapsed, status=resp.status_code)
+                if self.limiter is not None:
+                    self.limiter.observe(elapsed, resp.status_code, call_size(url))
+                resp.raise_for_status()
+                size_hint = int(resp.headers.get("content-length") or 0) or None
+                async for batch in self.decode_batches(resp.aiter_bytes(), source, size_hint=size_hint):
+                    yield batch
+                UPSTREAM_BYTES.observe(resp.num_bytes_downloaded)
+        except httpx.TransportError as exc:
+            # Running out of a caller's deadline says nothing about upstream health
+            deadline_hit = isinstance(exc, httpx.TimeoutException) and timeout < self.timeout
+            if self.limiter is not None and not deadline_hit:
+                self.limiter.observe(time.perf_counter() - started, None)
+            raise
+
+    async def parse_batches(self, text: str, source: Optional[str]) -> AsyncGenerator[List[Dict], None]:
+        """Yield record batches parsed from an in-memory CSV body."""
+        data = text.encode("utf-8")
+        async for batch in self.decode_batches(_single_chunk(data), source, size_hint=len(data)):
+            yield batch
+
+    async def decode_batches(
+        self,
+        chunks: AsyncIterator[bytes],
+        source: Optional[str],
+        *,
+        size_hint: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict], None]:
+        """Decode CSV byte ``chunks`` into record batches.
+
+        Small bodies are parsed inline. Blocks of larger bodies go to a thread
+        pool, or to a process pool once the body (``size_hint`` or the bytes
+        seen so far) passes ``process_parse_bytes``, so the event loop keeps
+        serving other requests while a big response is parsed.
+        """
+        loop = asyncio.get_running_loop()
+        # Without a known large size, cut no finer than the inline threshold so
+        # small bodies still come back as a single inline batch.
+        if size_hint is not None and size_hint >= self.thread_parse_bytes:
+            block_chars = self.parse_chunk_bytes
+        else:
+            block_chars = max(self.parse_chunk_bytes, self.thread_parse_bytes)
+        decoder = CSVBatchDecoder(block_chars)
+        inflight: Deque[asyncio.Future] = deque()
+        received = 0
+        guarded = False
+
+        def offload(block: str) -> asyncio.Future:
+            kind = "process" if max(size_hint or 0, received) >= self.process_parse_bytes else "thread"
+            return loop.run_in_executor(_executor(kind), parse_csv_rows, decoder.header, block, source)
+
+        async for data in chunks:
+            received += len(data)
+            blocks = decoder.feed(data)
+            if not guarded and decoder.header is not None:
+                self._guard_invalid_key(decoder.head)
+                guarded = True
+            for block in blocks:
+                inflight.append(offload(block))
+            while len(inflight) >= self.max_inflight_blocks or (inflight and inflight[0].done()):
+                # Time only the parse itself, not the caller's work on the yielded batch
+                with timed("parse"):
+                    batch = await inflight.popleft()
+                yield batch
+
+        block = decoder.close()
+        if not guarded and decoder.header is not None:
+            self._guard_invalid_key(decoder.head)
+        if block is not None:
+            if inflight or max(size_hint or 0, received) >= self.thread_parse_bytes:
+                inflight.append(offload(block))
+            else:
+                with timed("parse"):
+                    batch = parse_csv_rows(decoder.header, block, source)
+                yield batch
+        while inflight:
+            with timed("parse"):
+                batch = await inflight.popleft()
+            yield batch
 
     def _transform_row(self, row: Dict, source: Optional[str] = None) -> Dict:
         transformed: Dict[str, str] = {}
@@ -76,8 +330,7 @@ class FIRMSClient:
                         transformed[target] = row[key]
                         break
 
-        required = ["latitude", "longitude", "bright_ti4", "acq_date", "acq_time"]
-        for field in required:
+        for field in REQUIRED_FIELDS:
             transformed.setdefault(field, "")
         if source:
             transformed["source"] = source
@@ -94,6 +347,16 @@ class FIRMSClient:
             )
 
 
+def record_key(row: Dict) -> Tuple:
+    """Dedup identity of a record; :func:`deduplicate` inlines the same tuple."""
+    return (row.get("acq_date"), row.get("acq_time"), row.get("latitude"), row.get("longitude"), row.get("source"))
+
+
+def record_id(row: Dict) -> str:
+    """:func:`record_key` as a string, used as the public feature id."""
+    return "|".join("" if part is None else str(part) for part in record_key(row))
+
+
 def deduplicate(records: Iterable[Dict]) -> List[Dict]:
     seen = set()
     result: List[Dict] = []
@@ -0,0 +1,35 @@
+"""Shared-secret check for operator-only endpoints."""
+
+from __future__ import annotations
+
+import secrets
+from typing import Optional
+
+from fastapi import Request
+
+from utils.http_exceptions import HTTPExceptionFactory
+
+from .config import settings
+
+
+def _presented_token(request: Request) -> Optional[str]:
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        return header[7:].strip()
+    return request.headers.get("x-admin-token")
+
+
+def is_admin(request: Request) -> bool:
+    """True when ADMIN_TOKEN is set and the request presents it."""
+    token = _presented_token(request)
+    return bool(settings.admin_token) and token is not None and secrets.compare_digest(
+        token.encode("utf-8"), settings.admin_token.encode("utf-8")
+    )
+
+
+def require_admin(request: Request) -> None:
+    """Dependency for admin routes: 404 while ADMIN_TOKEN is unset, 401 on a wrong token."""
+    if not settings.admin_token:
+        raise HTTPExceptionFactory.not_found("Admin API is disabled; set ADMIN_TOKEN to enable it")
+    if not is_admin(request):
+        raise HTTPExceptionFactory.unauthorized("Missing or invalid admin token")
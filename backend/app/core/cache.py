@@ -0,0 +1,119 @@
+"""Small in-process caches shared by the services."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache with optional per-entry expiry.
+
+    Keeps hit/miss/eviction counters in the shape expected by
+    :func:`app.core.metrics.register_cache_stats`. ``ttl_seconds`` may be
+    changed at runtime; it applies to existing entries too.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._data[key]
+                self._stats["evictions"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def peek(self, key: K) -> Optional[V]:
+        """Return ``key``'s value without touching LRU order or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0]):
+                return None
+            return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> List[K]:
+        """Snapshot of live keys, least recently used first."""
+        with self._lock:
+            return [key for key, (stored, _) in self._data.items() if not self._expired(stored)]
+
+    def invalidate(self, match: Callable[[K], bool]) -> int:
+        """Drop every entry whose key satisfies ``match``; returns how many."""
+        with self._lock:
+            doomed = [key for key in self._data if match(key)]
+            for key in doomed:
+                del self._data[key]
+        return len(doomed)
+
+    def ages(self) -> List[float]:
+        """Seconds since each live entry was stored."""
+        now = time.time()
+        with self._lock:
+            return [now - stored for stored, _ in self._data.values() if not self._expired(stored)]
+
+    def dump(self) -> List[Tuple[K, float, V]]:
+        """Live entries as ``(key, stored_at, value)``, least recently used first."""
+        with self._lock:
+            return [(key, stored, value) for key, (stored, value) in self._data.items() if not self._expired(stored)]
+
+    def restore(self, entries: Iterable[Tuple[K, float, V]]) -> int:
+        """Re-insert dumped entries with their original timestamps.
+
+        Expired entries are dropped and keys already present keep their newer
+        value. Returns the number of entries restored.
+        """
+        restored = 0
+        with self._lock:
+            for key, stored, value in entries:
+                if key in self._data or self._expired(stored):
+                    continue
+                self._data[key] = (stored, value)
+                self._data.move_to_end(key, last=False)
+                restored += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return restored
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _expired(self, stored: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - stored > self.ttl_seconds
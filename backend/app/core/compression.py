@@ -0,0 +1,35 @@
+"""Response compression that leaves event streams alone."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+# A compressor only flushes once its buffer fills, so each server-sent event
+# would sit in it instead of reaching the browser when it happens.
+UNCOMPRESSED_MEDIA_TYPES = frozenset({"text/event-stream"})
+
+
+class _Responder(GZipResponder):
+    passthrough = False
+
+    async def send_with_gzip(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            media_type = Headers(raw=message["headers"]).get("content-type", "").split(";")[0].strip()
+            self.passthrough = media_type in UNCOMPRESSED_MEDIA_TYPES
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """Starlette's gzip, except for :data:`UNCOMPRESSED_MEDIA_TYPES` responses."""
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            await _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -27,7 +27,46 @@ class Settings(BaseSettings):
     firms_map_key: Optional[str] = Field(default=None, alias="FIRMS_MAP_KEY")
     legacy_map_key: Optional[str] = Field(default=None, alias="FIRMS_API_KEY")
     allowed_origins_raw: Optional[str] = Field(default=None, alias="ALLOWED_ORIGINS")
+    firms_base_url: str = Field(default="https://firms.modaps.eosdis.nasa.gov/api", alias="FIRMS_BASE_URL")
     max_concurrency: int = Field(default=5, alias="MAX_CONCURRENT_REQUESTS")
+    # Upstream calls in flight across all requests of a worker; ceiling of the adaptive limit
+    upstream_concurrency: int = Field(default=16, alias="UPSTREAM_CONCURRENCY")
+    adaptive_concurrency: bool = Field(default=True, alias="ADAPTIVE_CONCURRENCY")
+    # Default end-to-end budget for /api/fires queries; unset waits for every segment
+    request_deadline_ms: Optional[int] = Field(default=None, alias="REQUEST_DEADLINE_MS")
+    # Predicted rows above which one upstream area call is split into quadrants; 0 disables
+    split_target_rows: int = Field(default=50_000, alias="SPLIT_TARGET_ROWS")
+    # Admission control: queries costing at least ADMISSION_COST_THRESHOLD square-degree-days
+    # share MAX_EXPENSIVE_REQUESTS slots per worker (0 disables) behind a bounded queue
+    admission_cost_threshold: float = Field(default=20_000.0, alias="ADMISSION_COST_THRESHOLD")
+    max_expensive_requests: int = Field(default=2, alias="MAX_EXPENSIVE_REQUESTS")
+    admission_queue: int = Field(default=4, alias="ADMISSION_QUEUE")
+    admission_queue_timeout: float = Field(default=30.0, alias="ADMISSION_QUEUE_TIMEOUT_SECONDS")
+    archive_dir: Optional[str] = Field(default=None, alias="ARCHIVE_DIR")
+    result_cache_ttl: int = Field(default=900, alias="RESULT_CACHE_TTL")
+    result_cache_entries: int = Field(default=1024, alias="RESULT_CACHE_ENTRIES")
+    page_cache_ttl: int = Field(default=300, alias="PAGE_CACHE_TTL")
+    page_cache_entries: int = Field(default=64, alias="PAGE_CACHE_ENTRIES")
+    warmup_enabled: bool = Field(default=True, alias="WARMUP_ENABLED")
+    warmup_regions_raw: Optional[str] = Field(default=None, alias="WARMUP_REGIONS")
+    warmup_days: int = Field(default=2, alias="WARMUP_DAYS")
+    # Shorter than RESULT_CACHE_TTL so warmed regions never expire between passes
+    warmup_interval: int = Field(default=600, alias="WARMUP_INTERVAL_SECONDS")
+    warmup_delay: float = Field(default=5.0, alias="WARMUP_DELAY_SECONDS")
+    live_poll_interval: float = Field(default=60.0, alias="LIVE_POLL_INTERVAL_SECONDS")
+    live_tile_degrees: float = Field(default=10.0, alias="LIVE_TILE_DEGREES")
+    # Enables /api/admin; sent as "Authorization: Bearer <token>" or X-Admin-Token
+    admin_token: Optional[str] = Field(default=None, alias="ADMIN_TOKEN")
+    # Lets an admin add profile=1 to /api/fires queries
+    profiling_enabled: bool = Field(default=False, alias="PROFILING_ENABLED")
+    profile_dir: str = Field(
+        default=str(Path(__file__).resolve().parents[2] / ".cache" / "profiles"), alias="PROFILE_DIR"
+    )
+    # Empty disables the snapshot
+    cache_snapshot_path: Optional[str] = Field(
+        default=str(Path(__file__).resolve().parents[2] / ".cache" / "snapshot.json.gz"),
+        alias="CACHE_SNAPSHOT_PATH",
+    )
     default_source_priority: List[str] = Field(default_factory=lambda: DEFAULT_SOURCE_PRIORITY)
 
     class Config:
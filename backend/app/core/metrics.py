@@ -0,0 +1,341 @@
+"""In-process metrics: Prometheus text exposition and per-request stage timings.
+
+``timed("stage")`` is the single instrumentation primitive. It works as a
+context manager or as a decorator (sync or async) and records each duration
+twice: into the ``firms_stage_seconds`` histogram and into the timings of the
+current request, which :class:`ServerTimingMiddleware` turns into a
+``Server-Timing`` response header.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+BYTES_BUCKETS = tuple(float(1024 * 4**i) for i in range(10))  # 1 KiB .. 256 MiB
+LAG_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+
+class _ValueMetric(_Metric):
+    """Counter/gauge values, either updated in place or computed by ``callback`` at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            values = self._callback()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in sorted(values.items())]
+
+
+class Counter(_ValueMetric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_ValueMetric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            idx = bisect_left(self.buckets, value)
+            if idx < len(self.buckets):
+                series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {_format_value(cumulative)}")
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {_format_value(series[-1])}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render_metrics() -> str:
+    """Return every registered metric in Prometheus text format."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# -- request-scoped stage timings ---------------------------------------------------
+
+
+class timed:
+    """Time a block as ``stage``; usable as ``with timed(...)`` or ``@timed(...)``."""
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self._start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        record_stage(self.stage, self.elapsed)
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed(self.stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(self.stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+class ServerTimingMiddleware:
+    """Collect stage timings per request and emit them as ``Server-Timing``.
+
+    Must be the outermost middleware. Stage durations accumulate, so concurrent
+    upstream segments report their summed time. ``compress`` is the time between
+    the application producing its body and the (gzip) response starting.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message: Dict) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                body_ready = timings.pop("_body_ready", None)
+                if body_ready is not None:
+                    timings["compress"] = now - body_ready
+                timings["total"] = now - started
+                header = ", ".join(f"{name};dur={secs * 1000:.1f}" for name, secs in timings.items())
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", header.encode("latin-1")),
+                    (b"timing-allow-origin", b"*"),
+                ]
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route=path, status=status["code"])
+            _request_timings.reset(token)
+
+
+class BodyReadyMiddleware:
+    """Mark when the application emits its first body chunk (install inside GZip)."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def mark(message: Dict) -> None:
+            timings = _request_timings.get()
+            if message["type"] == "http.response.body" and timings is not None:
+                timings.setdefault("_body_ready", time.perf_counter())
+            await send(message)
+
+        await self.app(scope, receive, mark)
+
+
+# -- event loop lag ----------------------------------------------------------------
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sample how late the loop wakes up from ``sleep(interval)`` until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+def _resident_memory() -> Dict[LabelValues, float]:
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            pages = int(fh.read().split()[1])
+        return {(): float(pages * os.sysconf("SC_PAGE_SIZE"))}
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows has neither /proc nor getrusage
+        return {}
+    # ru_maxrss is the peak, in KiB on Linux; good enough where /proc is missing.
+    return {(): float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)}
+
+
+# -- metric definitions --------------------------------------------------------------
+
+STAGE_SECONDS = Histogram("firms_stage_seconds", "Time spent per request stage.", ["stage"])
+REQUEST_SECONDS = Histogram("firms_http_request_seconds", "HTTP request latency.", ["route", "status"])
+UPSTREAM_SECONDS = Histogram("firms_upstream_request_seconds", "FIRMS upstream request latency.", ["status"])
+UPSTREAM_BYTES = Histogram(
+    "firms_upstream_response_bytes", "FIRMS upstream response size on the wire.", buckets=BYTES_BUCKETS
+)
+UPSTREAM_CONCURRENCY_LIMIT = Gauge("firms_upstream_concurrency_limit", "Adaptive limit on upstream calls in flight per worker.")
+UPSTREAM_CONCURRENCY_BACKOFFS = Counter(
+    "firms_upstream_concurrency_backoffs_total", "Adaptive concurrency decreases by cause.", ["reason"]
+)
+DEADLINE_MISSED_SEGMENTS = Counter(
+    "firms_deadline_missed_segments_total", "Upstream segments left out of a response at its deadline."
+)
+ADMISSION_DECISIONS = Counter(
+    "firms_admission_total", "Admission decisions for fire queries by outcome.", ["outcome"]
+)
+ADMISSION_REQUESTS = Gauge("firms_admission_requests", "Expensive fire queries running or queued.", ["state"])
+EVENT_LOOP_LAG = Histogram("firms_event_loop_lag_seconds", "Event loop wake-up delay.", buckets=LAG_BUCKETS)
+
+# Cache layers register a zero-argument callable returning at least {"hits": n, "misses": n}.
+CACHE_STATS: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+
+def register_cache_stats(name: str, provider: Callable[[], Dict[str, int]]) -> None:
+    CACHE_STATS[name] = provider
+
+
+def _cache_requests() -> Dict[LabelValues, float]:
+    values: Dict[LabelValues, float] = {}
+    for cache, provider in list(CACHE_STATS.items()):
+        stats = provider()
+        values[(cache, "hit")] = float(stats.get("hits", 0))
+        values[(cache, "miss")] = float(stats.get("misses", 0))
+    return values
+
+
+def _cache_hit_ratios() -> Dict[LabelValues, float]:
+    counts = _cache_requests()
+    ratios: Dict[LabelValues, float] = {}
+    for cache in {key[0] for key in counts}:
+        hits, misses = counts[(cache, "hit")], counts[(cache, "miss")]
+        if hits + misses:
+            ratios[(cache,)] = hits / (hits + misses)
+    return ratios
+
+
+CACHE_REQUESTS = Counter("firms_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"], _cache_requests)
+CACHE_HIT_RATIO = Gauge("firms_cache_hit_ratio", "Cache hit ratio since start.", ["cache"], _cache_hit_ratios)
+RESIDENT_MEMORY = Gauge("process_resident_memory_bytes", "Resident set size.", callback=_resident_memory)
@@ -0,0 +1,164 @@
+"""Opt-in cProfile capture of single ``/api/fires`` requests.
+
+With ``PROFILING_ENABLED`` set, an admin (see :mod:`app.core.auth`) can add
+``profile=1`` to a ``/api/fires...`` query to get a call-tree summary of that
+request instead of its data, or ``profile=file`` to also keep the raw
+``pstats`` dump under ``PROFILE_DIR``. The profiler is deterministic and
+covers the event loop thread only: work of other requests interleaved on the
+loop is included, parsing offloaded to the thread/process pools is not.
+Only one request is profiled at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from .auth import is_admin
+from .config import settings
+
+FuncKey = Tuple[str, int, str]
+
+# Functions reported by name whenever they ran, whatever their rank
+FOCUS = (
+    "prepare_query",
+    "fetch",
+    "fetch_records",
+    "stream_batches",
+    "decode_batches",
+    "parse_csv_rows",
+    "_transform_row",
+    "deduplicate",
+    "to_geojson",
+    "project",
+)
+TOP_FUNCTIONS = 30
+TOP_CALLEES = 5
+
+_lock: Optional[asyncio.Lock] = None
+
+
+def _label(func: FuncKey) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def summarize(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> Dict[str, Any]:
+    """Top functions by cumulative time, each with its heaviest callees, plus :data:`FOCUS`."""
+    table: Dict[FuncKey, Tuple] = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[FuncKey, List[Tuple[float, FuncKey]]] = {}
+    for func, (_, _, _, _, callers) in table.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((edge[3], func))
+
+    def entry(func: FuncKey) -> Dict[str, Any]:
+        _, calls, own, cumulative, _ = table[func]
+        children = sorted(callees.get(func, []), reverse=True)[:TOP_CALLEES]
+        return {
+            "function": _label(func),
+            "calls": calls,
+            "own_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+            "callees": [
+                {"function": _label(child), "cumulative_seconds": round(seconds, 6)} for seconds, child in children
+            ],
+        }
+
+    ranked = sorted(table, key=lambda func: table[func][3], reverse=True)
+    focus: Dict[str, Dict[str, Any]] = {}
+    for func in ranked:
+        if func[2] in FOCUS and func[2] not in focus:
+            focus[func[2]] = entry(func)
+    return {
+        "total_calls": stats.total_calls,  # type: ignore[attr-defined]
+        "top": [entry(func) for func in ranked[:limit]],
+        "focus": focus,
+    }
+
+
+def _wants_profile(scope: Dict) -> Optional[str]:
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    path = scope["path"]
+    # The live feed never finishes, so it cannot be profiled as one request
+    if not path.startswith("/api/fires") or path.startswith("/api/fires/live"):
+        return None
+    for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+        if key == "profile" and value in ("1", "true", "file"):
+            return value
+    return None
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"detail": {"code": status, "message": message, "details": None}}, status_code=status)
+
+
+class ProfilingMiddleware:
+    """Answer ``profile=1|file`` requests with their profile instead of their data."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        mode = _wants_profile(scope) if settings.profiling_enabled else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not is_admin(Request(scope)):
+            await _error(401, "Profiling requires the admin token")(scope, receive, send)
+            return
+
+        global _lock
+        if _lock is None:
+            _lock = asyncio.Lock()
+        response: Dict[str, Any] = {"status": None, "bytes": 0}
+
+        async def capture(message: Dict) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+
+        query = [
+            (key, value)
+            for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+            if key != "profile"
+        ]
+        async with _lock:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                profiler.disable()
+            wall = time.perf_counter() - started
+
+        stats = pstats.Stats(profiler)
+        body: Dict[str, Any] = {
+            "path": scope["path"],
+            "query": urlencode(query),
+            "status": response["status"],
+            "response_bytes": response["bytes"],
+            "wall_seconds": round(wall, 6),
+            **summarize(stats),
+        }
+        if mode == "file":
+            os.makedirs(settings.profile_dir, exist_ok=True)
+            name = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['path'].strip('/').replace('/', '_')}.prof"
+            path = os.path.join(settings.profile_dir, name)
+            stats.dump_stats(path)
+            body["file"] = path
+        await JSONResponse(json.loads(json.dumps(body, default=str)))(scope, receive, send)
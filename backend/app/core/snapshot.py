@@ -0,0 +1,78 @@
+"""Persist in-process caches across restarts.
+
+Each cache registers a ``dump`` callable returning JSON-serialisable entries
+with their original timestamps and a ``restore`` callable that loads them
+back. Restores re-apply the caches' own TTLs, so a snapshot never extends the
+life of an entry; a missing, corrupt or incompatible snapshot is ignored.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+Dump = Callable[[], Any]
+Restore = Callable[[Any], int]
+
+
+class CacheSnapshot:
+    """Gzipped JSON snapshot of the registered caches at ``path``."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.caches: Dict[str, Tuple[Dump, Restore]] = {}
+
+    def register(self, name: str, dump: Dump, restore: Restore) -> None:
+        self.caches[name] = (dump, restore)
+
+    def save(self) -> Dict[str, int]:
+        """Write every registered cache atomically; returns entry counts per cache."""
+        caches: Dict[str, Any] = {}
+        counts: Dict[str, int] = {}
+        for name, (dump, _) in self.caches.items():
+            try:
+                caches[name] = dump()
+            except Exception as exc:  # one broken cache must not lose the others
+                logger.warning("Snapshot of %s cache failed: %s", name, exc)
+                continue
+            counts[name] = len(caches[name]) if isinstance(caches[name], list) else int(caches[name] is not None)
+        payload = {"version": SNAPSHOT_VERSION, "written_at": time.time(), "caches": caches}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        return counts
+
+    def load(self) -> Dict[str, int]:
+        """Restore registered caches from disk; returns restored entry counts per cache."""
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError) as exc:
+            logger.warning("Ignoring unreadable cache snapshot %s: %s", self.path, exc)
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            logger.warning("Ignoring cache snapshot %s with unknown format", self.path)
+            return {}
+        restored: Dict[str, int] = {}
+        caches = payload.get("caches") or {}
+        for name, (_, restore) in self.caches.items():
+            if name not in caches:
+                continue
+            try:
+                restored[name] = restore(caches[name])
+            except Exception as exc:  # malformed entries for one cache only
+                logger.warning("Ignoring %s entries in cache snapshot: %s", name, exc)
+        return restored
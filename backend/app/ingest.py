@@ -0,0 +1,215 @@
+"""Bulk offline ingest of FIRMS archive CSV downloads into the columnar archive.
+
+Usage::
+
+    python -m app.ingest --bbox -74,-34,-34,6 fire_archive_SV-C2_456.csv fire_archive_M-C61_457.csv
+    python -m app.ingest --world --source VIIRS_NOAA20_SP fire_archive_J1V-C2_123.csv
+
+Files are split into newline-aligned byte ranges that are parsed in a process
+pool by :func:`app.clients.firms.parse_csv_rows`, the same ``FIELD_MAPPINGS``
+normalisation as the live client. Rows are de-duplicated per day with
+:func:`app.clients.firms.deduplicate` and appended to the archive one file at a
+time, and the day indexes are rebuilt at the end. Finished files are
+recorded in a state file next to the archive so an interrupted run can simply
+be restarted; days already in the archive are skipped by the archive itself.
+
+Every day from a file's first to its last detection is marked as covered for
+the whole ``--bbox``/``--world`` extent, so only use downloads of that full
+rectangle. Yearly country files only hold in-border detections and would hide
+neighbouring fires inside the country's bbox, so they are not accepted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .clients.firms import deduplicate, parse_csv_rows
+from .core.config import settings
+from .services.fires import SOURCE_WHITELIST
+from .storage import ColumnarArchive
+
+logger = logging.getLogger("app.ingest")
+
+STATE_FILE = ".ingest-state.json"
+CHUNK_BYTES = 8 * 1024 * 1024
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+# Filename prefixes used by the FIRMS archive download tool and yearly files.
+SOURCE_PATTERNS: Tuple[Tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"viirs[-_]?snpp|_SV-C2_", re.I), "VIIRS_SNPP_SP"),
+    (re.compile(r"viirs[-_]?(jpss1|noaa20)|_J1V-C2_", re.I), "VIIRS_NOAA20_SP"),
+    (re.compile(r"modis|_M-C61_", re.I), "MODIS_SP"),
+)
+
+
+def infer_source(path: Path) -> Optional[str]:
+    for pattern, source in SOURCE_PATTERNS:
+        if pattern.search(path.name):
+            return source
+    return None
+
+
+def plan_chunks(path: Path, chunk_bytes: int = CHUNK_BYTES) -> Tuple[str, List[Tuple[int, int]]]:
+    """Return the header line and newline-aligned ``(start, end)`` byte ranges of ``path``."""
+    size = path.stat().st_size
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        ranges: List[Tuple[int, int]] = []
+        start = fh.tell()
+        while start < size:
+            fh.seek(min(start + chunk_bytes, size))
+            fh.readline()
+            end = min(fh.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header.decode("utf-8-sig").strip(), ranges
+
+
+def parse_chunk(path: str, header: str, start: int, end: int, source: str) -> Dict[str, List[Dict]]:
+    """Parse one byte range of ``path`` into normalised records grouped by ``acq_date``."""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        body = fh.read(end - start).decode("utf-8", "replace")
+    by_day: Dict[str, List[Dict]] = {}
+    for record in parse_csv_rows(tuple(next(csv.reader([header]))), body, source):
+        by_day.setdefault(record["acq_date"], []).append(record)
+    return by_day
+
+
+class IngestState:
+    """Tracks which input files have been fully committed to the archive."""
+
+    def __init__(self, root: Path) -> None:
+        self.path = root / STATE_FILE
+        self.done: Dict[str, str] = {}
+        if self.path.exists():
+            try:
+                self.done = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning("Ignoring corrupt ingest state at %s", self.path)
+
+    @staticmethod
+    def fingerprint(path: Path) -> str:
+        stat = path.stat()
+        return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+    def is_done(self, path: Path) -> bool:
+        return self.done.get(str(path.resolve())) == self.fingerprint(path)
+
+    def mark_done(self, paths: Sequence[Path]) -> None:
+        for path in paths:
+            self.done[str(path.resolve())] = self.fingerprint(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.done, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _covered_days(days: Sequence[str]) -> List[date]:
+    parsed = sorted(date.fromisoformat(d) for d in days if d)
+    if not parsed:
+        return []
+    return [parsed[0] + timedelta(days=i) for i in range((parsed[-1] - parsed[0]).days + 1)]
+
+
+def ingest(
+    files: Sequence[Path],
+    *,
+    archive: ColumnarArchive,
+    bbox: Tuple[float, float, float, float],
+    source: Optional[str] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Load ``files`` into ``archive``; returns row counters for reporting."""
+    state = IngestState(archive.root)
+    by_source: Dict[str, List[Path]] = {}
+    for path in files:
+        if not force and state.is_done(path):
+            logger.info("skip %s (already ingested)", path)
+            continue
+        src = source or infer_source(path)
+        if src not in SOURCE_WHITELIST:
+            raise ValueError(f"Cannot determine source for {path}; pass --source")
+        by_source.setdefault(src, []).append(path)
+
+    totals = {"parsed": 0, "written": 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for src, paths in by_source.items():
+            # One file at a time keeps memory bounded by the largest file, not the whole import.
+            for path in paths:
+                header, ranges = plan_chunks(path)
+                futures = [pool.submit(parse_chunk, str(path), header, a, b, src) for a, b in ranges]
+
+                merged: Dict[str, List[Dict]] = {}
+                for future in as_completed(futures):
+                    for day, rows in future.result().items():
+                        merged.setdefault(day, []).extend(rows)
+                        totals["parsed"] += len(rows)
+                    elapsed = time.perf_counter() - started
+                    logger.info("parsed %d rows (%.0f rows/s)", totals["parsed"], totals["parsed"] / max(elapsed, 1e-9))
+
+                records = [row for day in sorted(merged) for row in deduplicate(merged[day])]
+                totals["written"] += archive.append(src, records, days=_covered_days(list(merged)), bbox=bbox)
+                state.mark_done([path])
+            archive.rebuild_index(src)
+
+    totals["seconds"] = time.perf_counter() - started
+    return totals
+
+
+def _parse_bbox(raw: str) -> Tuple[float, float, float, float]:
+    parts = [float(p) for p in raw.split(",")]
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("bbox must be west,south,east,north")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.ingest", description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", type=Path, help="FIRMS archive CSV files")
+    parser.add_argument("--archive-dir", default=settings.archive_dir, help="archive root (default: ARCHIVE_DIR)")
+    parser.add_argument("--source", choices=sorted(SOURCE_WHITELIST), help="dataset id when not inferable from filenames")
+    extent = parser.add_mutually_exclusive_group(required=True)
+    extent.add_argument("--bbox", type=_parse_bbox, help="west,south,east,north extent the files fully cover")
+    extent.add_argument("--world", action="store_true", help="files cover the whole globe")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-parse files recorded as done")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if not args.archive_dir:
+        parser.error("--archive-dir or ARCHIVE_DIR is required")
+    bbox = WORLD if args.world else args.bbox
+
+    archive = ColumnarArchive(args.archive_dir)
+    try:
+        totals = ingest(
+            args.files, archive=archive, bbox=bbox, source=args.source, workers=args.workers, force=args.force
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        archive.close()
+    rate = totals["parsed"] / totals["seconds"] if totals["seconds"] else 0.0
+    print(
+        f"ingested {totals['written']} new rows ({totals['parsed']} parsed) "
+        f"in {totals['seconds']:.1f}s, {rate:.0f} rows/s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
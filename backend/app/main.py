@@ -1,16 +1,86 @@
 """FastAPI application entrypoint."""
 
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 
+from services import geo
+from utils import data_availability
+
+from .core.compression import SelectiveGZipMiddleware
 from .core.config import settings
+from .core.metrics import BodyReadyMiddleware, ServerTimingMiddleware, monitor_event_loop_lag
+from .core.profiling import ProfilingMiddleware
+from .core.snapshot import CacheSnapshot
 from .api.router import api_router
+from .api.routes.fires import live as live_hub
+from .api.routes.fires import service as fire_service
+from .clients.firms import shutdown_parse_pools
+from .services.warmup import CacheWarmer, create_warmer
+
+logger = logging.getLogger(__name__)
+
+
+def create_snapshot() -> Optional[CacheSnapshot]:
+    if not settings.cache_snapshot_path:
+        return None
+    snapshot = CacheSnapshot(settings.cache_snapshot_path)
+    snapshot.register("availability", data_availability.dump_cache, data_availability.restore_cache)
+    snapshot.register("countries", geo.dump_cache, geo.restore_cache)
+    # Density pyramids are derived from partitions and rebuilt without upstream calls
+    snapshot.register("partitions", fire_service.partitions.dump, fire_service.partitions.restore)
+    return snapshot
+
+
+async def start_caches(snapshot: Optional[CacheSnapshot], warmer: Optional[CacheWarmer]) -> None:
+    # Restore first so the warmer's first pass only fetches what the snapshot lacked
+    if snapshot is not None:
+        restored = await asyncio.to_thread(snapshot.load)
+        if restored:
+            logger.info("Restored cache snapshot: %s", restored)
+            # Restored partitions tell the upstream planner which regions are dense
+            await asyncio.to_thread(fire_service.quadtree.learn, fire_service.partitions.entries.dump())
+    if warmer is not None:
+        await warmer.run_forever()
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    background = [asyncio.create_task(monitor_event_loop_lag())]
+    # Snapshot restore and warm-up run in the background so startup and
+    # health checks never wait on them
+    snapshot = create_snapshot()
+    app.state.warmer = create_warmer(fire_service)
+    background.append(asyncio.create_task(start_caches(snapshot, app.state.warmer)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        for task in background:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await live_hub.close()
+        if snapshot is not None:
+            try:
+                saved = await asyncio.to_thread(snapshot.save)
+                logger.info("Wrote cache snapshot: %s", saved)
+            except Exception as exc:
+                logger.warning("Writing cache snapshot failed: %s", exc)
+        shutdown_parse_pools()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name, version=settings.version)
+    app = FastAPI(title=settings.app_name, version=settings.version, lifespan=lifespan)
 
+    # Innermost so a profile covers the handler, not compression
+    app.add_middleware(ProfilingMiddleware)
+    # Marks when the body is ready so Server-Timing can report gzip time
+    app.add_middleware(BodyReadyMiddleware)
     # Middlewares consistent with legacy app
     app.add_middleware(
         CORSMiddleware,
@@ -20,7 +90,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
         expose_headers=["*"],
     )
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Skips text/event-stream so live events are not held in the compressor
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
+    # Outermost so the header covers everything above
+    app.add_middleware(ServerTimingMiddleware)
 
     app.include_router(api_router)
     return app
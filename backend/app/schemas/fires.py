@@ -0,0 +1,40 @@
+"""Request bodies for the fires API."""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class FireQuery(BaseModel):
+    """One sub-query of a batch; same semantics as the ``/api/fires`` query string."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    country: Optional[str] = None
+    west: Optional[float] = None
+    south: Optional[float] = None
+    east: Optional[float] = None
+    north: Optional[float] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    source_priority: Optional[str] = Field(default=None, alias="sourcePriority")
+
+
+class FireBatchRequest(BaseModel):
+    """``POST /api/fires/batch`` body; output and filter options apply to every sub-query."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    queries: List[FireQuery] = Field(min_length=1, max_length=20)
+    format: Literal["json", "geojson"] = "geojson"
+    fields: Optional[str] = None
+    precision: Optional[int] = Field(default=None, ge=0, le=8)
+    max_concurrency: Optional[int] = Field(default=None, alias="maxConcurrency", ge=1, le=20)
+    deadline_ms: Optional[int] = Field(default=None, alias="deadlineMs", ge=1, le=600000)
+    min_confidence: Optional[str] = Field(default=None, alias="minConfidence")
+    min_frp: Optional[float] = Field(default=None, alias="minFrp", ge=0)
+    max_frp: Optional[float] = Field(default=None, alias="maxFrp", ge=0)
+    daynight: Optional[str] = Field(default=None, pattern=r"^[DNdn]$")
+    satellite: Optional[str] = None
+    time_from: Optional[str] = Field(default=None, alias="timeFrom")
+    time_to: Optional[str] = Field(default=None, alias="timeTo")
@@ -0,0 +1,168 @@
+"""Per-worker admission control for expensive fire queries.
+
+A query's cost is the area it covers times the days it has to fetch: each
+upstream day counts fully, an archived day a quarter (it is read and parsed
+locally but costs no quota) and a cached day nothing. Queries costing less
+than ``threshold`` square-degree-days always run. Expensive ones take one of
+``max_active`` slots, wait in a FIFO queue of at most ``max_queue`` entries
+for up to ``queue_timeout`` seconds, or are rejected with a ``Retry-After``
+estimate taken from how long expensive queries have recently held a slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..core.metrics import ADMISSION_DECISIONS, ADMISSION_REQUESTS
+from .planner import QueryPlan
+
+# An archived day costs local I/O and parsing but no upstream quota
+ARCHIVED_DAY_WEIGHT = 0.25
+# Weight of the newest hold time in the running average behind Retry-After
+ALPHA = 0.2
+
+
+def query_cost(plan: Optional[QueryPlan]) -> float:
+    """Square-degree-days of work ``plan`` leaves to do; 0 when fully cached."""
+    if plan is None:
+        return 0.0
+    west, south, east, north = plan.area
+    area = max(0.0, east - west) * max(0.0, north - south)
+    return area * (len(plan.upstream_days) + ARCHIVED_DAY_WEIGHT * len(plan.archived))
+
+
+class Rejected(Exception):
+    """No slot within the queue bound or wait; retry after ``retry_after`` seconds."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A held slot (or none, for cheap queries); release once, or use ``async with``."""
+
+    def __init__(self, controller: Optional["AdmissionController"]) -> None:
+        self._controller = controller
+        self._started = time.monotonic()
+
+    def release(self) -> None:
+        controller, self._controller = self._controller, None
+        if controller is not None:
+            controller._release(time.monotonic() - self._started)
+
+    async def __aenter__(self) -> "Ticket":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """Bounds concurrent expensive queries per worker; ``max_active <= 0`` disables it."""
+
+    def __init__(
+        self,
+        max_active: int,
+        max_queue: int,
+        threshold: float,
+        queue_timeout: float = 30.0,
+        typical_seconds: float = 5.0,
+    ) -> None:
+        self.max_active = max_active
+        self.max_queue = max(0, max_queue)
+        self.threshold = threshold
+        self.queue_timeout = queue_timeout
+        # Running average of how long an expensive query holds its slot
+        self.typical_seconds = typical_seconds
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._publish()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def retry_after(self) -> int:
+        """Seconds until a slot plausibly frees up for one more queued query."""
+        rounds = (self.queued + 1) / max(1, self.max_active)
+        return max(1, math.ceil(self.typical_seconds * rounds))
+
+    async def acquire(self, cost: float, deadline: Optional[float] = None) -> Ticket:
+        """Admit a query costing ``cost``, waiting in the queue if needed.
+
+        ``deadline`` (``time.monotonic()``) shortens the wait so a queued
+        query never outlives its own time budget.
+        """
+        if self.max_active <= 0 or cost < self.threshold:
+            ADMISSION_DECISIONS.inc(outcome="cheap")
+            return Ticket(None)
+        if self.active < self.max_active and not self.queued:
+            self.active += 1
+            ADMISSION_DECISIONS.inc(outcome="admitted")
+            self._publish()
+            return Ticket(self)
+        if self.queued >= self.max_queue:
+            raise self._rejected("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        timeout = self.queue_timeout
+        if deadline is not None:
+            timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; pass it on
+                self._release(None)
+            else:
+                waiter.cancel()
+            self._prune()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise self._rejected("queue timeout")
+        self._prune()
+        ADMISSION_DECISIONS.inc(outcome="queued")
+        return Ticket(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_active": self.max_active,
+            "max_queue": self.max_queue,
+            "typical_seconds": round(self.typical_seconds, 3),
+        }
+
+    def _rejected(self, reason: str) -> Rejected:
+        ADMISSION_DECISIONS.inc(outcome="rejected")
+        return Rejected(reason, self.retry_after())
+
+    def _release(self, held: Optional[float]) -> None:
+        if held is not None:
+            self.typical_seconds += (held - self.typical_seconds) * ALPHA
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves straight to the oldest waiter; ``active`` is unchanged
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.active -= 1
+        self._publish()
+
+    def _prune(self) -> None:
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+        self._publish()
+
+    def _publish(self) -> None:
+        ADMISSION_REQUESTS.set(self.active, state="active")
+        ADMISSION_REQUESTS.set(self.queued, state="queued")
@@ -0,0 +1,203 @@
+"""Introspection and control of the in-process cache layers for the admin API.
+
+Every layer reports entry count, approximate size, hit/miss/eviction
+counters, its TTL and a histogram of entry ages, and can be invalidated
+(whole, or by source/day/region where its keys carry them) and given a new
+TTL at runtime. Overrides are not persisted; a restart returns to the
+configured values.
+"""
+
+from __future__ import annotations
+
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services import geo
+from utils import data_availability
+
+from ..core.cache import TTLCache
+
+Area = Tuple[float, float, float, float]
+
+# Upper bounds (seconds) of the age histogram buckets, cumulative like Prometheus
+AGE_BUCKETS = (60, 300, 900, 3600, 21600, 86400)
+# Entries, and items per container, measured when estimating sizes
+SIZE_SAMPLE = 32
+
+
+def _sample(items: List[Any]) -> Tuple[List[Any], float]:
+    """At most ``SIZE_SAMPLE`` evenly spaced items and the factor scaling them to all."""
+    if len(items) <= SIZE_SAMPLE:
+        return items, 1.0
+    sample = items[:: len(items) // SIZE_SAMPLE][:SIZE_SAMPLE]
+    return sample, len(items) / len(sample)
+
+
+def approx_bytes(value: Any, depth: int = 0) -> int:
+    """Rough deep size of ``value``; large containers are sampled and scaled."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if depth > 4 or isinstance(value, (str, bytes, int, float)) or value is None:
+        return size
+    if isinstance(value, dict):
+        # String keys are field names shared by every record, so they are not counted
+        children = [key for key in value if not isinstance(key, str)] + list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        children = list(value)
+    elif hasattr(value, "__dict__"):
+        children = list(vars(value).values())
+    else:
+        return size
+    sample, scale = _sample(children)
+    return size + int(sum(approx_bytes(child, depth + 1) for child in sample) * scale)
+
+
+def age_histogram(ages: Iterable[float]) -> Dict[str, int]:
+    ages = list(ages)
+    histogram = {str(bound): sum(1 for age in ages if age <= bound) for bound in AGE_BUCKETS}
+    histogram["+Inf"] = len(ages)
+    return histogram
+
+
+@dataclass
+class CacheSelector:
+    """Which entries to invalidate; unset fields match everything."""
+
+    source: Optional[str] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    # Entries whose area intersects this one
+    area: Optional[Area] = None
+
+    @property
+    def everything(self) -> bool:
+        return self.source is None and self.start is None and self.end is None and self.area is None
+
+    def matches(self, source: str, area: Area, day: date) -> bool:
+        if self.source is not None and source != self.source:
+            return False
+        if (self.start is not None and day < self.start) or (self.end is not None and day > self.end):
+            return False
+        if self.area is not None:
+            west, south, east, north = self.area
+            if area[0] > east or area[2] < west or area[1] > north or area[3] < south:
+                return False
+        return True
+
+
+class CacheLayer(ABC):
+    """One cache as seen by :class:`CacheAdmin`."""
+
+    @abstractmethod
+    def describe(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def invalidate(self, selector: CacheSelector) -> int:
+        ...
+
+    @abstractmethod
+    def set_ttl(self, seconds: Optional[float]) -> None:
+        ...
+
+
+class TTLCacheLayer(CacheLayer):
+    """A :class:`TTLCache`; ``keyed`` caches use ``(source, area, day)`` keys.
+
+    Caches without such keys can only be flushed as a whole.
+    """
+
+    def __init__(
+        self,
+        cache: TTLCache,
+        *,
+        keyed: bool = False,
+        stats: Optional[Callable[[], Dict[str, int]]] = None,
+    ) -> None:
+        self.cache = cache
+        self.keyed = keyed
+        self.stats = stats or cache.stats
+
+    def describe(self) -> Dict[str, Any]:
+        entries = self.cache.dump()
+        sample, scale = _sample([value for _, _, value in entries])
+        return {
+            "entries": len(entries),
+            "max_entries": self.cache.max_entries,
+            "bytes": int(sum(approx_bytes(value) for value in sample) * scale),
+            **self.stats(),
+            "ttl_seconds": self.cache.ttl_seconds,
+            "age_seconds": age_histogram(self.cache.ages()),
+        }
+
+    def invalidate(self, selector: CacheSelector) -> int:
+        if selector.everything:
+            return self.cache.invalidate(lambda key: True)
+        if not self.keyed:
+            return 0
+        return self.cache.invalidate(lambda key: selector.matches(*key))
+
+    def set_ttl(self, seconds: Optional[float]) -> None:
+        self.cache.ttl_seconds = seconds
+
+
+class AvailabilityLayer(CacheLayer):
+    """Dataset availability per MAP key and sensor; invalidated by source only."""
+
+    def describe(self) -> Dict[str, Any]:
+        entries = data_availability.dump_cache()
+        return {
+            "entries": len(entries),
+            "bytes": sum(approx_bytes(entry[3]) for entry in entries),
+            **data_availability.cache_stats(),
+            "ttl_seconds": data_availability.cache_ttl(),
+            "age_seconds": age_histogram(data_availability.cache_ages()),
+        }
+
+    def invalidate(self, selector: CacheSelector) -> int:
+        if selector.everything or selector.source is not None:
+            return data_availability.clear_cache(selector.source)
+        return 0
+
+    def set_ttl(self, seconds: Optional[float]) -> None:
+        data_availability.set_cache_ttl(int(seconds or 0))
+
+
+class CountriesLayer(CacheLayer):
+    """The FIRMS country list; only ever flushed as a whole."""
+
+    def describe(self) -> Dict[str, Any]:
+        info = geo.cache_info()
+        return {
+            "entries": info["entries"],
+            "bytes": approx_bytes(geo.dump_cache()),
+            "ttl_seconds": info["ttl_seconds"],
+            "age_seconds": age_histogram(info["ages"]),
+        }
+
+    def invalidate(self, selector: CacheSelector) -> int:
+        return geo.clear_cache() if selector.everything else 0
+
+    def set_ttl(self, seconds: Optional[float]) -> None:
+        geo.set_cache_ttl(int(seconds or 0))
+
+
+class CacheAdmin:
+    """Named cache layers exposed under ``/api/admin/cache``."""
+
+    def __init__(self) -> None:
+        self.layers: Dict[str, CacheLayer] = {}
+
+    def register(self, name: str, layer: CacheLayer) -> None:
+        self.layers[name] = layer
+
+    def describe(self) -> Dict[str, Dict[str, Any]]:
+        return {name: layer.describe() for name, layer in self.layers.items()}
+
+    def invalidate(self, selector: CacheSelector, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        return {name: self.layers[name].invalidate(selector) for name in (names or self.layers)}
@@ -0,0 +1,84 @@
+"""Version tokens and added/removed diffs for refreshing a loaded view."""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from ..clients.firms import record_id
+from .partitions import Area, PartitionCache
+
+# Version of days read from the SP archive, which never changes
+ARCHIVED = 0
+
+
+def encode_version(query: str, versions: Dict[date, int]) -> str:
+    """Opaque token naming the partition version behind each day of a result."""
+    payload = {"q": query, "v": {day.isoformat(): version for day, version in versions.items()}}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_version(token: str) -> Tuple[str, Dict[date, int]]:
+    """Inverse of :func:`encode_version`; raises ``ValueError`` on malformed input."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        versions = {date.fromisoformat(day): int(version) for day, version in payload["v"].items()}
+        return str(payload["q"]), versions
+    except (TypeError, ValueError, KeyError, AttributeError) as exc:
+        raise ValueError("Malformed version token") from exc
+
+
+@dataclass
+class Delta:
+    added: List[Dict]
+    # Record ids (``acq_date|acq_time|latitude|longitude|source``) to drop
+    removed: List[str]
+
+
+def _inside(area: Area, rid: str) -> bool:
+    parts = rid.split("|")
+    try:
+        lat, lon = float(parts[2]), float(parts[3])
+    except (IndexError, ValueError):
+        return False
+    west, south, east, north = area
+    return west <= lon <= east and south <= lat <= north
+
+
+def diff(
+    rows: List[Dict],
+    area: Area,
+    old: Dict[date, int],
+    new: Dict[date, int],
+    partitions: PartitionCache,
+) -> Optional[Delta]:
+    """Changes from the ``old`` to the ``new`` versions of a result's days.
+
+    ``rows`` is the current (filtered) result. Returns ``None`` when the day
+    sets differ or an old version has left the partition history, in which
+    case the caller falls back to a full response.
+    """
+    if old.keys() != new.keys():
+        return None
+    changed: Dict[str, Tuple[frozenset, frozenset]] = {}
+    for day, version in new.items():
+        if old[day] == version:
+            continue
+        before = partitions.ids(old[day])
+        after = partitions.ids(version)
+        if before is None or after is None:
+            return None
+        changed[day.isoformat()] = (before, after)
+    added = [
+        row
+        for row in rows
+        if row.get("acq_date") in changed and record_id(row) not in changed[row["acq_date"]][0]
+    ]
+    removed = [
+        rid for before, after in changed.values() for rid in sorted(before - after) if _inside(area, rid)
+    ]
+    return Delta(added, removed)
@@ -0,0 +1,268 @@
+"""Server-side heatmap grids backed by a per-day resolution pyramid.
+
+Points are binned once per ``(source, area, day)`` into sparse cells of a
+global grid at ``BASE_RES`` degrees. Each coarser level halves the
+resolution and is aggregated from the level below, so zooming out never
+re-bins points. A request sums the cached day grids of its date range at
+the chosen level and returns a dense little-endian grid.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.datebucket import bucket_by_date
+from utils.http_exceptions import HTTPExceptionFactory
+
+from ..core.cache import TTLCache
+from ..core.metrics import register_cache_stats, timed
+from .fires import FireQueryContext, FireService
+from .partitions import contains
+
+Area = Tuple[float, float, float, float]
+
+# Finest level is 1/64 degree (~1.7 km at the equator); level k is BASE_RES * 2**k.
+BASE_RES = 1 / 64
+LEVELS = 9  # up to 4 degrees
+WEIGHTS = ("count", "frp")
+# Dense output cap; coarser levels are used beyond it.
+MAX_CELLS = 4_000_000
+
+
+def level_res(level: int) -> float:
+    return BASE_RES * (1 << level)
+
+
+def _level_dims(level: int) -> Tuple[int, int]:
+    res = level_res(level)
+    return int(round(360 / res)), int(round(180 / res))
+
+
+@dataclass
+class SparseLevel:
+    """Occupied cells of one level: flat global cell ids with summed weights."""
+
+    cells: np.ndarray  # int64, iy * width + ix
+    counts: np.ndarray  # float64
+    frp: np.ndarray  # float64
+
+
+class DayPyramid:
+    """All pyramid levels for one day's points."""
+
+    def __init__(self, levels: List[SparseLevel]) -> None:
+        self.levels = levels
+
+    @property
+    def points(self) -> int:
+        return int(self.levels[0].counts.sum()) if self.levels else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(lv.cells.nbytes + lv.counts.nbytes + lv.frp.nbytes for lv in self.levels)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "DayPyramid":
+        rows = records if isinstance(records, list) else list(records)
+        lon_arr = _column(rows, "longitude")
+        lat_arr = _column(rows, "latitude")
+        frp_arr = np.nan_to_num(_column(rows, "frp"), nan=0.0, posinf=0.0, neginf=0.0)
+
+        width, height = _level_dims(0)
+        valid = np.isfinite(lon_arr) & np.isfinite(lat_arr)
+        ix = np.clip(np.floor((lon_arr[valid] + 180.0) / BASE_RES), 0, width - 1).astype(np.int64)
+        iy = np.clip(np.floor((lat_arr[valid] + 90.0) / BASE_RES), 0, height - 1).astype(np.int64)
+        cells, inverse = np.unique(iy * width + ix, return_inverse=True)
+        base = SparseLevel(
+            cells=cells,
+            counts=np.bincount(inverse, minlength=len(cells)).astype(np.float64),
+            frp=np.bincount(inverse, weights=frp_arr[valid], minlength=len(cells)),
+        )
+
+        levels = [base]
+        for level in range(1, LEVELS):
+            levels.append(_coarsen(levels[-1], level))
+        return cls(levels)
+
+
+def _column(rows: List[Dict], key: str) -> np.ndarray:
+    """Convert one record field to float64, with NaN for missing or malformed values."""
+    values = [row.get(key) for row in rows]
+    try:
+        # numpy parses numeric strings in C; None becomes NaN
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def _coarsen(finer: SparseLevel, level: int) -> SparseLevel:
+    """Aggregate 2x2 blocks of the level below into ``level``."""
+    fine_width, _ = _level_dims(level - 1)
+    width, _ = _level_dims(level)
+    iy, ix = np.divmod(finer.cells, fine_width)
+    cells, inverse = np.unique((iy >> 1) * width + (ix >> 1), return_inverse=True)
+    return SparseLevel(
+        cells=cells,
+        counts=np.bincount(inverse, weights=finer.counts, minlength=len(cells)),
+        frp=np.bincount(inverse, weights=finer.frp, minlength=len(cells)),
+    )
+
+
+@dataclass
+class DensityGrid:
+    """Dense grid, row 0 at the north edge, west to east within a row."""
+
+    data: bytes
+    width: int
+    height: int
+    bbox: Area  # snapped to cell edges
+    res: float
+    dtype: str
+    max_value: float
+    points: int
+
+
+def choose_level(bbox: Area, res: float) -> int:
+    """Finest level at least as coarse as ``res`` whose grid fits ``MAX_CELLS``."""
+    level = 0
+    while level < LEVELS - 1 and level_res(level) < res:
+        level += 1
+    while level < LEVELS - 1 and _cell_window(bbox, level)[4] > MAX_CELLS:
+        level += 1
+    return level
+
+
+def _cell_window(bbox: Area, level: int) -> Tuple[int, int, int, int, int]:
+    res = level_res(level)
+    width, height = _level_dims(level)
+    west, south, east, north = bbox
+    x0 = max(0, int(math.floor((west + 180.0) / res)))
+    x1 = min(width, int(math.ceil((east + 180.0) / res)))
+    y0 = max(0, int(math.floor((south + 90.0) / res)))
+    y1 = min(height, int(math.ceil((north + 90.0) / res)))
+    return x0, x1, y0, y1, max(0, x1 - x0) * max(0, y1 - y0)
+
+
+def render(pyramids: Sequence[DayPyramid], bbox: Area, res: float, weight: str) -> DensityGrid:
+    """Sum the day pyramids over ``bbox`` at the level chosen for ``res``."""
+    level = choose_level(bbox, res)
+    width, _ = _level_dims(level)
+    x0, x1, y0, y1, size = _cell_window(bbox, level)
+    nx, ny = x1 - x0, y1 - y0
+    acc = np.zeros(size, dtype=np.float64)
+    points = 0
+    for pyramid in pyramids:
+        sparse = pyramid.levels[level]
+        iy, ix = np.divmod(sparse.cells, width)
+        inside = (ix >= x0) & (ix < x1) & (iy >= y0) & (iy < y1)
+        values = sparse.counts if weight == "count" else sparse.frp
+        flat = (iy[inside] - y0) * nx + (ix[inside] - x0)
+        acc += np.bincount(flat, weights=values[inside], minlength=size)
+        points += int(sparse.counts[inside].sum())
+    # Image order: north row first
+    grid = acc.reshape(ny, nx)[::-1] if size else acc
+    if weight == "count":
+        out = np.minimum(grid, np.iinfo(np.uint16).max).astype("<u2")
+        dtype = "uint16"
+    else:
+        out = grid.astype("<f4")
+        dtype = "float32"
+    r = level_res(level)
+    return DensityGrid(
+        data=out.tobytes(),
+        width=nx,
+        height=ny,
+        bbox=(x0 * r - 180.0, y0 * r - 90.0, x1 * r - 180.0, y1 * r - 90.0),
+        res=r,
+        dtype=dtype,
+        max_value=float(grid.max()) if size else 0.0,
+        points=points,
+    )
+
+
+class DensityService:
+    """Builds density grids for fire queries, caching one pyramid per (source, area, day)."""
+
+    def __init__(self, fires: FireService, cache: Optional[TTLCache] = None) -> None:
+        self.fires = fires
+        self.cache: TTLCache[Tuple[str, Area, date], DayPyramid] = cache or TTLCache(
+            max_entries=2048, ttl_seconds=900
+        )
+        register_cache_stats("density", self.cache.stats)
+
+    def _lookup(self, source: str, area: Area, day: date) -> Optional[DayPyramid]:
+        """Find a cached pyramid for ``day`` whose area contains ``area``."""
+        hit = self.cache.get((source, area, day))
+        if hit is not None:
+            return hit
+        for cached_source, cached_area, cached_day in self.cache.keys():
+            if cached_source == source and cached_day == day and contains(cached_area, area):
+                return self.cache.peek((cached_source, cached_area, cached_day))
+        return None
+
+    async def pyramids(self, ctx: FireQueryContext, *, max_concurrency: Optional[int] = None) -> List[DayPyramid]:
+        days = [ctx.start + timedelta(days=i) for i in range((ctx.end - ctx.start).days + 1)]
+        found: Dict[date, DayPyramid] = {}
+        for day in days:
+            pyramid = self._lookup(ctx.selected_source, ctx.area, day)
+            if pyramid is not None:
+                found[day] = pyramid
+
+        missing = [day for day in days if day not in found]
+        if missing:
+            archived = set(ctx.archived_days)
+            remaining = [d for d in missing if d not in archived]
+            cached = self.fires.partitions.lookup(ctx.selected_source, ctx.area, remaining)
+            upstream = [d for d in remaining if d not in cached]
+            sub = FireQueryContext(
+                urls=self.fires.compose_days(ctx.selected_source, ctx.area, upstream),
+                selected_source=ctx.selected_source,
+                area=ctx.area,
+                start=missing[0],
+                end=missing[-1],
+                archived_days=[d for d in missing if d in archived],
+                cached=cached,
+                upstream_days=upstream,
+            )
+            records = await self.fires.fetch(sub, max_concurrency=max_concurrency)
+            built = await asyncio.to_thread(self._build, records, missing)
+            for day, pyramid in built.items():
+                self.cache.set((ctx.selected_source, ctx.area, day), pyramid)
+                found[day] = pyramid
+        return [found[day] for day in days]
+
+    @staticmethod
+    @timed("density")
+    def _build(records: List[Dict], days: List[date]) -> Dict[date, DayPyramid]:
+        wanted = {day.isoformat() for day in days}
+        buckets = bucket_by_date(records, days[0], days[-1])
+        return {
+            date.fromisoformat(day): DayPyramid.from_records(rows) for day, rows in buckets.items() if day in wanted
+        }
+
+    async def grid(
+        self,
+        ctx: FireQueryContext,
+        *,
+        bbox: Area,
+        res: float,
+        weight: str,
+        max_concurrency: Optional[int] = None,
+    ) -> DensityGrid:
+        if weight not in WEIGHTS:
+            raise HTTPExceptionFactory.bad_request(f"weight must be one of {', '.join(WEIGHTS)}")
+        pyramids = await self.pyramids(ctx, max_concurrency=max_concurrency)
+        with timed("density"):
+            return await asyncio.to_thread(render, pyramids, bbox, res, weight)
@@ -3,21 +3,35 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from dataclasses import dataclass
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from itertools import chain
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import httpx
 from fastapi import Response
 
+from utils.data_availability import cache_stats as availability_cache_stats
 from utils.data_availability import check_data_availability
-from utils.geojson import to_geojson
+from utils.datebucket import bucket_by_date
+from utils.events import group_events
+from utils.filters import RecordFilter, parse_confidence, parse_time
+from utils.geojson import parse_fields, project_records, to_geojson
 from utils.http_exceptions import HTTPExceptionFactory
 from utils.urlbuilder import compose_urls
 
+from ..clients.concurrency import AdaptiveLimiter
 from ..clients.firms import FIRMSClient, deduplicate
 from ..core.config import DEFAULT_SOURCE_PRIORITY, settings
+from ..core.metrics import DEADLINE_MISSED_SEGMENTS, register_cache_stats, timed
+from ..storage import ColumnarArchive
+from .admission import AdmissionController, Rejected, Ticket, query_cost
+from .delta import ARCHIVED
+from .pages import ResultPages
+from .partitions import PartitionCache
+from .planner import QueryPlan, UpstreamCall, plan_calls
+from .quadtree import QuadtreePlanner
 
 logger = logging.getLogger(__name__)
 
@@ -68,12 +82,95 @@ ISO3_RE = __import__("re").compile(r"^[A-Z]{3}$")
 class FireQueryContext:
     urls: List[str]
     selected_source: str
+    area: Optional[Tuple[float, float, float, float]] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    # Days served from the local columnar archive instead of upstream
+    archived_days: List[date] = field(default_factory=list)
+    # Output projection (``fields=``) and coordinate rounding (``precision=``)
+    fields: Optional[Tuple[str, ...]] = None
+    precision: Optional[int] = None
+    # Compiled server-side filter, applied before dedup and serialization
+    predicate: Optional[Callable[[Dict], bool]] = None
+    # Days answered by the partition cache, and the days ``urls`` cover
+    cached: Dict[date, List[Dict]] = field(default_factory=dict)
+    upstream_days: List[date] = field(default_factory=list)
+    # ``time.monotonic()`` by which upstream calls must finish; segments still
+    # outstanding then are dropped and listed in ``missing`` as (first, last) days
+    deadline: Optional[float] = None
+    missing: List[Tuple[date, date]] = field(default_factory=list)
+    # How ``urls`` were chosen, for debugging
+    plan: Optional[QueryPlan] = None
+
+
+def _apply_predicate(records: Iterable[Dict], predicate: Optional[Callable[[Dict], bool]]) -> Iterable[Dict]:
+    if predicate is None:
+        return records
+    return (row for row in records if predicate(row))
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _url_days(url: str) -> Tuple[date, date]:
+    """First and last day of a composed ``.../{day_range}/{start}`` URL."""
+    _, day_range, start = url.rsplit("/", 2)
+    first = date.fromisoformat(start)
+    return first, first + timedelta(days=int(day_range) - 1)
+
+
+def _complete_days(days: Iterable[date], missing: Iterable[Tuple[date, date]]) -> List[date]:
+    """``days`` outside every missing range; a day split across quadrants needs all of them."""
+    lost = {day for first, last in missing for day in _days(first, last)}
+    return [day for day in days if day not in lost]
+
+
+def _clip_ranges(ranges: Iterable[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+    """Parts of ``ranges`` inside ``[start, end]``."""
+    clipped = {(max(first, start), min(last, end)) for first, last in ranges if first <= end and last >= start}
+    return sorted(clipped)
+
+
+def _segment_labels(ranges: Iterable[Tuple[date, date]]) -> List[str]:
+    """``first/last`` day labels, as in ``X-Missing-Segments``."""
+    return [f"{first.isoformat()}/{last.isoformat()}" for first, last in ranges]
+
+
+def _covered_ranges(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Collapse sorted days into contiguous ``(first, last)`` ranges."""
+    ranges: List[Tuple[date, date]] = []
+    for day in days:
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
 
 
 class FireService:
     def __init__(self) -> None:
-        self.client = FIRMSClient()
+        # Shared by every request so throttling seen by one slows all of them
+        self.limiter = AdaptiveLimiter(settings.upstream_concurrency, adaptive=settings.adaptive_concurrency)
+        self.client = FIRMSClient(limiter=self.limiter)
+        self.archive = ColumnarArchive(settings.archive_dir) if settings.archive_dir else None
+        # Archive "hits" are days served locally, "misses" are days sent upstream.
+        self.archive_stats = {"hits": 0, "misses": 0}
+        register_cache_stats("availability", availability_cache_stats)
+        register_cache_stats("archive", lambda: dict(self.archive_stats))
+        self.partitions = PartitionCache(settings.result_cache_entries, settings.result_cache_ttl)
+        register_cache_stats("partitions", self.partitions.stats)
+        self.pages = ResultPages(settings.page_cache_entries, settings.page_cache_ttl)
+        register_cache_stats("pages", self.pages.stats)
+        self.quadtree = QuadtreePlanner(settings.split_target_rows)
+        self.admission = AdmissionController(
+            settings.max_expensive_requests,
+            settings.admission_queue,
+            settings.admission_cost_threshold,
+            settings.admission_queue_timeout,
+        )
 
+    @timed("prepare")
     async def prepare_query(
         self,
         response: Response,
@@ -86,7 +183,13 @@ class FireService:
         start_date: Optional[str],
         end_date: Optional[str],
         source_priority: Optional[str],
+        refresh: bool = False,
     ) -> Optional[FireQueryContext]:
+        """Validate a query and plan where each of its days comes from.
+
+        Days are read from the archive, then the partition cache (unless
+        ``refresh``), and only the rest are composed into upstream URLs.
+        """
         map_key = self._resolve_map_key()
 
         requested_country_mode = False
@@ -125,7 +228,10 @@ class FireService:
 
         priorities = self._resolve_priorities(source_priority)
         try:
-            availability = await asyncio.to_thread(check_data_availability, map_key, "ALL")
+            with timed("availability"):
+                availability = await asyncio.to_thread(
+                    check_data_availability, map_key, "ALL", base_url=settings.firms_base_url
+                )
         except Exception as exc:  # pragma: no cover - defensive
             raise HTTPExceptionFactory.service_unavailable(
                 "Invalid or unauthorized FIRMS MAP_KEY. Please update backend/.env",
@@ -147,16 +253,85 @@ class FireService:
             response.headers["X-Data-Availability"] = "No data available for requested date range"
             return None
 
+        area = (west, south, east, north)
+        # Science-quality data never changes, so archived days are read locally and
+        # only the remaining gaps go upstream.
+        archived: Set[date] = set()
+        if self.archive is not None and selected_source.endswith("_SP"):
+            archived = await asyncio.to_thread(
+                self.archive.covered_days, selected_source, start, end, area
+            )
+            self.archive_stats["hits"] += len(archived)
+            self.archive_stats["misses"] += (end - start).days + 1 - len(archived)
+
+        remaining = [day for day in _days(start, end) if day not in archived]
+        cached = {} if refresh else self.partitions.lookup(selected_source, area, remaining)
+        plan = self.plan_query(selected_source, area, start, end, archived, cached.keys())
+        upstream = set(plan.upstream_days)
+
         # Always use area URLs. The FIRMS country endpoint is currently marked
         # "Feature not available" and can return Invalid API call.
-        urls = compose_urls(
-            map_key,
-            selected_source,
-            start,
-            end,
-            area=(west, south, east, north),
+        return FireQueryContext(
+            urls=self.compose_plan(plan),
+            selected_source=selected_source,
+            area=area,
+            start=start,
+            end=end,
+            archived_days=sorted(archived),
+            # Cached days inside an upstream call are refreshed from it instead
+            cached={day: rows for day, rows in cached.items() if day not in upstream},
+            upstream_days=plan.upstream_days,
+            plan=plan,
         )
-        return FireQueryContext(urls=urls, selected_source=selected_source)
+
+    def plan_query(
+        self,
+        source: str,
+        area: Any,
+        start: date,
+        end: date,
+        archived: Iterable[date] = (),
+        cached: Iterable[date] = (),
+    ) -> QueryPlan:
+        """Pack the days of ``[start, end]`` held neither in the archive nor the cache into upstream calls.
+
+        Gaps are covered by the fewest calls of up to 10 days, bridging
+        cached days where that saves a call; archived days are never fetched
+        again. Each call's area is split by the quadtree.
+        """
+        archived, cached = set(archived), set(cached)
+        calls: List[UpstreamCall] = []
+        for first, last in _covered_ranges(day for day in _days(start, end) if day not in archived):
+            needed = [day for day in _days(first, last) if day not in cached]
+            calls.extend(plan_calls(needed, lambda span: self.quadtree.split(source, area, span)))
+        return QueryPlan(source, area, start, end, sorted(archived), sorted(cached), calls)
+
+    async def admit(self, *ctxs: FireQueryContext) -> Ticket:
+        """Admission for the work ``ctxs`` leave to do; 429 with ``Retry-After`` when overloaded.
+
+        Release the returned ticket (or ``async with`` it) once the response is built.
+        """
+        cost = sum(query_cost(ctx.plan) for ctx in ctxs)
+        deadlines = [ctx.deadline for ctx in ctxs if ctx.deadline is not None]
+        try:
+            return await self.admission.acquire(cost, min(deadlines) if deadlines else None)
+        except Rejected as exc:
+            raise HTTPExceptionFactory.too_many_requests(
+                "Too many expensive queries in progress; retry later or narrow the area or date range",
+                details={"reason": exc.reason, "cost": round(cost), **self.admission.stats()},
+                retry_after=exc.retry_after,
+            ) from exc
+
+    def compose_plan(self, plan: QueryPlan) -> List[str]:
+        map_key = self._resolve_map_key()
+        return [
+            url
+            for call in plan.calls
+            for part in call.areas
+            for url in compose_urls(
+                map_key, plan.source, call.first, call.last, area=part, base_url=settings.firms_base_url
+            )
+        ]
 
     async def fetch(
         self,
@@ -167,21 +342,257 @@ class FireService:
         concurrency = max_concurrency or settings.max_concurrency
         headers = {"Accept-Encoding": "gzip, deflate"}
         async with httpx.AsyncClient(headers=headers) as client:
-            sem = asyncio.Semaphore(max(1, concurrency))
+            sem = self.limiter.gate(concurrency)
 
             async def fetch_one(url: str) -> List[Dict]:
                 async with sem:
-                    return await self.client.fetch_records(url, ctx.selected_source, client=client)
+                    if ctx.deadline is None:
+                        return await self.client.fetch_records(url, ctx.selected_source, client=client)
+                    remaining = max(0.0, ctx.deadline - time.monotonic())
+                    return await self.client.fetch_records(
+                        url, ctx.selected_source, client=client, timeout=remaining
+                    )
+
+            if ctx.deadline is None:
+                results = await asyncio.gather(*(fetch_one(url) for url in ctx.urls))
+                fetched_days = ctx.upstream_days
+            else:
+                results, fetched_days = await self._fetch_until(ctx, fetch_one)
+        if fetched_days:
+            self._store_upstream(ctx.selected_source, ctx.area, fetched_days, ctx.urls, results, not ctx.missing)
+        archived = await self.read_archive(ctx)
+        with timed("dedup"):
+            rows = chain(archived, chain.from_iterable(ctx.cached.values()), *results)
+            return deduplicate(_apply_predicate(rows, ctx.predicate))
+
+    async def _fetch_until(
+        self, ctx: FireQueryContext, fetch_one: Callable[[str], Any]
+    ) -> Tuple[List[List[Dict]], List[date]]:
+        """Run ``fetch_one`` over ``ctx.urls`` until ``ctx.deadline``.
+
+        Returns the finished segments' rows and the days they cover; segments
+        still running at the deadline, or timed out against it, are cancelled
+        and recorded in ``ctx.missing``. Other upstream errors propagate.
+        """
+        results, ctx.missing = await self._gather_until(ctx.urls, ctx.deadline, fetch_one)
+        return results, _complete_days(ctx.upstream_days, ctx.missing)
+
+    @staticmethod
+    async def _gather_until(
+        urls: Sequence[str], deadline: float, fetch_one: Callable[[str], Any]
+    ) -> Tuple[List[List[Dict]], List[Tuple[date, date]]]:
+        """Finished segments' rows and the sorted ``(first, last)`` days of those cut off at ``deadline``."""
+        tasks = {asyncio.ensure_future(fetch_one(url)): url for url in urls}
+        if not tasks:
+            return [], []
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled calls release their connections before the client closes
+            await asyncio.gather(*tasks, return_exceptions=True)
+        results: List[List[Dict]] = []
+        missing: Set[Tuple[date, date]] = set()
+        for task, url in tasks.items():
+            if task in done and not isinstance(task.exception(), httpx.TimeoutException):
+                results.append(task.result())
+            else:
+                missing.add(_url_days(url))
+        if missing:
+            DEADLINE_MISSED_SEGMENTS.inc(len(missing))
+        return results, sorted(missing)
+
+    def _store_upstream(
+        self,
+        source: str,
+        area: Any,
+        days: List[date],
+        urls: Sequence[str],
+        results: Sequence[List[Dict]],
+        complete: bool = True,
+    ) -> None:
+        """Cache upstream rows for ``days`` and learn the area's density from them."""
+        rows: Iterable[Dict] = chain.from_iterable(results)
+        # Several URLs per day range means the area was split; rows on shared edges repeat
+        if len({_url_days(url) for url in urls}) < len(urls):
+            rows = deduplicate(rows)
+        elif complete:
+            rows = list(rows)
+        self.partitions.store(source, area, days, rows)
+        if complete:
+            self.quadtree.observe(source, area, days, rows)
+
+    def plan_batch(self, ctxs: Sequence[FireQueryContext]) -> Dict[Tuple[str, Any], Tuple[List[date], List[str]]]:
+        """Compose one URL set per ``(source, area)`` covering every sub-query's upstream days.
+
+        Sub-queries over the same source and area (adjacent TimeSlider days,
+        repeated dashboard panels) share upstream calls: their days are merged
+        into contiguous ranges before composing URLs.
+        """
+        needed: Dict[Tuple[str, Any], Set[date]] = {}
+        for ctx in ctxs:
+            if ctx.urls:
+                needed.setdefault((ctx.selected_source, ctx.area), set()).update(ctx.upstream_days)
+        return {
+            (source, area): (sorted(days), self.compose_days(source, area, days))
+            for (source, area), days in needed.items()
+        }
+
+    def compose_days(self, source: str, area: Any, days: Iterable[date]) -> List[str]:
+        """Compose area URLs covering exactly ``days``, merged into contiguous ranges.
+
+        Areas predicted to return too many rows per call are split into
+        quadrants by :attr:`quadtree`, one URL set per quadrant.
+        """
+        map_key = self._resolve_map_key()
+        urls: List[str] = []
+        for first, last in _covered_ranges(sorted(days)):
+            span = min(10, (last - first).days + 1)
+            for part in self.quadtree.split(source, area, span):
+                urls.extend(
+                    compose_urls(map_key, source, first, last, area=part, base_url=settings.firms_base_url)
+                )
+        return urls
+
+    async def iter_batch(
+        self,
+        ctxs: Sequence[FireQueryContext],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncGenerator[Tuple[int, List[Dict]], None]:
+        """Yield ``(index, records)`` per sub-query as its upstream group completes.
+
+        Every URL in :meth:`plan_batch` is fetched once, under one concurrency
+        limit shared by the whole batch. Sub-queries share the earliest of
+        their deadlines; segments cut off by it are recorded in each affected
+        sub-query's ``missing``.
+        """
+        plan = self.plan_batch(ctxs)
+        deadlines = [ctx.deadline for ctx in ctxs if ctx.deadline is not None]
+        deadline = min(deadlines) if deadlines else None
+        members: Dict[Tuple[str, Any], List[int]] = {}
+        for index, ctx in enumerate(ctxs):
+            if ctx.urls:
+                members.setdefault((ctx.selected_source, ctx.area), []).append(index)
+            else:
+                yield index, await self._assemble(ctx, [])
 
-            results = await asyncio.gather(*(fetch_one(url) for url in ctx.urls))
-        return deduplicate(chain.from_iterable(results))
+        concurrency = max_concurrency or settings.max_concurrency
+        headers = {"Accept-Encoding": "gzip, deflate"}
+        async with httpx.AsyncClient(headers=headers) as client:
+            sem = self.limiter.gate(concurrency)
+
+            async def fetch_one(url: str, source: str) -> List[Dict]:
+                async with sem:
+                    if deadline is None:
+                        return await self.client.fetch_records(url, source, client=client)
+                    remaining = max(0.0, deadline - time.monotonic())
+                    return await self.client.fetch_records(url, source, client=client, timeout=remaining)
+
+            async def fetch_group(key: Tuple[str, Any], days: List[date], urls: List[str]):
+                if deadline is None:
+                    parts = await asyncio.gather(*(fetch_one(url, key[0]) for url in urls))
+                    missing: List[Tuple[date, date]] = []
+                else:
+                    parts, missing = await self._gather_until(urls, deadline, lambda url: fetch_one(url, key[0]))
+                fetched = _complete_days(days, missing)
+                if fetched:
+                    self._store_upstream(key[0], key[1], fetched, urls, parts, not missing)
+                return key, list(chain.from_iterable(parts)), missing
+
+            tasks = [asyncio.ensure_future(fetch_group(key, days, urls)) for key, (days, urls) in plan.items()]
+            try:
+                for done in asyncio.as_completed(tasks):
+                    key, rows, missing = await done
+                    for index in members[key]:
+                        ctx = ctxs[index]
+                        ctx.missing = _clip_ranges(missing, ctx.start, ctx.end)
+                        yield index, await self._assemble(ctx, rows)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def fetch_batch(
+        self,
+        ctxs: Sequence[FireQueryContext],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> List[List[Dict]]:
+        results: List[List[Dict]] = [[] for _ in ctxs]
+        async for index, records in self.iter_batch(ctxs, max_concurrency=max_concurrency):
+            results[index] = records
+        return results
+
+    async def _assemble(self, ctx: FireQueryContext, group_rows: List[Dict]) -> List[Dict]:
+        """Pick ``ctx``'s days out of a shared upstream group and merge its archived rows."""
+        first, last = ctx.start.isoformat(), ctx.end.isoformat()
+        rows = [row for row in group_rows if first <= (row.get("acq_date") or "") <= last]
+        archived = await self.read_archive(ctx)
+        with timed("dedup"):
+            merged = chain(archived, chain.from_iterable(ctx.cached.values()), rows)
+            return deduplicate(_apply_predicate(merged, ctx.predicate))
+
+    @timed("archive")
+    async def read_archive(self, ctx: FireQueryContext) -> List[Dict]:
+        """Return archived records for the days of ``ctx`` served locally."""
+        if self.archive is None or not ctx.archived_days:
+            return []
+        records: List[Dict] = []
+        for first, last in _covered_ranges(ctx.archived_days):
+            records.extend(
+                await asyncio.to_thread(self.archive.read, ctx.selected_source, first, last, ctx.area)
+            )
+        return records
 
     async def stream_ndjson(self, ctx: FireQueryContext) -> AsyncGenerator[bytes, None]:
+        """One GeoJSON feature per line, in upstream order.
+
+        With ``ctx.deadline`` set, upstream streams still open at the deadline
+        are cut off and the stream ends with one
+        ``{"partial": true, "missing_segments": [...]}`` line.
+        """
         headers = {"Accept-Encoding": "gzip, deflate"}
+        missing: Set[Tuple[date, date]] = set()
         async with httpx.AsyncClient(headers=headers) as client:
             seen = set()
-            for url in ctx.urls:
-                async for row in self.client.stream_records(url, ctx.selected_source, client=client):
+            archived = await self.read_archive(ctx)
+
+            async def archived_rows():
+                for row in chain(archived, chain.from_iterable(ctx.cached.values())):
+                    yield row
+
+            async def upstream_rows(url: str):
+                if ctx.deadline is None:
+                    async for row in self.client.stream_records(url, ctx.selected_source, client=client):
+                        yield row
+                    return
+                remaining = ctx.deadline - time.monotonic()
+                if remaining <= 0:
+                    missing.add(_url_days(url))
+                    return
+                batches = self.client.stream_batches(url, ctx.selected_source, client=client, timeout=remaining)
+                try:
+                    while True:
+                        remaining = max(0.0, ctx.deadline - time.monotonic())
+                        try:
+                            batch = await asyncio.wait_for(batches.__anext__(), remaining)
+                        except StopAsyncIteration:
+                            return
+                        except (asyncio.TimeoutError, httpx.TimeoutException):
+                            missing.add(_url_days(url))
+                            return
+                        for row in batch:
+                            yield row
+                finally:
+                    await batches.aclose()
+
+            sources = [archived_rows()] + [upstream_rows(url) for url in ctx.urls]
+            keep = ctx.predicate
+            for rows in sources:
+                async for row in rows:
+                    if keep is not None and not keep(row):
+                        continue
                     key = (
                         row.get("acq_date"),
                         row.get("acq_time"),
@@ -192,11 +603,96 @@ class FireService:
                     if key in seen:
                         continue
                     seen.add(key)
-                    feature = to_geojson([row])["features"][0]
+                    features = to_geojson([row], ctx.fields, ctx.precision)["features"]
+                    if not features:
+                        continue
+                    feature = features[0]
                     yield (json.dumps(feature) + "\n").encode("utf-8")
+        if missing:
+            DEADLINE_MISSED_SEGMENTS.inc(len(missing))
+            ctx.missing = sorted(missing)
+            status = {"partial": True, "missing_segments": _segment_labels(ctx.missing)}
+            yield (json.dumps(status) + "\n").encode("utf-8")
+
+    @timed("geojson")
+    def to_geojson(
+        self,
+        records: List[Dict],
+        fields: Optional[Tuple[str, ...]] = None,
+        precision: Optional[int] = None,
+        id_of: Optional[Callable[[Dict], Any]] = None,
+    ) -> Dict[str, Any]:
+        return to_geojson(records, fields, precision, id_of)
+
+    def partition_versions(self, ctx: FireQueryContext) -> Optional[Dict[date, int]]:
+        """Version of the data behind each day of ``ctx``, after :meth:`fetch`.
+
+        ``None`` when some day is not held by a versioned partition (e.g. it
+        was evicted in between), so no version token can be issued.
+        """
+        archived = set(ctx.archived_days)
+        days = [day for day in _days(ctx.start, ctx.end) if day not in archived]
+        versions = self.partitions.versions(ctx.selected_source, ctx.area, days)
+        if len(versions) != len(days):
+            return None
+        versions.update((day, ARCHIVED) for day in archived)
+        return versions
+
+    @timed("events")
+    async def group_events(
+        self, records: List[Dict], *, distance_km: float, gap_hours: float, min_count: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Cluster detections into fire events off the event loop."""
+        return await asyncio.to_thread(group_events, records, distance_km, gap_hours, min_count)
+
+    @timed("bucket")
+    def bucket_by_day(self, records: List[Dict], start: date, end: date) -> Dict[str, List[Dict]]:
+        """Group ``records`` into one list per day of ``[start, end]``, in date order."""
+        return bucket_by_date(records, start, end)
+
+    def project(
+        self,
+        records: List[Dict],
+        fields: Optional[Tuple[str, ...]] = None,
+        precision: Optional[int] = None,
+        id_of: Optional[Callable[[Dict], Any]] = None,
+    ) -> List[Dict]:
+        return project_records(records, fields, precision, id_of)
 
-    def to_geojson(self, records: List[Dict]) -> Dict[str, Any]:
-        return to_geojson(records)
+    @staticmethod
+    def compile_filter(
+        *,
+        min_confidence: Optional[str] = None,
+        min_frp: Optional[float] = None,
+        max_frp: Optional[float] = None,
+        daynight: Optional[str] = None,
+        satellite: Optional[str] = None,
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+    ) -> Optional[Callable[[Dict], bool]]:
+        try:
+            satellites = frozenset(s.strip() for s in (satellite or "").split(",") if s.strip())
+            record_filter = RecordFilter(
+                min_confidence=parse_confidence(min_confidence),
+                min_frp=min_frp,
+                max_frp=max_frp,
+                daynight=daynight,
+                satellites=satellites or None,
+                time_from=parse_time(time_from, "timeFrom"),
+                time_to=parse_time(time_to, "timeTo"),
+            )
+        except ValueError as exc:
+            raise HTTPExceptionFactory.bad_request(str(exc)) from exc
+        if min_frp is not None and max_frp is not None and min_frp > max_frp:
+            raise HTTPExceptionFactory.bad_request("minFrp must not exceed maxFrp")
+        return record_filter.compile()
+
+    @staticmethod
+    def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+        try:
+            return parse_fields(raw)
+        except ValueError as exc:
+            raise HTTPExceptionFactory.bad_request(str(exc)) from exc
 
     def empty_response(self, format: str) -> Any:
         if format == "geojson":
@@ -231,6 +727,7 @@ class FireService:
             raise HTTPExceptionFactory.service_unavailable(str(exc)) from exc
 
 
+@timed("stats")
 def _compute_stats(points: List[Dict], frp_mid: float = 5, frp_high: float = 20) -> Dict[str, Any]:
     total = len(points)
     stats = {
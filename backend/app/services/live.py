@@ -0,0 +1,228 @@
+"""Shared upstream polling for the live detection feed.
+
+Subscribers watch a bbox; the bbox is split into fixed ``tile``-degree tiles
+and each ``(source, tile)`` has at most one poller, however many viewers
+watch it. Upstream cost therefore scales with the distinct tiles being
+watched, not with the number of viewers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from ..clients.firms import record_key
+from .fires import FireQueryContext, FireService
+from .partitions import Area
+
+logger = logging.getLogger(__name__)
+
+Tile = Tuple[int, int]
+RowKey = Tuple
+
+
+def _lon_lat(row: Dict) -> Optional[Tuple[float, float]]:
+    try:
+        return float(row.get("longitude")), float(row.get("latitude"))
+    except (TypeError, ValueError):
+        return None
+
+
+class Subscription:
+    """One viewer: a bbox, an optional row predicate and a bounded queue of batches."""
+
+    def __init__(self, area: Area, predicate: Optional[Callable[[Dict], bool]], max_batches: int) -> None:
+        self.area = area
+        self.predicate = predicate
+        self.queue: "asyncio.Queue[List[Dict]]" = asyncio.Queue(max_batches)
+        self.dropped = 0
+
+    def select(self, rows: List[Dict]) -> List[Dict]:
+        west, south, east, north = self.area
+        kept = []
+        for row in rows:
+            point = _lon_lat(row)
+            if point is None or not (west <= point[0] <= east and south <= point[1] <= north):
+                continue
+            if self.predicate is None or self.predicate(row):
+                kept.append(row)
+        return kept
+
+    def offer(self, rows: List[Dict]) -> None:
+        rows = self.select(rows)
+        if not rows:
+            return
+        # A slow viewer loses its oldest batch rather than stalling the poller
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(rows)
+
+
+class TilePoller:
+    """Polls one ``(source, tile)`` and fans out rows it has not seen before."""
+
+    def __init__(self, hub: "LiveHub", source: str, tile: Tile) -> None:
+        self.hub = hub
+        self.source = source
+        self.tile = tile
+        self.subscribers: Set[Subscription] = set()
+        self.seen: Dict[RowKey, Dict] = {}
+        self.polls = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def area(self) -> Area:
+        return self.hub.tile_area(self.tile)
+
+    def backlog(self) -> List[Dict]:
+        return list(self.seen.values())
+
+    def absorb(self, rows: List[Dict], days: List[date]) -> List[Dict]:
+        """Record rows owned by this tile and return the new ones."""
+        window = {day.isoformat() for day in days}
+        self.seen = {key: row for key, row in self.seen.items() if row.get("acq_date") in window}
+        fresh = []
+        for row in rows:
+            point = _lon_lat(row)
+            if point is None or self.hub.tile_of(*point) != self.tile:
+                continue
+            key = record_key(row)
+            if key not in self.seen:
+                self.seen[key] = row
+                fresh.append(row)
+        return fresh
+
+    async def run(self) -> None:
+        days = self.hub.window()
+        # Seed from the partition cache so a cold tile can serve its backlog without polling
+        cached = self.hub.service.partitions.lookup(self.source, self.area, days)
+        if len(cached) == len(days):
+            self.publish(self.absorb([row for rows in cached.values() for row in rows], days))
+            await asyncio.sleep(self.hub.interval)
+        while True:
+            days = self.hub.window()
+            try:
+                rows = await self.hub.poll(self.source, self.area, days)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # keep the feed alive across upstream hiccups
+                logger.warning("Live poll of %s %s failed: %s", self.source, self.tile, exc)
+            else:
+                self.polls += 1
+                self.publish(self.absorb(rows, days))
+            await asyncio.sleep(self.hub.interval)
+
+    def publish(self, rows: List[Dict]) -> None:
+        if rows:
+            for sub in list(self.subscribers):
+                sub.offer(rows)
+
+
+class LiveHub:
+    """Registry of tile pollers shared by every live subscriber."""
+
+    def __init__(
+        self,
+        service: FireService,
+        *,
+        interval: float = 60.0,
+        tile_degrees: float = 10.0,
+        days: int = 2,
+        max_batches: int = 64,
+    ) -> None:
+        self.service = service
+        self.interval = interval
+        self.tile_degrees = tile_degrees
+        self.days = days
+        self.max_batches = max_batches
+        self.pollers: Dict[Tuple[str, Tile], TilePoller] = {}
+
+    def tile_of(self, lon: float, lat: float) -> Tile:
+        size = self.tile_degrees
+        # Points on the east/north world edge belong to the last tile
+        x = min(math.floor((lon + 180) / size), math.ceil(360 / size) - 1)
+        y = min(math.floor((lat + 90) / size), math.ceil(180 / size) - 1)
+        return x, y
+
+    def tile_area(self, tile: Tile) -> Area:
+        size = self.tile_degrees
+        x, y = tile
+        return (
+            -180 + x * size,
+            -90 + y * size,
+            min(180.0, -180 + (x + 1) * size),
+            min(90.0, -90 + (y + 1) * size),
+        )
+
+    def tiles(self, area: Area) -> List[Tile]:
+        west, south, east, north = area
+        size = self.tile_degrees
+        x0, y0 = self.tile_of(west, south)
+        # An east/north edge on a tile boundary does not reach into the next tile
+        x1 = max(x0, min(math.ceil((east + 180) / size) - 1, math.ceil(360 / size) - 1))
+        y1 = max(y0, min(math.ceil((north + 90) / size) - 1, math.ceil(180 / size) - 1))
+        return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+    def window(self) -> List[date]:
+        # NRT detections for a day keep arriving after midnight, so poll yesterday too
+        today = datetime.now().date()
+        return [today - timedelta(days=i) for i in reversed(range(max(1, self.days)))]
+
+    async def poll(self, source: str, area: Area, days: List[date]) -> List[Dict]:
+        """One upstream fetch for a tile; results also refresh the partition cache."""
+        ctx = FireQueryContext(
+            urls=self.service.compose_days(source, area, days),
+            selected_source=source,
+            area=area,
+            start=days[0],
+            end=days[-1],
+            upstream_days=days,
+        )
+        return await self.service.fetch(ctx, max_concurrency=1)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, source: str, area: Area, predicate: Optional[Callable[[Dict], bool]] = None
+    ) -> AsyncIterator[Tuple[Subscription, List[Dict]]]:
+        """Register a viewer; yields its subscription and the cached backlog."""
+        sub = Subscription(area, predicate, self.max_batches)
+        pollers = []
+        for tile in self.tiles(area):
+            poller = self.pollers.get((source, tile))
+            if poller is None:
+                poller = self.pollers[(source, tile)] = TilePoller(self, source, tile)
+            poller.subscribers.add(sub)
+            pollers.append(poller)
+        backlog = sub.select([row for poller in pollers for row in poller.backlog()])
+        for poller in pollers:
+            if poller.task is None:
+                poller.task = asyncio.create_task(poller.run())
+        try:
+            yield sub, backlog
+        finally:
+            for poller in pollers:
+                poller.subscribers.discard(sub)
+                if not poller.subscribers:
+                    self.pollers.pop((source, poller.tile), None)
+                    poller.task.cancel()
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "pollers": len(self.pollers),
+            "subscribers": len({sub for poller in self.pollers.values() for sub in poller.subscribers}),
+            "polls": sum(poller.polls for poller in self.pollers.values()),
+        }
+
+    async def close(self) -> None:
+        tasks = [poller.task for poller in self.pollers.values() if poller.task is not None]
+        self.pollers.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,103 @@
+"""Keyset cursors for paginated queries, with a short-lived cache of sorted results."""
+
+from __future__ import annotations
+
+import base64
+import json
+import secrets
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core.cache import TTLCache
+
+RowKey = Tuple[str, ...]
+
+# Page size when a cursor is sent without ``limit``
+DEFAULT_PAGE_SIZE = 1000
+
+
+def row_key(row: Dict) -> RowKey:
+    """Sort key ``(acq_date, acq_time, id)``; the id is the rest of the dedup key."""
+    return (
+        str(row.get("acq_date") or ""),
+        str(row.get("acq_time") or "").zfill(4),
+        str(row.get("latitude") or ""),
+        str(row.get("longitude") or ""),
+        str(row.get("source") or ""),
+    )
+
+
+def encode_cursor(query: Dict[str, str], after: RowKey, result_id: Optional[str] = None) -> str:
+    """Pack the query, the last row key served and (optionally) the local result holding it."""
+    raw = json.dumps([query, list(after), result_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Dict[str, str], RowKey, Optional[str]]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        query, after, result_id = json.loads(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if (
+        not isinstance(query, dict)
+        or not all(isinstance(k, str) and isinstance(v, str) for k, v in query.items())
+        or not isinstance(after, list)
+        or not all(isinstance(p, str) for p in after)
+        or not (result_id is None or isinstance(result_id, str))
+    ):
+        raise ValueError("Malformed cursor")
+    return query, tuple(after), result_id
+
+
+class ResultPages:
+    """Deduplicated results sorted once by :func:`row_key` and sliced by keyset.
+
+    A cursor carries its query and the last key served, so any worker can
+    resume it by re-running the query and skipping rows up to that key. The
+    sorted result is also kept here for ``ttl_seconds`` as a cache: later
+    pages on the same worker are a ``bisect`` plus a list slice, with no
+    refetch or re-sort.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: Optional[float] = 300) -> None:
+        self.results: TTLCache[str, Tuple[Dict[str, str], List[RowKey], List[Dict]]] = TTLCache(
+            max_entries, ttl_seconds
+        )
+
+    def materialize(
+        self, query: Dict[str, str], rows: Sequence[Dict], after: Optional[RowKey], limit: int
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        """Sort and cache the result of ``query`` and return its page following ``after``."""
+        keyed = sorted(((row_key(row), row) for row in rows), key=lambda item: item[0])
+        result_id = secrets.token_urlsafe(12)
+        entry = (query, [key for key, _ in keyed], [row for _, row in keyed])
+        self.results.set(result_id, entry)
+        return self._slice(result_id, entry, after, limit)
+
+    def page(
+        self, result_id: Optional[str], after: Optional[RowKey], limit: int
+    ) -> Optional[Tuple[List[Dict], Optional[str], int]]:
+        """Rows following ``after``, the cursor for the next page and the total.
+
+        Returns ``None`` when the result is not cached here (expired, evicted
+        or materialized by another worker); the caller then re-runs the query.
+        """
+        entry = self.results.get(result_id) if result_id else None
+        if entry is None:
+            return None
+        return self._slice(result_id, entry, after, limit)
+
+    @staticmethod
+    def _slice(
+        result_id: str, entry: Tuple[Dict[str, str], List[RowKey], List[Dict]], after: Optional[RowKey], limit: int
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        query, keys, rows = entry
+        start = 0 if after is None else bisect_right(keys, after)
+        end = start + limit
+        next_cursor = encode_cursor(query, keys[end - 1], result_id) if end < len(rows) else None
+        return rows[start:end], next_cursor, len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        return self.results.stats()
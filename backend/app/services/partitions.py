@@ -0,0 +1,146 @@
+"""Per-day cache of upstream FIRMS records."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from datetime import date
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from utils.datebucket import bucket_by_date
+
+from ..clients.firms import record_id
+from ..core.cache import TTLCache
+
+Area = Tuple[float, float, float, float]
+PartitionKey = Tuple[str, Area, date]
+
+
+def contains(outer: Area, inner: Area) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def clip(rows: Iterable[Dict], area: Area) -> List[Dict]:
+    """Keep the rows whose coordinates fall inside ``area``."""
+    west, south, east, north = area
+    kept: List[Dict] = []
+    for row in rows:
+        try:
+            lon = float(row.get("longitude"))
+            lat = float(row.get("latitude"))
+        except (TypeError, ValueError):
+            continue
+        if west <= lon <= east and south <= lat <= north:
+            kept.append(row)
+    return kept
+
+
+class PartitionCache:
+    """Unfiltered upstream records, one entry per ``(source, area, day)``.
+
+    Entries always hold a complete day, including empty ones, so a cached day
+    never needs an upstream call. A lookup for an area inside a cached area
+    (a bbox within a warmed country) is answered by clipping the cached rows.
+
+    Every distinct content of an entry gets a new version, and the record ids
+    of recent versions are kept in ``history`` so the changes between two
+    versions of a day can be computed without the old rows. Versions start
+    from the wall clock so they never repeat across restarts.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 900) -> None:
+        self.entries: TTLCache[PartitionKey, List[Dict]] = TTLCache(max_entries, ttl_seconds)
+        self.version_of: Dict[PartitionKey, int] = {}
+        # Room for the live version of every entry plus a few superseded ones
+        self.history: TTLCache[int, FrozenSet[str]] = TTLCache(max_entries * 2)
+        self._versions = itertools.count(time.time_ns() // 1000)
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _find(self, source: str, area: Area, day: date, keys: List[PartitionKey]) -> Optional[PartitionKey]:
+        """A live key containing ``area`` on ``day``, for when the exact key missed."""
+        for key in keys:
+            if key[0] == source and key[2] == day and contains(key[1], area):
+                return key
+        return None
+
+    def lookup(self, source: str, area: Area, days: Sequence[date]) -> Dict[date, List[Dict]]:
+        found: Dict[date, List[Dict]] = {}
+        keys: Optional[List[PartitionKey]] = None
+        for day in days:
+            rows = self.entries.get((source, area, day))
+            if rows is None:
+                if keys is None:
+                    keys = self.entries.keys()
+                outer_key = self._find(source, area, day, keys)
+                outer = None if outer_key is None else self.entries.peek(outer_key)
+                if outer is not None:
+                    rows = clip(outer, area)
+            if rows is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                found[day] = rows
+        return found
+
+    def store(self, source: str, area: Area, days: Sequence[date], records: Iterable[Dict]) -> None:
+        """Cache ``records`` fetched for exactly ``days`` of ``area``."""
+        if not days:
+            return
+        ordered = sorted(days)
+        buckets = bucket_by_date(records, ordered[0], ordered[-1])
+        for day in ordered:
+            key = (source, area, day)
+            rows = buckets[day.isoformat()]
+            self.entries.set(key, rows)
+            self._version(key, rows)
+        if len(self.version_of) > 2 * self.entries.max_entries:
+            live = set(self.entries.keys())
+            self.version_of = {key: v for key, v in self.version_of.items() if key in live}
+
+    def _version(self, key: PartitionKey, rows: List[Dict]) -> int:
+        """Keep ``key``'s version when its record ids are unchanged, else mint one."""
+        ids = frozenset(record_id(row) for row in rows)
+        current = self.version_of.get(key)
+        if current is not None and self.history.peek(current) == ids:
+            return current
+        version = next(self._versions)
+        self.history.set(version, ids)
+        self.version_of[key] = version
+        return version
+
+    def versions(self, source: str, area: Area, days: Sequence[date]) -> Dict[date, int]:
+        """Version of the entry that :meth:`lookup` would answer each day from."""
+        found: Dict[date, int] = {}
+        keys = self.entries.keys()
+        live = set(keys)
+        for day in days:
+            key: Optional[PartitionKey] = (source, area, day)
+            if key not in live:
+                key = self._find(source, area, day, keys)
+            if key is not None and key in self.version_of:
+                found[day] = self.version_of[key]
+        return found
+
+    def ids(self, version: int) -> Optional[FrozenSet[str]]:
+        """Record ids of ``version``, or ``None`` once it has left the history."""
+        return self.history.peek(version)
+
+    def dump(self) -> List[List[Any]]:
+        """JSON-friendly ``[source, area, day, stored_at, rows]`` entries for snapshots."""
+        return [
+            [source, list(area), day.isoformat(), stored, rows]
+            for (source, area, day), stored, rows in self.entries.dump()
+        ]
+
+    def restore(self, entries: Iterable[List[Any]]) -> int:
+        restored = self.entries.restore(
+            ((source, tuple(area), date.fromisoformat(day)), stored, rows)
+            for source, area, day, stored, rows in entries
+        )
+        for key, _, rows in self.entries.dump():
+            if key not in self.version_of:
+                self._version(key, rows)
+        return restored
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "evictions": self.entries.stats()["evictions"]}
@@ -0,0 +1,99 @@
+"""Coverage-aware planning of the upstream calls behind a query."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+Area = Tuple[float, float, float, float]
+
+# Longest day range FIRMS serves in one area call
+MAX_CALL_DAYS = 10
+
+
+def pack_days(days: Iterable[date], max_span: int = MAX_CALL_DAYS) -> List[Tuple[date, date]]:
+    """Fewest ``(first, last)`` windows of at most ``max_span`` days covering ``days``.
+
+    Starting each window at the earliest day not yet covered is optimal for
+    fixed-length windows. A window may span days that are already held
+    locally when that saves a call; it is trimmed to its last needed day.
+    """
+    windows: List[Tuple[date, date]] = []
+    for day in sorted(set(days)):
+        if windows and day <= windows[-1][0] + timedelta(days=max_span - 1):
+            windows[-1] = (windows[-1][0], day)
+        else:
+            windows.append((day, day))
+    return windows
+
+
+def _ranges(days: Iterable[date]) -> List[List[str]]:
+    spans: List[List[date]] = []
+    for day in sorted(days):
+        if spans and spans[-1][1] + timedelta(days=1) == day:
+            spans[-1][1] = day
+        else:
+            spans.append([day, day])
+    return [[first.isoformat(), last.isoformat()] for first, last in spans]
+
+
+@dataclass
+class UpstreamCall:
+    first: date
+    last: date
+    # Areas requested for this day range; several when the quadtree split it
+    areas: List[Area]
+
+    @property
+    def days(self) -> List[date]:
+        return [self.first + timedelta(days=i) for i in range((self.last - self.first).days + 1)]
+
+
+@dataclass
+class QueryPlan:
+    """Where each day of a query comes from: archive, cache or an upstream call."""
+
+    source: str
+    area: Area
+    start: date
+    end: date
+    archived: List[date] = field(default_factory=list)
+    cached: List[date] = field(default_factory=list)
+    calls: List[UpstreamCall] = field(default_factory=list)
+
+    @property
+    def upstream_days(self) -> List[date]:
+        return [day for call in self.calls for day in call.days]
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON summary for ``/api/fires/debug/compose``."""
+        local = set(self.archived) | set(self.cached)
+        return {
+            "source": self.source,
+            "area": list(self.area),
+            "days": (self.end - self.start).days + 1,
+            "archived": _ranges(self.archived),
+            "cached": _ranges(self.cached),
+            "calls": [
+                {
+                    "first": call.first.isoformat(),
+                    "last": call.last.isoformat(),
+                    "areas": [list(area) for area in call.areas],
+                    # Days already held locally, fetched again to save a call
+                    "bridged": sum(1 for day in call.days if day in local),
+                }
+                for call in self.calls
+            ],
+            "upstream_requests": sum(len(call.areas) for call in self.calls),
+        }
+
+
+def plan_calls(
+    needed: Sequence[date], split: Callable[[int], List[Area]], max_span: int = MAX_CALL_DAYS
+) -> List[UpstreamCall]:
+    """Pack ``needed`` days into calls; ``split(days)`` gives each call's areas."""
+    return [
+        UpstreamCall(first, last, split((last - first).days + 1))
+        for first, last in pack_days(needed, max_span)
+    ]
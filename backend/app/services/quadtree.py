@@ -0,0 +1,169 @@
+"""Density-adaptive splitting of large upstream area requests.
+
+FIRMS builds one CSV per call, so a continent-sized bbox in fire season is a
+single slow response. :class:`QuadtreePlanner` learns detections per day on a
+coarse global grid from every upstream response (and from restored cache
+partitions), and splits an area whose predicted row count exceeds
+``target_rows`` into quadrants, recursively, so the pieces can be fetched
+concurrently. Sparse sibling quadrants are merged back into one rectangle so
+empty ocean or desert costs one call instead of several. Points on a shared
+edge come back from both neighbours; callers deduplicate.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.cache import TTLCache
+
+Area = Tuple[float, float, float, float]
+Cell = Tuple[int, int]
+
+# Cells covered less than this are too partially seen to estimate from
+MIN_COVERAGE = 0.05
+# Weight of the newest observation in a cell's running rate
+ALPHA = 0.5
+# Quadrants never get narrower than this many degrees
+MIN_SPAN_DEGREES = 1.0
+# At most 16 calls per day range, to stay gentle on the FIRMS quota
+MAX_DEPTH = 2
+# Coordinates in composed URLs
+URL_DECIMALS = 4
+# Rows binned per observation; larger responses are sampled evenly
+SAMPLE_ROWS = 20_000
+
+
+def _column(rows: List[Dict], key: str) -> np.ndarray:
+    try:
+        return np.asarray([row.get(key) for row in rows], dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(rows), np.nan)
+        for i, row in enumerate(rows):
+            try:
+                out[i] = float(row.get(key))
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def _overlap(a: Area, b: Area) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0.0, width) * max(0.0, height)
+
+
+def _quadrants(area: Area) -> List[Area]:
+    """``[SW, SE, NW, NE]`` quarters of ``area``."""
+    west, south, east, north = area
+    mid_lon = round((west + east) / 2, URL_DECIMALS)
+    mid_lat = round((south + north) / 2, URL_DECIMALS)
+    return [
+        (west, south, mid_lon, mid_lat),
+        (mid_lon, south, east, mid_lat),
+        (west, mid_lat, mid_lon, north),
+        (mid_lon, mid_lat, east, north),
+    ]
+
+
+class QuadtreePlanner:
+    """Per-source detection rates on a ``cell_degrees`` grid and the splits they imply."""
+
+    def __init__(self, target_rows: int = 50_000, cell_degrees: float = 5.0, max_cells: int = 65_536) -> None:
+        self.target_rows = target_rows
+        self.cell_degrees = cell_degrees
+        # Detections per day over a whole cell, per (source, cell)
+        self.rates: TTLCache[Tuple[str, Cell], float] = TTLCache(max_cells)
+
+    def _cells(self, area: Area) -> List[Tuple[Cell, float]]:
+        """Grid cells intersecting ``area`` with the fraction of each it covers."""
+        size = self.cell_degrees
+        west, south, east, north = area
+        x0, x1 = math.floor((west + 180) / size), math.ceil((east + 180) / size)
+        y0, y1 = math.floor((south + 90) / size), math.ceil((north + 90) / size)
+        cells = []
+        for y in range(y0, max(y1, y0 + 1)):
+            for x in range(x0, max(x1, x0 + 1)):
+                box = (-180 + x * size, -90 + y * size, -180 + (x + 1) * size, -90 + (y + 1) * size)
+                fraction = _overlap(box, area) / (size * size)
+                if fraction > 0:
+                    cells.append(((x, y), fraction))
+        return cells
+
+    def observe(self, source: str, area: Area, days: Sequence[date], rows: Iterable[Dict]) -> None:
+        """Learn from the complete upstream result for ``days`` of ``area``."""
+        if not days:
+            return
+        rows = rows if isinstance(rows, list) else list(rows)
+        step = max(1, len(rows) // SAMPLE_ROWS)
+        rows = rows[::step]
+        size = self.cell_degrees
+        lon, lat = _column(rows, "longitude"), _column(rows, "latitude")
+        valid = np.isfinite(lon) & np.isfinite(lat)
+        ix = np.floor((lon[valid] + 180) / size).astype(np.int64)
+        iy = np.floor((lat[valid] + 90) / size).astype(np.int64)
+        width = int(math.ceil(360 / size)) + 1
+        ids, counts = np.unique(iy * width + ix, return_counts=True)
+        found = {(int(i % width), int(i // width)): int(c) * step for i, c in zip(ids.tolist(), counts.tolist())}
+        for cell, fraction in self._cells(area):
+            if fraction < MIN_COVERAGE:
+                continue
+            rate = found.get(cell, 0) / (len(days) * fraction)
+            key = (source, cell)
+            old = self.rates.peek(key)
+            self.rates.set(key, rate if old is None else old + (rate - old) * ALPHA)
+
+    def learn(self, entries: Iterable[Tuple[Tuple[str, Area, date], float, List[Dict]]]) -> None:
+        """Seed rates from cached ``((source, area, day), stored, rows)`` partitions."""
+        for (source, area, day), _, rows in entries:
+            self.observe(source, area, [day], rows)
+
+    def estimate(self, source: str, area: Area, days: int) -> Optional[float]:
+        """Predicted rows for ``days`` of ``area``; ``None`` when no cell of it has been seen."""
+        total, known = 0.0, False
+        for cell, fraction in self._cells(area):
+            rate = self.rates.peek((source, cell))
+            if rate is not None:
+                total += rate * fraction
+                known = True
+        return total * days if known else None
+
+    def split(self, source: str, area: Area, days: int) -> List[Area]:
+        """Areas to request separately so each is predicted under ``target_rows``.
+
+        Returns ``[area]`` when splitting is disabled, the area is not
+        predicted dense or nothing is known about it yet.
+        """
+        if self.target_rows <= 0:
+            return [area]
+        return self._split(source, area, days, 0)
+
+    def _split(self, source: str, area: Area, days: int, depth: int) -> List[Area]:
+        estimate = self.estimate(source, area, days)
+        narrow = min(area[2] - area[0], area[3] - area[1]) < 2 * MIN_SPAN_DEGREES
+        if estimate is None or estimate <= self.target_rows or depth >= MAX_DEPTH or narrow:
+            return [area]
+        quads = _quadrants(area)
+        dense = [(self.estimate(source, quad, days) or 0.0) > self.target_rows for quad in quads]
+        parts: List[Area] = []
+        used = [False] * 4
+        # Sparse siblings sharing a whole edge go out as one half: south, north, west, east
+        for a, b in ((0, 1), (2, 3), (0, 2), (1, 3)):
+            if used[a] or used[b] or dense[a] or dense[b]:
+                continue
+            merged = (
+                min(quads[a][0], quads[b][0]),
+                min(quads[a][1], quads[b][1]),
+                max(quads[a][2], quads[b][2]),
+                max(quads[a][3], quads[b][3]),
+            )
+            if (self.estimate(source, merged, days) or 0.0) <= self.target_rows:
+                parts.append(merged)
+                used[a] = used[b] = True
+        for i, quad in enumerate(quads):
+            if not used[i]:
+                parts.extend(self._split(source, quad, days, depth + 1))
+        return parts
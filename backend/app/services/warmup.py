@@ -0,0 +1,133 @@
+"""Background cache warm-up for popular regions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+
+from services.geo import load_countries
+
+from ..core.config import settings
+from .fires import COUNTRY_BBOX, FireService
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Prefetch the last ``days`` days for ``regions`` into the service caches.
+
+    Runs at low priority: regions are fetched one at a time with a single
+    upstream connection and a pause in between, so user requests keep the
+    shared concurrency. The first pass starts after ``delay`` seconds and is
+    repeated every ``interval`` seconds (``0`` runs it once). Refresh passes
+    bypass the partition cache so entries are renewed before they expire.
+    """
+
+    def __init__(
+        self,
+        service: FireService,
+        *,
+        regions: Sequence[str],
+        days: int,
+        interval: float,
+        delay: float = 0.0,
+        pause: float = 0.5,
+    ) -> None:
+        self.service = service
+        self.regions = list(regions)
+        self.days = days
+        self.interval = interval
+        self.delay = delay
+        self.pause = pause
+        self._status: Dict[str, Any] = {
+            "state": "pending",
+            "regions_total": len(self.regions),
+            "regions_done": 0,
+            "failed": [],
+            "passes": 0,
+            "last_started": None,
+            "last_finished": None,
+            "next_run": None,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {**self._status, "failed": list(self._status["failed"])}
+
+    async def run_forever(self) -> None:
+        await asyncio.sleep(self.delay)
+        while True:
+            await self.run_once(refresh=self._status["passes"] > 0)
+            if self.interval <= 0:
+                return
+            self._status["next_run"] = time.time() + self.interval
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self, *, refresh: bool = False) -> None:
+        self._status.update(state="running", regions_done=0, failed=[], last_started=time.time(), next_run=None)
+        await self._warm_metadata()
+        end = datetime.now().date()
+        start = end - timedelta(days=max(1, self.days) - 1)
+        for region in self.regions:
+            try:
+                ctx = await self.service.prepare_query(
+                    response=Response(),
+                    country=region,
+                    west=None,
+                    south=None,
+                    east=None,
+                    north=None,
+                    start_date=start.isoformat(),
+                    end_date=end.isoformat(),
+                    source_priority=None,
+                    refresh=refresh,
+                )
+                if ctx is not None and ctx.urls:
+                    await self.service.fetch(ctx, max_concurrency=1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # keep warming the other regions
+                logger.warning("Warm-up of %s failed: %s", region, exc)
+                self._status["failed"].append(region)
+            self._status["regions_done"] += 1
+            await asyncio.sleep(self.pause)
+        self._status.update(state="idle", last_finished=time.time())
+        self._status["passes"] += 1
+
+    async def _warm_metadata(self) -> None:
+        # The availability cache is filled by the first prepare_query; the
+        # country list is only used by tooling but is cheap to keep warm.
+        try:
+            await asyncio.to_thread(load_countries, base_url=settings.firms_base_url)
+        except Exception as exc:  # pragma: no cover - network dependent
+            logger.warning("Warm-up of country list failed: %s", exc)
+
+
+def warmup_regions() -> List[str]:
+    """Configured warm-up regions, defaulting to every built-in country bbox."""
+    if settings.warmup_regions_raw:
+        regions = [r.strip().upper() for r in settings.warmup_regions_raw.split(",") if r.strip()]
+        return [r for r in regions if r in COUNTRY_BBOX]
+    return sorted(COUNTRY_BBOX)
+
+
+def create_warmer(service: FireService) -> Optional[CacheWarmer]:
+    """Build the warmer from settings, or ``None`` when disabled or no MAP_KEY is set."""
+    if not settings.warmup_enabled:
+        return None
+    try:
+        settings.map_key
+    except RuntimeError:
+        logger.info("Cache warm-up disabled: FIRMS_MAP_KEY is not configured")
+        return None
+    return CacheWarmer(
+        service,
+        regions=warmup_regions(),
+        days=settings.warmup_days,
+        interval=settings.warmup_interval,
+        delay=settings.warmup_delay,
+    )
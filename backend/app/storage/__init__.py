@@ -0,0 +1,3 @@
+from .archive import ColumnarArchive
+
+__all__ = ["ColumnarArchive"]
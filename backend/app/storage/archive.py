@@ -0,0 +1,363 @@
+"""Append-only columnar archive for historical (SP) FIRMS detections.
+
+Each ``(source, year)`` partition lives in its own directory and stores one
+fixed-width column file per field plus a day-offset index::
+
+    <root>/<SOURCE>/<YEAR>/
+        meta.json         row counts and covered (day, bbox) extents
+        day.col           uint16 day-of-year per row
+        latitude.col      float64 per row (same for the other numeric fields)
+        acq_time.col      fixed-width ASCII per row (same for the text fields)
+        index.col         uint32 row offsets, entry ``d`` is the first row of day-of-year ``d + 1``
+
+Rows covered by the index are sorted by day, so a date range inside a year is
+one contiguous row slice. Appends land in an unsorted tail that is scanned
+linearly until :meth:`ColumnarArchive.rebuild_index` folds it back in. Readers
+map the column files with ``mmap`` and slice them without copying; the bbox
+test runs in bulk over the mapped coordinate columns, and only rows that fall
+inside the requested bbox are materialised into record dicts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+from array import array
+from datetime import date, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BBox = Tuple[float, float, float, float]
+
+# (field, array typecode or "s" for fixed-width text, byte width)
+COLUMNS: Tuple[Tuple[str, str, int], ...] = (
+    ("latitude", "d", 8),
+    ("longitude", "d", 8),
+    ("bright_ti4", "d", 8),
+    ("bright_ti5", "d", 8),
+    ("frp", "d", 8),
+    ("acq_time", "s", 4),
+    ("confidence", "s", 3),
+    ("satellite", "s", 8),
+    ("instrument", "s", 8),
+    ("daynight", "s", 1),
+    ("country_id", "s", 3),
+)
+DAY_COLUMN = "day"
+INDEX_FILE = "index.col"
+META_FILE = "meta.json"
+INDEX_SIZE = 367  # one offset per day-of-year boundary (leap years included)
+
+
+def _format_float(value: float) -> str:
+    return "" if math.isnan(value) else repr(value)
+
+
+def _parse_float(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _encode_text(value: object, width: int) -> bytes:
+    raw = str(value or "").encode("ascii", "replace")[:width]
+    return raw.ljust(width, b"\0")
+
+
+def _contains(outer: BBox, inner: BBox) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+class _Partition:
+    """One ``(source, year)`` directory of column files."""
+
+    def __init__(self, path: Path, year: int) -> None:
+        self.path = path
+        self.year = year
+        self.meta = self._load_meta()
+        self.meta_mtime = self._meta_mtime()
+        self._maps: List[mmap.mmap] = []
+        self._views: Optional[Dict[str, memoryview]] = None
+
+    # -- metadata -----------------------------------------------------------------
+
+    def _load_meta(self) -> Dict:
+        meta_path = self.path / META_FILE
+        if meta_path.exists():
+            try:
+                return json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable archive metadata at %s", meta_path)
+        return {"rows": 0, "indexed_rows": 0, "coverage": {}}
+
+    def _write_meta(self) -> None:
+        tmp = self.path / (META_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.meta), encoding="utf-8")
+        os.replace(tmp, self.path / META_FILE)
+        self.meta_mtime = self._meta_mtime()
+
+    def _meta_mtime(self) -> int:
+        try:
+            return (self.path / META_FILE).stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def stale(self) -> bool:
+        """True when another process (e.g. the ingest CLI) rewrote this partition."""
+        return self._meta_mtime() != self.meta_mtime
+
+    @property
+    def rows(self) -> int:
+        return int(self.meta["rows"])
+
+    def covered(self, doy: int, bbox: BBox) -> bool:
+        extents = self.meta["coverage"].get(str(doy), [])
+        return any(_contains(tuple(extent), bbox) for extent in extents)
+
+    # -- mapping ------------------------------------------------------------------
+
+    def _column_path(self, name: str) -> Path:
+        return self.path / f"{name}.col"
+
+    def views(self) -> Dict[str, memoryview]:
+        if self._views is not None:
+            return self._views
+        views: Dict[str, memoryview] = {}
+        for name, typecode, width in COLUMNS + ((DAY_COLUMN, "H", 2),):
+            buf = self._map(self._column_path(name), self.rows * width)
+            views[name] = buf if typecode == "s" else buf.cast(typecode)
+        index = self._map(self.path / INDEX_FILE, INDEX_SIZE * 4)
+        views[INDEX_FILE] = index.cast("I") if len(index) else memoryview(array("I", [0] * INDEX_SIZE))
+        self._views = views
+        return views
+
+    def _map(self, path: Path, length: int) -> memoryview:
+        if length == 0 or not path.exists():
+            return memoryview(b"")
+        with open(path, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mm)
+        return memoryview(mm)[:length]
+
+    def close(self) -> None:
+        if self._views is not None:
+            for view in self._views.values():
+                view.release()
+            self._views = None
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+    # -- reads --------------------------------------------------------------------
+
+    def read(self, first_doy: int, last_doy: int, bbox: BBox, source: str) -> List[Dict]:
+        if not self.rows:
+            return []
+        views = self.views()
+        index = views[INDEX_FILE]
+        indexed = int(self.meta["indexed_rows"])
+        rows = self._matches(views, index[first_doy - 1], index[last_doy], bbox)
+        tail = self._matches(views, indexed, self.rows, bbox, (first_doy, last_doy))
+        return self._materialize(views, np.concatenate((rows, tail)), source)
+
+    @staticmethod
+    def _matches(
+        views: Dict[str, memoryview],
+        start: int,
+        stop: int,
+        bbox: BBox,
+        days: Optional[Tuple[int, int]] = None,
+    ) -> np.ndarray:
+        """Row numbers in ``[start, stop)`` inside ``bbox`` (and ``days``), tested in bulk on the mapped columns."""
+        if stop <= start:
+            return np.empty(0, dtype=np.int64)
+        west, south, east, north = bbox
+        lat = np.frombuffer(views["latitude"][start:stop], dtype=np.float64)
+        lon = np.frombuffer(views["longitude"][start:stop], dtype=np.float64)
+        mask = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        if days is not None:
+            day = np.frombuffer(views[DAY_COLUMN][start:stop], dtype=np.uint16)
+            mask &= (day >= days[0]) & (day <= days[1])
+        return np.flatnonzero(mask) + start
+
+    def _materialize(self, views: Dict[str, memoryview], rows: np.ndarray, source: str) -> List[Dict]:
+        """Record dicts for ``rows``, gathering each column for just those rows."""
+        if not len(rows):
+            return []
+        jan1 = date(self.year, 1, 1)
+        doys = np.frombuffer(views[DAY_COLUMN], dtype=np.uint16)[rows]
+        day_names = {
+            int(doy): (jan1 + timedelta(days=int(doy) - 1)).isoformat() for doy in np.unique(doys).tolist()
+        }
+        names = ["acq_date", "source"]
+        columns: List[List[str]] = [[day_names[doy] for doy in doys.tolist()], [source] * len(rows)]
+        for name, typecode, width in COLUMNS:
+            names.append(name)
+            if typecode == "s":
+                # Fixed-width "S" items come back with their NUL padding stripped
+                raw = np.frombuffer(views[name], dtype=f"S{width}")[rows].tolist()
+                columns.append([value.decode("ascii") for value in raw])
+            else:
+                values = np.frombuffer(views[name], dtype=np.float64)[rows].tolist()
+                columns.append([_format_float(value) for value in values])
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    # -- writes -------------------------------------------------------------------
+
+    def append(self, rows_by_day: Dict[int, List[Dict]], bbox: BBox) -> int:
+        ordered = sorted(rows_by_day)
+        records = [row for doy in ordered for row in rows_by_day[doy]]
+        self.close()
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, typecode, width in COLUMNS:
+            if typecode == "s":
+                payload = b"".join(_encode_text(row.get(name), width) for row in records)
+            else:
+                payload = array(typecode, (_parse_float(row.get(name)) for row in records)).tobytes()
+            self._write_column(name, payload)
+        days = array("H", (doy for doy in ordered for _ in rows_by_day[doy]))
+        self._write_column(DAY_COLUMN, days.tobytes())
+
+        self.meta["rows"] = self.rows + len(records)
+        coverage = self.meta["coverage"]
+        for doy in ordered:
+            coverage.setdefault(str(doy), []).append(list(bbox))
+        self._write_meta()
+        return len(records)
+
+    def _write_column(self, name: str, payload: bytes) -> None:
+        path = self._column_path(name)
+        width = dict((c[0], c[2]) for c in COLUMNS).get(name, 2)
+        with open(path, "ab") as fh:
+            # Drop bytes beyond the committed row count left by an interrupted append.
+            fh.truncate(self.rows * width)
+            fh.write(payload)
+
+    def rebuild_index(self) -> None:
+        """Sort every row by day, rewrite the columns and regenerate the index."""
+        self.close()
+        if not self.rows:
+            return
+        views = self.views()
+        days = np.frombuffer(views[DAY_COLUMN], dtype=np.uint16)
+        # Stable, so rows of one day keep their append order
+        order = np.argsort(days, kind="stable")
+        offsets = np.cumsum(np.bincount(days, minlength=INDEX_SIZE)[:INDEX_SIZE]).astype(np.uint32)
+
+        columns = COLUMNS + ((DAY_COLUMN, "H", 2),)
+        staged: List[Tuple[Path, Path]] = []
+        for name, typecode, width in columns:
+            if typecode == "s":
+                col = np.frombuffer(views[name], dtype=np.uint8).reshape(-1, width)
+            else:
+                col = np.frombuffer(views[name], dtype=typecode)
+            tmp = self.path / f"{name}.col.tmp"
+            tmp.write_bytes(col[order].tobytes())
+            staged.append((tmp, self._column_path(name)))
+        # Drop the arrays borrowing the mapped buffers so close() can release them
+        del days, col
+        self.close()
+        for tmp, final in staged:
+            os.replace(tmp, final)
+        (self.path / INDEX_FILE).write_bytes(offsets.tobytes())
+        self.meta["indexed_rows"] = self.rows
+        self._write_meta()
+
+
+class ColumnarArchive:
+    """Read/append access to the on-disk archive rooted at ``root``."""
+
+    def __init__(self, root: str | os.PathLike) -> None:
+        self.root = Path(root)
+        self._partitions: Dict[Tuple[str, int], _Partition] = {}
+        self._lock = threading.RLock()
+
+    def _partition(self, source: str, year: int) -> _Partition:
+        key = (source, year)
+        part = self._partitions.get(key)
+        if part is not None and part.stale():
+            part.close()
+            part = None
+        if part is None:
+            part = self._partitions[key] = _Partition(self.root / source / str(year), year)
+        return part
+
+    @staticmethod
+    def _year_spans(start: date, end: date) -> Iterable[Tuple[int, int, int]]:
+        for year in range(start.year, end.year + 1):
+            first = start if start.year == year else date(year, 1, 1)
+            last = end if end.year == year else date(year, 12, 31)
+            yield year, first.timetuple().tm_yday, last.timetuple().tm_yday
+
+    def covered_days(self, source: str, start: date, end: date, bbox: BBox) -> Set[date]:
+        """Return the days in ``[start, end]`` whose archived extent contains ``bbox``."""
+        covered: Set[date] = set()
+        with self._lock:
+            for year, first, last in self._year_spans(start, end):
+                part = self._partition(source, year)
+                jan1 = date(year, 1, 1)
+                for doy in range(first, last + 1):
+                    if part.covered(doy, bbox):
+                        covered.add(jan1 + timedelta(days=doy - 1))
+        return covered
+
+    def read(self, source: str, start: date, end: date, bbox: BBox) -> List[Dict]:
+        """Return archived records for ``source`` within the date range and bbox."""
+        out: List[Dict] = []
+        with self._lock:
+            for year, first, last in self._year_spans(start, end):
+                out.extend(self._partition(source, year).read(first, last, bbox, source))
+        return out
+
+    def append(self, source: str, records: Iterable[Dict], *, days: Iterable[date], bbox: BBox) -> int:
+        """Append ``records`` and mark ``days`` as covered for ``bbox``.
+
+        Days that are already covered by an extent containing ``bbox`` are
+        skipped, keeping the archive append-only and free of duplicates.
+        Returns the number of rows written.
+        """
+        by_year: Dict[int, Dict[int, List[Dict]]] = {}
+        with self._lock:
+            for day in days:
+                doy = day.timetuple().tm_yday
+                if not self._partition(source, day.year).covered(doy, bbox):
+                    by_year.setdefault(day.year, {})[doy] = []
+            for row in records:
+                try:
+                    day = date.fromisoformat(str(row.get("acq_date")))
+                except ValueError:
+                    continue
+                bucket = by_year.get(day.year, {}).get(day.timetuple().tm_yday)
+                if bucket is not None:
+                    bucket.append(row)
+            written = 0
+            for year, rows_by_day in by_year.items():
+                written += self._partition(source, year).append(rows_by_day, bbox)
+        return written
+
+    def rebuild_index(self, source: Optional[str] = None, year: Optional[int] = None) -> None:
+        """Fold appended tails back into sorted, indexed partitions."""
+        with self._lock:
+            for src_dir in sorted(self.root.glob("*")) if self.root.exists() else []:
+                if not src_dir.is_dir() or (source and src_dir.name != source):
+                    continue
+                for year_dir in sorted(src_dir.glob("*")):
+                    if not year_dir.name.isdigit() or (year and int(year_dir.name) != year):
+                        continue
+                    self._partition(src_dir.name, int(year_dir.name)).rebuild_index()
+
+    def close(self) -> None:
+        with self._lock:
+            for part in self._partitions.values():
+                part.close()
+            self._partitions.clear()
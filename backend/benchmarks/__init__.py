@@ -0,0 +1 @@
+"""Backend micro-benchmarks and synthetic FIRMS data (``python -m benchmarks.run``)."""
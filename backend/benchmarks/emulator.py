@@ -0,0 +1,148 @@
+"""Local stand-in for the FIRMS API, for load tests without spending MAP_KEY quota.
+
+Implements the endpoints under ``utils.urlbuilder.BASE_URL`` that the backend
+uses (``area/csv``, ``country/csv``, ``data_availability/csv`` and
+``countries``) and serves deterministic synthetic data from
+:mod:`benchmarks.synth`. Point the backend at it with::
+
+    python -m benchmarks.emulator --port 9000 --latency-ms 300 --error-rate 0.02
+    FIRMS_BASE_URL=http://127.0.0.1:9000/api uvicorn app.main:app --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from app.services.fires import COUNTRY_BBOX, SOURCE_WHITELIST
+
+from .synth import iter_lines
+
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+
+@dataclass
+class EmulatorConfig:
+    latency_ms: float = 200.0
+    jitter_ms: float = 100.0
+    error_rate: float = 0.0
+    rows_per_day: int = 2000
+    seed: int = 0
+
+
+def _sensor(source: str) -> str:
+    if source.startswith("MODIS"):
+        return "modis"
+    if source.startswith("LANDSAT"):
+        return "landsat"
+    return "viirs"
+
+
+def _parse_area(area: str) -> Tuple[float, float, float, float]:
+    if area == "world":
+        return WORLD
+    west, south, east, north = (float(p) for p in area.split(","))
+    return west, south, east, north
+
+
+def create_emulator(config: Optional[EmulatorConfig] = None) -> FastAPI:
+    config = config or EmulatorConfig()
+    app = FastAPI(title="FIRMS emulator")
+    rng = random.Random(config.seed)
+
+    async def delay_or_fail() -> Optional[PlainTextResponse]:
+        delay = max(0.0, config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if config.error_rate and rng.random() < config.error_rate:
+            status = rng.choice((429, 503))
+            return PlainTextResponse("Too many requests" if status == 429 else "Service unavailable", status_code=status)
+        return None
+
+    def csv_body(source: str, bbox: Tuple[float, float, float, float], days: int, start: Optional[date]) -> str:
+        start = start or date.today() - timedelta(days=days - 1)
+        # Same request -> same body, so dedup and caching behave like the real service.
+        seed = int(hashlib.sha1(f"{source}{bbox}{days}{start}{config.seed}".encode()).hexdigest()[:8], 16)
+        lines = iter_lines(
+            _sensor(source), config.rows_per_day * days, seed=seed, start=start, days=days, bbox=bbox
+        )
+        return "\n".join(lines) + "\n"
+
+    def day_range_ok(day_range: int) -> bool:
+        return 1 <= day_range <= 10
+
+    @app.get("/api/area/csv/{map_key}/{source}/{area}/{day_range}")
+    @app.get("/api/area/csv/{map_key}/{source}/{area}/{day_range}/{start}")
+    async def area_csv(map_key: str, source: str, area: str, day_range: int, start: Optional[date] = None):
+        if source not in SOURCE_WHITELIST or not day_range_ok(day_range):
+            return PlainTextResponse("Invalid API call.", status_code=400)
+        failure = await delay_or_fail()
+        if failure is not None:
+            return failure
+        return PlainTextResponse(csv_body(source, _parse_area(area), day_range, start), media_type="text/csv")
+
+    @app.get("/api/country/csv/{map_key}/{source}/{country}/{day_range}")
+    @app.get("/api/country/csv/{map_key}/{source}/{country}/{day_range}/{start}")
+    async def country_csv(map_key: str, source: str, country: str, day_range: int, start: Optional[date] = None):
+        bbox = COUNTRY_BBOX.get(country.upper())
+        if source not in SOURCE_WHITELIST or bbox is None or not day_range_ok(day_range):
+            return PlainTextResponse("Invalid API call.", status_code=400)
+        failure = await delay_or_fail()
+        if failure is not None:
+            return failure
+        return PlainTextResponse(csv_body(source, bbox, day_range, start), media_type="text/csv")
+
+    @app.get("/api/data_availability/csv/{map_key}/{sensor}")
+    async def data_availability(map_key: str, sensor: str):
+        today = date.today()
+        lines = ["data_id,min_date,max_date"]
+        for source in sorted(SOURCE_WHITELIST):
+            if sensor.upper() not in ("ALL", source):
+                continue
+            if source.endswith("_SP"):
+                lines.append(f"{source},2000-11-01,{today - timedelta(days=90)}")
+            else:
+                lines.append(f"{source},{today - timedelta(days=60)},{today}")
+        return PlainTextResponse("\n".join(lines) + "\n", media_type="text/csv")
+
+    @app.get("/api/countries/")
+    async def countries():
+        lines = ["id;abreviation;name;extent"]
+        for i, (code, (w, s, e, n)) in enumerate(sorted(COUNTRY_BBOX.items()), start=1):
+            lines.append(f"{i};{code};{code};BOX({w} {s},{e} {n})")
+        return PlainTextResponse("\n".join(lines) + "\n")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.emulator", description="Local FIRMS API emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=EmulatorConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=EmulatorConfig.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=EmulatorConfig.error_rate, help="fraction of 429/503s")
+    parser.add_argument("--rows-per-day", type=int, default=EmulatorConfig.rows_per_day, help="controls body size")
+    parser.add_argument("--seed", type=int, default=EmulatorConfig.seed)
+    args = parser.parse_args()
+    config = EmulatorConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rows_per_day=args.rows_per_day,
+        seed=args.seed,
+    )
+    uvicorn.run(create_emulator(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
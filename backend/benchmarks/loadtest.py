@@ -0,0 +1,157 @@
+"""End-to-end load driver for the backend API.
+
+Simulates ``--users`` concurrent clients issuing a mix of ``/api/fires``
+(GeoJSON), ``/api/fires/stats`` and NDJSON-streamed ``/api/fires`` requests for
+``--duration`` seconds, then reports p50/p95/p99 latency and throughput per
+scenario plus the worker RSS scraped from ``/api/metrics``::
+
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --users 50 --duration 60 --out load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.services.fires import COUNTRY_BBOX
+
+SCENARIOS = ("geojson", "stats", "ndjson")
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+def _query(rng: random.Random, max_days: int) -> Dict[str, str]:
+    end = date.today() - timedelta(days=rng.randrange(0, 5))
+    start = end - timedelta(days=rng.randrange(0, max_days))
+    return {"country": rng.choice(sorted(COUNTRY_BBOX)), "start_date": start.isoformat(), "end_date": end.isoformat()}
+
+
+async def _rss(client: httpx.AsyncClient) -> Optional[float]:
+    try:
+        resp = await client.get("/api/metrics")
+    except httpx.HTTPError:
+        return None
+    for line in resp.text.splitlines():
+        if line.startswith("process_resident_memory_bytes "):
+            return float(line.split()[1])
+    return None
+
+
+async def run_load(
+    base_url: str,
+    *,
+    users: int,
+    duration: float,
+    mix: Sequence[str] = SCENARIOS,
+    max_days: int = 7,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = {name: [] for name in mix}
+    errors: Dict[str, int] = {name: 0 for name in mix}
+    rss_samples: List[float] = []
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=users + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+
+        async def user(uid: int) -> None:
+            rng = random.Random(f"{seed}:{uid}")
+            while time.perf_counter() < deadline:
+                scenario = rng.choice(mix)
+                params = _query(rng, max_days)
+                started = time.perf_counter()
+                try:
+                    if scenario == "stats":
+                        resp = await client.get("/api/fires/stats", params=params)
+                        await resp.aread()
+                    else:
+                        headers = {"Accept": "application/x-ndjson"} if scenario == "ndjson" else {}
+                        async with client.stream("GET", "/api/fires", params=params, headers=headers) as resp:
+                            async for _ in resp.aiter_bytes():
+                                pass
+                    ok = resp.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[scenario].append(time.perf_counter() - started)
+                else:
+                    errors[scenario] += 1
+
+        async def sample_rss() -> None:
+            while time.perf_counter() < deadline:
+                value = await _rss(client)
+                if value is not None:
+                    rss_samples.append(value)
+                await asyncio.sleep(1.0)
+
+        started = time.perf_counter()
+        await asyncio.gather(sample_rss(), *(user(i) for i in range(users)))
+        elapsed = time.perf_counter() - started
+
+    report: Dict[str, Any] = {"users": users, "duration": elapsed, "scenarios": {}}
+    for name in mix:
+        values = latencies[name]
+        report["scenarios"][name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": _ms(percentile(values, 50)),
+            "p95_ms": _ms(percentile(values, 95)),
+            "p99_ms": _ms(percentile(values, 99)),
+        }
+    total = sum(len(v) for v in latencies.values())
+    report["throughput_rps"] = total / elapsed if elapsed else 0.0
+    report["worker_rss_bytes"] = {
+        "start": rss_samples[0] if rss_samples else None,
+        "max": max(rss_samples) if rss_samples else None,
+        "end": rss_samples[-1] if rss_samples else None,
+    }
+    return report
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description="Backend load driver")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--mix", default=",".join(SCENARIOS), help="comma-separated scenarios: geojson,stats,ndjson")
+    parser.add_argument("--max-days", type=int, default=7, help="longest date range per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    mix = [m for m in args.mix.split(",") if m]
+    if set(mix) - set(SCENARIOS):
+        parser.error(f"scenarios must be among {', '.join(SCENARIOS)}")
+    report = asyncio.run(
+        run_load(args.base_url, users=args.users, duration=args.duration, mix=mix, max_days=args.max_days, seed=args.seed)
+    )
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Backend micro-benchmarks.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.run --sizes 1000,100000 --out before.json
+    python -m benchmarks.run --sizes 1000,100000 --compare before.json
+
+Every benchmark runs against synthetic CSVs from :mod:`benchmarks.synth`. Time
+is the best of ``--repeat`` runs; peak memory is measured in a separate
+``tracemalloc`` pass so tracing overhead does not skew the timings. Results
+are written as JSON for before/after comparisons.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.clients.firms import FIRMSClient, deduplicate, parse_csv_rows
+from app.services.density import DayPyramid, render
+from app.services.fires import _compute_stats
+from utils.datebucket import bucket_by_date
+from utils.events import group_events
+from utils.geojson import to_geojson
+
+from .synth import SOURCES, generate_csv
+
+START = date(2024, 7, 1)
+DAYS = 10
+
+
+@dataclass
+class Fixture:
+    sensor: str
+    rows: int
+    text: str = field(repr=False)
+
+    @property
+    def source(self) -> str:
+        return SOURCES[self.sensor]
+
+    @cached_property
+    def header(self) -> tuple:
+        return tuple(self.text[: self.text.index("\n")].split(","))
+
+    @cached_property
+    def body(self) -> str:
+        return self.text[self.text.index("\n") + 1 :]
+
+    @cached_property
+    def dict_rows(self) -> List[Dict[str, str]]:
+        return list(csv.DictReader(io.StringIO(self.text)))
+
+    @cached_property
+    def records(self) -> List[Dict]:
+        return parse_csv_rows(self.header, self.body, self.source)
+
+
+def _parse_batches(fx: Fixture) -> Callable[[], Any]:
+    client = FIRMSClient()
+
+    async def collect() -> int:
+        return sum([len(batch) async for batch in client.parse_batches(fx.text, fx.source)])
+
+    return lambda: asyncio.run(collect())
+
+
+def _transform_row(fx: Fixture) -> Callable[[], Any]:
+    client = FIRMSClient()
+    rows = fx.dict_rows
+    return lambda: [client._transform_row(row, fx.source) for row in rows]
+
+
+def _ndjson(fx: Fixture) -> Callable[[], Any]:
+    # Mirrors FireService.stream_ndjson's per-feature encoding.
+    records = fx.records
+    return lambda: [
+        (json.dumps(to_geojson([row])["features"][0]) + "\n").encode("utf-8") for row in records
+    ]
+
+
+def _density_pyramid(fx: Fixture) -> Callable[[], Any]:
+    records = fx.records
+    return lambda: DayPyramid.from_records(records)
+
+
+def _density_render(fx: Fixture) -> Callable[[], Any]:
+    pyramid = DayPyramid.from_records(fx.records)
+    return lambda: render([pyramid], (-180.0, -90.0, 180.0, 90.0), 0.25, "count")
+
+
+BENCHMARKS: Dict[str, Callable[[Fixture], Callable[[], Any]]] = {
+    "transform_row": _transform_row,
+    "parse_csv_rows": lambda fx: lambda: parse_csv_rows(fx.header, fx.body, fx.source),
+    "parse_batches": _parse_batches,
+    "deduplicate": lambda fx: lambda: deduplicate(fx.records + fx.records[: len(fx.records) // 10]),
+    "to_geojson": lambda fx: lambda: to_geojson(fx.records),
+    "compute_stats": lambda fx: lambda: _compute_stats(fx.records),
+    "bucket_by_date": lambda fx: lambda: bucket_by_date(fx.records, START, date(2024, 7, DAYS)),
+    "ndjson_encode": _ndjson,
+    "density_pyramid": _density_pyramid,
+    "density_render": _density_render,
+    "group_events": lambda fx: lambda: group_events(fx.records, 1.0, 24.0),
+}
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _peak_memory(fn: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(
+    sizes: Sequence[int], sensors: Sequence[str], names: Sequence[str], repeat: int, measure_memory: bool = True
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for sensor in sensors:
+        for rows in sizes:
+            fx = Fixture(sensor, rows, generate_csv(sensor, rows, start=START, days=DAYS))
+            for name in names:
+                fn = BENCHMARKS[name](fx)
+                seconds = _time(fn, repeat)
+                result = {
+                    "benchmark": name,
+                    "sensor": sensor,
+                    "rows": rows,
+                    "seconds": seconds,
+                    "rows_per_sec": rows / seconds if seconds else None,
+                    "peak_bytes": _peak_memory(fn) if measure_memory else None,
+                }
+                results.append(result)
+                print(
+                    f"{name:<16} {sensor:<8} {rows:>9} rows  {seconds * 1000:10.2f} ms  "
+                    f"{result['rows_per_sec'] or 0:14,.0f} rows/s",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def _environment() -> Dict[str, Any]:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False
+        ).stdout.strip()
+    except OSError:
+        rev = ""
+    return {"python": platform.python_version(), "platform": platform.platform(), "git_rev": rev or None}
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = {
+            (r["benchmark"], r["sensor"], r["rows"]): r for r in json.load(fh)["results"]
+        }
+    print(f"{'benchmark':<16} {'sensor':<8} {'rows':>9} {'time':>8} {'peak mem':>9}", file=sys.stderr)
+    for r in current:
+        old = baseline.get((r["benchmark"], r["sensor"], r["rows"]))
+        if not old:
+            continue
+        speed = old["seconds"] / r["seconds"] if r["seconds"] else float("inf")
+        mem = (r["peak_bytes"] / old["peak_bytes"]) if old.get("peak_bytes") and r.get("peak_bytes") else None
+        mem_text = f"{mem:8.2f}x" if mem is not None else "       -"
+        print(f"{r['benchmark']:<16} {r['sensor']:<8} {r['rows']:>9} {speed:7.2f}x {mem_text}", file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Backend micro-benchmarks")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated row counts (up to 5000000)")
+    parser.add_argument("--sensors", default="viirs,modis,landsat")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON to print speed/memory ratios against")
+    args = parser.parse_args(argv)
+
+    names = [n for n in args.only.split(",") if n]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    results = run(
+        [int(s) for s in args.sizes.split(",")],
+        args.sensors.split(","),
+        names,
+        args.repeat,
+        measure_memory=not args.no_memory,
+    )
+    payload = json.dumps({"environment": _environment(), "results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+    else:
+        print(payload)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Deterministic synthetic FIRMS CSV generator.
+
+Detections are drawn around a fixed set of fire clusters so that dedup keys,
+bbox filters and spatial grouping see realistic locality. The same
+``(sensor, rows, seed, start)`` always yields byte-identical output.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Iterator, List, Tuple
+
+HEADERS = {
+    "viirs": "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight",
+    "modis": "latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_t31,frp,daynight",
+    "landsat": "latitude,longitude,path,row,scan,track,acq_date,acq_time,satellite,confidence,daynight",
+}
+SOURCES = {"viirs": "VIIRS_SNPP_NRT", "modis": "MODIS_NRT", "landsat": "LANDSAT_NRT"}
+DEFAULT_BBOX = (-125.0, 25.0, -66.0, 50.0)
+
+
+def _clusters(rng: random.Random, bbox: Tuple[float, float, float, float], count: int) -> List[Tuple[float, float, float]]:
+    west, south, east, north = bbox
+    return [
+        (rng.uniform(south, north), rng.uniform(west, east), rng.uniform(0.02, 0.5))
+        for _ in range(count)
+    ]
+
+
+def iter_lines(
+    sensor: str,
+    rows: int,
+    *,
+    seed: int = 0,
+    start: date = date(2024, 7, 1),
+    days: int = 10,
+    bbox: Tuple[float, float, float, float] = DEFAULT_BBOX,
+) -> Iterator[str]:
+    """Yield the header and ``rows`` CSV lines (without newlines) for ``sensor``."""
+    if sensor not in HEADERS:
+        raise ValueError(f"unknown sensor {sensor!r}; expected one of {sorted(HEADERS)}")
+    rng = random.Random(f"{sensor}:{seed}")
+    clusters = _clusters(rng, bbox, max(1, rows // 200))
+    day_names = [(start + timedelta(days=d)).isoformat() for d in range(days)]
+    yield HEADERS[sensor]
+    for _ in range(rows):
+        lat0, lon0, spread = clusters[rng.randrange(len(clusters))]
+        lat = round(rng.gauss(lat0, spread), 5)
+        lon = round(rng.gauss(lon0, spread), 5)
+        acq_date = day_names[rng.randrange(days)]
+        hour = rng.choice((1, 2, 8, 9, 13, 14, 18, 19, 20))
+        acq_time = f"{hour:02d}{rng.randrange(60):02d}"
+        daynight = "D" if 6 <= hour < 18 else "N"
+        frp = round(rng.expovariate(1 / 8.0), 2)
+        if sensor == "viirs":
+            conf = rng.choices("lnh", weights=(1, 6, 3))[0]
+            yield (
+                f"{lat},{lon},{rng.uniform(300, 367):.2f},0.39,0.36,{acq_date},{acq_time},N,VIIRS,"
+                f"{conf},2.0NRT,{rng.uniform(270, 310):.2f},{frp},{daynight}"
+            )
+        elif sensor == "modis":
+            yield (
+                f"{lat},{lon},{rng.uniform(300, 400):.1f},1.0,1.0,{acq_date},{acq_time},"
+                f"{rng.choice('TA')},MODIS,{rng.randrange(101)},6.1NRT,{rng.uniform(270, 310):.1f},{frp},{daynight}"
+            )
+        else:
+            conf = rng.choices(("L", "M", "H"), weights=(2, 5, 3))[0]
+            yield (
+                f"{lat},{lon},{rng.randrange(1, 234)},{rng.randrange(1, 249)},30,30,{acq_date},{acq_time},"
+                f"{rng.choice(('L8', 'L9'))},{conf},{daynight}"
+            )
+
+
+def generate_csv(sensor: str, rows: int, **kwargs) -> str:
+    """Return a complete CSV body as FIRMS would send it."""
+    return "\n".join(iter_lines(sensor, rows, **kwargs)) + "\n"
+
+
+def write_csv(path: str, sensor: str, rows: int, **kwargs) -> None:
+    """Stream a CSV to ``path`` without holding it in memory (for multi-million-row files)."""
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        for line in iter_lines(sensor, rows, **kwargs):
+            fh.write(line)
+            fh.write("\n")
@@ -1,9 +1,11 @@
 import re
 import time
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 
 import requests
 
+from utils.urlbuilder import BASE_URL
+
 ISO3_RE = re.compile(r"^[A-Z]{3}$")
 BOX_RE = re.compile(
     r"BOX\(\s*(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)\s*\)"
@@ -11,16 +13,20 @@ BOX_RE = re.compile(
 
 _country_cache: Dict[str, Tuple[float, float, float, float]] = {}
 _cache_expiry: float = 0.0
+_cache_ttl: int = 86400
 
 
-def load_countries(cache_ttl: int = 86400) -> Dict[str, Tuple[float, float, float, float]]:
+def load_countries(
+    cache_ttl: Optional[int] = None, base_url: str = BASE_URL
+) -> Dict[str, Tuple[float, float, float, float]]:
     """Load country metadata from NASA FIRMS, caching results for cache_ttl seconds."""
     global _country_cache, _cache_expiry
+    cache_ttl = _cache_ttl if cache_ttl is None else cache_ttl
     now = time.time()
     if now < _cache_expiry and _country_cache:
         return _country_cache
 
-    url = "https://firms.modaps.eosdis.nasa.gov/api/countries/"
+    url = f"{base_url.rstrip('/')}/countries/"
     resp = requests.get(url, timeout=30)
     resp.raise_for_status()
     lines = resp.text.strip().splitlines()
@@ -41,6 +47,46 @@ def load_countries(cache_ttl: int = 86400) -> Dict[str, Tuple[float, float, floa
     return countries
 
 
+def dump_cache() -> Optional[Dict[str, Any]]:
+    """Country cache and its expiry for snapshots, or None when empty."""
+    if not _country_cache:
+        return None
+    return {"expires_at": _cache_expiry, "countries": {k: list(v) for k, v in _country_cache.items()}}
+
+
+def restore_cache(data: Optional[Dict[str, Any]]) -> int:
+    """Load a snapshot taken by dump_cache unless it has expired."""
+    global _country_cache, _cache_expiry
+    if not data or data["expires_at"] <= time.time() or _country_cache:
+        return 0
+    _country_cache = {k: tuple(v) for k, v in data["countries"].items()}
+    _cache_expiry = data["expires_at"]
+    return len(_country_cache)
+
+
+def cache_info() -> Dict[str, Any]:
+    """Size, age and TTL of the country cache (a single list)."""
+    if not _country_cache:
+        return {"entries": 0, "ages": [], "ttl_seconds": _cache_ttl}
+    age = max(0.0, time.time() - (_cache_expiry - _cache_ttl))
+    return {"entries": len(_country_cache), "ages": [age], "ttl_seconds": _cache_ttl}
+
+
+def set_cache_ttl(seconds: int) -> None:
+    """Override the TTL at runtime, moving the current list's expiry with it."""
+    global _cache_ttl, _cache_expiry
+    if _country_cache:
+        _cache_expiry += seconds - _cache_ttl
+    _cache_ttl = seconds
+
+
+def clear_cache() -> int:
+    global _country_cache, _cache_expiry
+    cleared = len(_country_cache)
+    _country_cache, _cache_expiry = {}, 0.0
+    return cleared
+
+
 def validate_country(code: str) -> bool:
     """Return True if code is a valid ISO-3 country present in the list."""
     if not ISO3_RE.fullmatch(code.upper()):
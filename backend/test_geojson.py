@@ -1,4 +1,6 @@
-from utils.geojson import to_geojson
+import pytest
+
+from utils.geojson import parse_fields, project_records, to_geojson
 
 
 def test_to_geojson_transforms_records():
@@ -50,3 +52,27 @@ def test_to_geojson_transforms_records():
     assert f2["properties"]["confidence"] == 42
     assert f2["properties"]["confidence_text"] == "42"
     assert f2["properties"]["acq_datetime"] == "2024-01-02T01:00:00Z"
+
+
+def test_to_geojson_projects_fields_and_rounds_coordinates():
+    records = [{"latitude": "10.123456", "longitude": "-20.987654", "frp": "3.5", "acq_date": "2024-01-01", "acq_time": "5"}]
+
+    feature = to_geojson(records, fields=parse_fields("lat,lon,frp,acq_datetime"), precision=2)["features"][0]
+    assert feature["geometry"]["coordinates"] == [-20.99, 10.12]
+    assert feature["properties"] == {"frp": 3.5, "acq_datetime": "2024-01-01T00:05:00Z"}
+
+
+def test_project_records_keeps_raw_values():
+    records = [{"latitude": "10.123456", "longitude": "-20.987654", "frp": "3.5", "acq_date": "2024-01-01", "acq_time": "0005"}]
+
+    assert project_records(records) is records
+    assert project_records(records, parse_fields("lat,frp,acq_datetime"), precision=3) == [
+        {"latitude": "10.123", "frp": "3.5", "acq_datetime": "2024-01-01T00:05:00Z"}
+    ]
+
+
+def test_parse_fields_rejects_unknown_names():
+    assert parse_fields(None) is None
+    assert parse_fields(" LAT, lon ,lat") == ("latitude", "longitude")
+    with pytest.raises(ValueError, match="bogus"):
+        parse_fields("lat,bogus")
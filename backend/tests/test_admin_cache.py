@@ -0,0 +1,94 @@
+from datetime import date
+
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from app.core.config import settings
+
+HEADERS = {"Authorization": "Bearer s3cret"}
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+
+
+@pytest.mark.asyncio
+async def test_admin_api_requires_token(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "admin_token", None)
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/api/admin/cache", headers=HEADERS)).status_code == 404
+        monkeypatch.setattr(settings, "admin_token", "s3cret")
+        assert (await client.get("/api/admin/cache")).status_code == 401
+        assert (await client.get("/api/admin/cache", headers={"X-Admin-Token": "nope"})).status_code == 401
+        assert (await client.get("/api/admin/cache", headers={"X-Admin-Token": "s3cret"})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_admin_cache_lists_and_invalidates_partitions(admin_token):
+    from app.main import app
+    from app.api.routes.fires import service
+
+    area = (50.0, 50.0, 51.0, 51.0)
+    row = {"acq_date": "2024-02-01", "acq_time": "0100", "latitude": "50.5", "longitude": "50.5", "source": "MODIS_NRT"}
+    service.partitions.store("MODIS_NRT", area, [date(2024, 2, 1), date(2024, 2, 2)], [row])
+    service.partitions.store("VIIRS_SNPP_NRT", area, [date(2024, 2, 1)], [])
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test", headers=HEADERS) as client:
+        layers = (await client.get("/api/admin/cache")).json()["layers"]
+        assert set(layers) == {"availability", "countries", "partitions", "responses", "tiles"}
+        partitions = layers["partitions"]
+        assert partitions["entries"] >= 3 and partitions["bytes"] > 0
+        assert {"hits", "misses", "evictions", "ttl_seconds"} <= set(partitions)
+        assert partitions["age_seconds"]["60"] >= 3
+
+        resp = await client.delete("/api/admin/cache/partitions", params={"bbox": "0,0,1,1"})
+        assert resp.json() == {"removed": {"partitions": 0}}
+        resp = await client.delete(
+            "/api/admin/cache/partitions", params={"source": "modis_nrt", "day": "2024-02-01", "bbox": "50.5,50.5,60,60"}
+        )
+        assert resp.json() == {"removed": {"partitions": 1}}
+        assert list(service.partitions.lookup("MODIS_NRT", area, [date(2024, 2, 1), date(2024, 2, 2)])) == [
+            date(2024, 2, 2)
+        ]
+
+        resp = await client.delete("/api/admin/cache", params={"start_date": "2024-02-01", "end_date": "2024-02-02"})
+        removed = resp.json()["removed"]
+        assert removed["partitions"] == 2 and removed["responses"] == 0 and removed["countries"] == 0
+
+        assert (await client.delete("/api/admin/cache/nope")).status_code == 404
+        assert (await client.delete("/api/admin/cache", params={"day": "02/01/2024"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_cache_ttl_override(admin_token):
+    from app.main import app
+    from app.api.routes.fires import service
+    from utils import data_availability
+
+    original = service.pages.results.ttl_seconds, data_availability.cache_ttl()
+    try:
+        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test", headers=HEADERS) as client:
+            resp = await client.put("/api/admin/cache/responses/ttl", params={"seconds": 30})
+            assert resp.json()["ttl_seconds"] == 30
+            assert service.pages.results.ttl_seconds == 30
+            resp = await client.put("/api/admin/cache/availability/ttl", params={"seconds": 120})
+            assert resp.json()["ttl_seconds"] == 120
+            assert (await client.put("/api/admin/cache/responses/ttl", params={"seconds": 0})).status_code == 422
+    finally:
+        service.pages.results.ttl_seconds = original[0]
+        data_availability.set_cache_ttl(original[1])
+
+
+def test_cache_layer_must_implement_every_operation():
+    from app.services.cache_admin import CacheLayer
+
+    class Incomplete(CacheLayer):
+        def describe(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from app.core.config import settings
+from app.services.admission import AdmissionController, Rejected, query_cost
+from app.services.planner import QueryPlan, UpstreamCall
+
+
+def test_query_cost_counts_area_and_uncached_days():
+    area = (0.0, 0.0, 10.0, 20.0)
+    days = [date(2024, 1, d) for d in range(1, 11)]
+    plan = QueryPlan("VIIRS_SNPP_NRT", area, days[0], days[-1], calls=[UpstreamCall(days[0], days[3], [area])])
+    assert query_cost(plan) == 200 * 4
+    plan.archived = days[4:8]
+    assert query_cost(plan) == 200 * 5
+    cached = QueryPlan("VIIRS_SNPP_NRT", area, days[0], days[-1], cached=days)
+    assert query_cost(cached) == 0 and query_cost(None) == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_rejects_and_hands_over():
+    admission = AdmissionController(max_active=1, max_queue=1, threshold=100, queue_timeout=5, typical_seconds=4)
+    first = await admission.acquire(500)
+    # Cheap work never waits, even with every slot taken
+    cheap = await admission.acquire(99)
+    cheap.release()
+
+    queued = asyncio.ensure_future(admission.acquire(500))
+    await asyncio.sleep(0)
+    assert admission.stats()["queued"] == 1
+    with pytest.raises(Rejected) as excinfo:
+        await admission.acquire(500)
+    assert excinfo.value.reason == "queue full" and excinfo.value.retry_after == 8
+
+    first.release()
+    second = await queued
+    assert admission.active == 1 and admission.queued == 0
+    second.release()
+    assert admission.active == 0
+
+    async with await admission.acquire(500):
+        with pytest.raises(Rejected) as excinfo:
+            await admission.acquire(500, deadline=0.0)
+        assert excinfo.value.reason == "queue timeout"
+    assert admission.active == 0 and admission.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_fires_sheds_expensive_queries_with_retry_after(monkeypatch):
+    from app.main import app
+    from app.api.routes.fires import service
+
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+    admission = AdmissionController(max_active=1, max_queue=0, threshold=1000, typical_seconds=7)
+    monkeypatch.setattr(service, "admission", admission)
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-04-01", "2024-04-30")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return []
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service, "fetch", fake_fetch)
+    params = {"start_date": "2024-04-01", "end_date": "2024-04-10"}
+    busy = await admission.acquire(10_000)
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params={**params, "west": 0, "south": 0, "east": 40, "north": 40})
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "7"
+        assert resp.json()["detail"]["details"]["reason"] == "queue full"
+
+        small = {**params, "west": 0, "south": 0, "east": 2, "north": 2}
+        assert (await client.get("/api/fires", params=small)).status_code == 200
+
+        busy.release()
+        resp = await client.get("/api/fires", params={**params, "west": 0, "south": 0, "east": 40, "north": 40})
+        assert resp.status_code == 200
+    assert admission.active == 0
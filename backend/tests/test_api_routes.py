@@ -113,3 +113,428 @@ async def test_fires_stats_success(monkeypatch):
 
 
     # legacy root routes removed; prefer /api/fires
+
+
+@pytest.mark.asyncio
+async def test_server_timing_and_metrics(monkeypatch):
+    from app.main import app
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return [{"acq_date": "2024-01-05", "acq_time": "0000", "latitude": 1, "longitude": 1}]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get(
+            "/api/fires", params={"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-05"}
+        )
+        assert resp.status_code == 200
+        timing = resp.headers["server-timing"]
+        for stage in ("prepare;dur=", "availability;dur=", "geojson;dur=", "total;dur="):
+            assert stage in timing
+
+        metrics = await client.get("/api/metrics")
+        assert metrics.status_code == 200
+        body = metrics.text
+        assert '# TYPE firms_stage_seconds histogram' in body
+        assert 'firms_stage_seconds_count{stage="prepare"}' in body
+        assert 'firms_http_request_seconds_count{route="/api/fires",status="200"}' in body
+        assert "process_resident_memory_bytes" in body
+
+
+def test_resident_memory_without_proc_or_resource(monkeypatch):
+    import builtins
+    import sys
+
+    from app.core import metrics
+
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+
+    monkeypatch.setattr(builtins, "open", no_proc)
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert metrics._resident_memory() == {}
+
+
+def test_metric_without_samples_fails_at_definition():
+    from app.core import metrics
+
+    class Broken(metrics._Metric):
+        pass
+
+    registered = len(metrics.REGISTRY)
+    with pytest.raises(TypeError):
+        Broken("broken_metric", "Never rendered.")
+    assert len(metrics.REGISTRY) == registered
+
+
+@pytest.mark.asyncio
+async def test_fires_field_projection_and_precision(monkeypatch):
+    from app.main import app
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return [
+            {"acq_date": "2024-01-05", "acq_time": "0130", "latitude": "1.23456", "longitude": "2.34567", "frp": "4.5"},
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+    params = {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-06", "fields": "lat,lon,frp,acq_datetime", "precision": 2}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params=params)
+        assert resp.status_code == 200
+        feature = resp.json()["features"][0]
+        assert feature["geometry"]["coordinates"] == [2.35, 1.23]
+        assert feature["properties"] == {"frp": 4.5, "acq_datetime": "2024-01-05T01:30:00Z"}
+
+        resp = await client.get("/api/fires", params={**params, "format": "json"})
+        assert resp.json() == [{"latitude": "1.23", "longitude": "2.35", "frp": "4.5", "acq_datetime": "2024-01-05T01:30:00Z"}]
+
+        resp = await client.get("/api/fires", params={**params, "fields": "lat,nope"})
+        assert resp.status_code == 400
+        assert "nope" in resp.json()["detail"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_fires_batch_shares_upstream_urls(monkeypatch):
+    import json
+
+    from app.main import app
+    from app.api.routes.fires import service
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    calls = []
+
+    async def fake_fetch_records(url, source, client=None):
+        calls.append(url)
+        return [
+            {"acq_date": f"2024-01-0{d}", "acq_time": "0100", "latitude": str(d), "longitude": "1", "source": source}
+            for d in (5, 6, 7)
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service.client, "fetch_records", fake_fetch_records)
+
+    body = {
+        "queries": [
+            {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-05"},
+            {"country": "USA", "start_date": "2024-01-06", "end_date": "2024-01-07"},
+            {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-06"},
+            {"country": "XXX", "start_date": "2024-01-05", "end_date": "2024-01-05"},
+        ],
+        "fields": "lat,acq_date",
+    }
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/fires/batch", json=body)
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        # One merged 3-day area URL serves all three USA sub-queries
+        assert len(calls) == 1
+        assert [len(r.get("data", {}).get("features", [])) for r in results] == [1, 2, 2, 0]
+        assert results[1]["data"]["features"][0]["properties"] == {"acq_date": "2024-01-06"}
+        assert results[3]["error"]["code"] == 400
+
+        resp = await client.post("/api/fires/batch", json=body, headers={"Accept": "application/x-ndjson"})
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        done = {line["query"]: line for line in lines if line.get("done")}
+        assert {q: d["count"] for q, d in done.items()} == {0: 1, 1: 2, 2: 2, 3: 0}
+        assert "error" in done[3]
+        assert sum(1 for line in lines if "feature" in line) == 5
+
+
+@pytest.mark.asyncio
+async def test_fires_group_by_day(monkeypatch):
+    import json
+
+    from app.main import app
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return [
+            {"acq_date": "2024-01-05", "acq_time": "0000", "latitude": 1, "longitude": 1},
+            {"acq_date": "2024-01-07", "acq_time": "0100", "latitude": 2, "longitude": 2},
+            {"acq_date": "2024-01-07", "acq_time": "0200", "latitude": 3, "longitude": 3},
+            {"acq_date": "not-a-date", "acq_time": "0200", "latitude": 4, "longitude": 4},
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+    params = {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-07", "groupBy": "day"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] == 3
+        assert body["counts"] == {"2024-01-05": 1, "2024-01-06": 0, "2024-01-07": 2}
+        assert body["days"][2]["data"]["type"] == "FeatureCollection"
+
+        resp = await client.get("/api/fires", params=params, headers={"Accept": "application/x-ndjson"})
+        blocks = [json.loads(line) for line in resp.text.splitlines()]
+        assert [(b["date"], b["count"]) for b in blocks] == [("2024-01-05", 1), ("2024-01-06", 0), ("2024-01-07", 2)]
+
+
+@pytest.mark.asyncio
+async def test_fires_cursor_pagination(monkeypatch):
+    from app.main import app
+
+    calls = []
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        calls.append(ctx)
+        return [
+            {"acq_date": "2024-01-06", "acq_time": "0100", "latitude": "3", "longitude": "3"},
+            {"acq_date": "2024-01-05", "acq_time": "0200", "latitude": "2", "longitude": "2"},
+            {"acq_date": "2024-01-05", "acq_time": "0200", "latitude": "1", "longitude": "1"},
+            {"acq_date": "2024-01-05", "acq_time": "0100", "latitude": "0", "longitude": "0"},
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+    params = {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-06", "format": "json", "limit": 3}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params=params)
+        assert resp.status_code == 200
+        assert [r["latitude"] for r in resp.json()] == ["0", "1", "2"]
+        assert resp.headers["X-Total-Count"] == "4"
+        cursor = resp.headers["X-Next-Cursor"]
+
+        resp = await client.get("/api/fires", params={"cursor": cursor, "limit": 3, "format": "geojson"})
+        assert resp.status_code == 200
+        assert [f["geometry"]["coordinates"] for f in resp.json()["features"]] == [[3.0, 3.0]]
+        assert "X-Next-Cursor" not in resp.headers
+        assert len(calls) == 1
+
+        resp = await client.get("/api/fires", params={"cursor": "garbage!"})
+        assert resp.status_code == 400
+
+        # Another worker (or an expired cache) re-runs the cursor's query and resumes after its last row
+        from app.api.routes.fires import service
+
+        service.pages.results.clear()
+        resp = await client.get("/api/fires", params={"cursor": cursor, "format": "json"})
+        assert resp.status_code == 200
+        assert [r["latitude"] for r in resp.json()] == ["3"]
+        assert resp.headers["X-Total-Count"] == "4"
+        assert len(calls) == 2
+        assert (calls[1].start.isoformat(), calls[1].end.isoformat()) == ("2024-01-05", "2024-01-06")
+
+
+@pytest.mark.asyncio
+async def test_fires_cursor_keeps_filters_across_workers(monkeypatch):
+    from app.main import app
+    from app.api.routes.fires import service
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        rows = [
+            {"acq_date": "2024-01-05", "acq_time": f"{i:04d}", "latitude": str(i), "longitude": "1", "frp": str(i)}
+            for i in range(6)
+        ]
+        return [row for row in rows if ctx.predicate is None or ctx.predicate(row)]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service, "fetch", fake_fetch)
+
+    params = {"west": 0, "south": 0, "east": 5, "north": 5, "start_date": "2024-01-05", "end_date": "2024-01-05"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params={**params, "minFrp": 2, "limit": 2, "format": "json"})
+        assert [r["latitude"] for r in resp.json()] == ["2", "3"]
+        service.pages.results.clear()
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = await client.get("/api/fires", params={"cursor": cursor, "limit": 2, "format": "json"})
+        assert [r["latitude"] for r in resp.json()] == ["4", "5"]
+        assert resp.headers["X-Total-Count"] == "4"
+        assert "X-Next-Cursor" not in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_fires_delta_since_version(monkeypatch):
+    from datetime import date
+
+    from app.main import app
+    from app.api.routes.fires import service
+    from app.services.fires import COUNTRY_BBOX
+
+    def fire(lat, time="0100"):
+        return {"acq_date": "2024-02-10", "acq_time": time, "latitude": str(lat), "longitude": "-100.0", "source": "VIIRS_SNPP_NRT"}
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-12-31")}
+
+    async def fake_fetch_records(url, source, client=None):
+        return [fire(30), fire(31)]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service.client, "fetch_records", fake_fetch_records)
+
+    params = {"country": "USA", "start_date": "2024-02-10", "end_date": "2024-02-10", "fields": "frp"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params={**params, "since": ""})
+        assert resp.headers["X-Delta"] == "full"
+        assert [f["id"] for f in resp.json()["features"]] == [
+            "2024-02-10|0100|30|-100.0|VIIRS_SNPP_NRT",
+            "2024-02-10|0100|31|-100.0|VIIRS_SNPP_NRT",
+        ]
+        first = resp.headers["X-Version"]
+
+        # A refresh replaces the day: one detection reprocessed away, one new
+        service.partitions.store("VIIRS_SNPP_NRT", COUNTRY_BBOX["USA"], [date(2024, 2, 10)], [fire(30), fire(32, "0200")])
+
+        resp = await client.get("/api/fires", params={**params, "since": first, "format": "json"})
+        body = resp.json()
+        assert resp.headers["X-Delta"] == "delta"
+        assert [row["id"] for row in body["added"]] == ["2024-02-10|0200|32|-100.0|VIIRS_SNPP_NRT"]
+        assert body["removed"] == ["2024-02-10|0100|31|-100.0|VIIRS_SNPP_NRT"]
+
+        resp = await client.get("/api/fires", params={**params, "since": resp.headers["X-Version"]})
+        assert resp.json()["features"] == [] and resp.json()["removed"] == []
+
+        resp = await client.get("/api/fires", params={**params, "since": first, "minFrp": 1})
+        assert resp.headers["X-Delta"] == "full"
+
+        resp = await client.get("/api/fires", params={**params, "since": "garbage"})
+        assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_fire_events_route(monkeypatch):
+    from app.main import app
+
+    async def fake_to_thread(func, *args, **kwargs):
+        if func.__name__ == "check_data_availability":
+            return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+        return func(*args, **kwargs)
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return [
+            {"acq_date": "2024-01-05", "acq_time": "0100", "latitude": "40.0", "longitude": "-100.0", "frp": "2"},
+            {"acq_date": "2024-01-05", "acq_time": "0400", "latitude": "40.005", "longitude": "-100.0", "frp": "3"},
+            {"acq_date": "2024-01-06", "acq_time": "0100", "latitude": "45.0", "longitude": "-100.0", "frp": "1"},
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+    params = {"country": "USA", "start_date": "2024-01-05", "end_date": "2024-01-06", "distanceKm": 2}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires/events", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert (body["detections"], body["count"]) == (3, 2)
+        assert body["events"][0]["count"] == 2 and body["events"][0]["frp"] == 5.0
+
+        resp = await client.get("/api/fires/events", params={**params, "distanceKm": 0})
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_fires_deadline_returns_partial_result(monkeypatch):
+    import asyncio
+
+    from app.main import app
+    from app.api.routes.fires import service
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    calls = []
+    slow = {"2024-01-11"}
+
+    async def fake_fetch_records(url, source, client=None, timeout=None):
+        calls.append(url)
+        start = url.rsplit("/", 1)[1]
+        if start in slow:
+            await asyncio.sleep(5)
+        return [{"acq_date": start, "acq_time": "0100", "latitude": "10.5", "longitude": "10.5", "source": source}]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service.client, "fetch_records", fake_fetch_records)
+
+    params = {"west": 10, "south": 10, "east": 11, "north": 11, "start_date": "2024-01-01", "end_date": "2024-01-12"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params={**params, "deadlineMs": 200})
+        assert resp.status_code == 200
+        assert resp.headers["X-Partial-Result"] == "true"
+        assert resp.headers["X-Missing-Segments"] == "2024-01-11/2024-01-12"
+        assert [f["properties"]["acq_date"] for f in resp.json()["features"]] == ["2024-01-01"]
+
+        # Only the finished segment was cached, so the retry fetches just the missing days
+        calls.clear()
+        slow.clear()
+        resp = await client.get("/api/fires", params=params)
+        assert "X-Partial-Result" not in resp.headers
+        assert [url.rsplit("/", 2)[1:] for url in calls] == [["2", "2024-01-11"]]
+        assert len(resp.json()["features"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_and_batch_honour_deadline(monkeypatch):
+    import asyncio
+    import json
+    import time
+
+    from app.main import app
+    from app.api.routes.fires import service
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    def row(start, source):
+        return {"acq_date": start, "acq_time": "0100", "latitude": "20.5", "longitude": "20.5", "source": source}
+
+    async def fake_stream_batches(url, source, *, client, timeout=None):
+        start = url.rsplit("/", 1)[1]
+        if start == "2024-01-11":
+            await asyncio.sleep(5)
+        yield [row(start, source)]
+
+    async def fake_fetch_records(url, source, client=None, timeout=None):
+        start = url.rsplit("/", 1)[1]
+        if start == "2024-01-11":
+            await asyncio.sleep(5)
+        return [row(start, source)]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service.client, "stream_batches", fake_stream_batches)
+    monkeypatch.setattr(service.client, "fetch_records", fake_fetch_records)
+
+    params = {"west": 20, "south": 20, "east": 21, "north": 21, "start_date": "2024-01-01", "end_date": "2024-01-12"}
+    started = time.monotonic()
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get(
+            "/api/fires", params={**params, "deadlineMs": 200}, headers={"Accept": "application/x-ndjson"}
+        )
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["properties"]["acq_date"] for line in lines[:-1]] == ["2024-01-01"]
+        assert lines[-1] == {"partial": True, "missing_segments": ["2024-01-11/2024-01-12"]}
+
+        body = {"queries": [params], "deadlineMs": 200}
+        resp = await client.post("/api/fires/batch", json=body)
+        assert resp.headers["X-Partial-Result"] == "true"
+        [entry] = resp.json()["results"]
+        assert entry["missing_segments"] == ["2024-01-11/2024-01-12"]
+        assert len(entry["data"]["features"]) == 1
+
+        resp = await client.post("/api/fires/batch", json=body, headers={"Accept": "application/x-ndjson"})
+        status = [json.loads(line) for line in resp.text.splitlines()][-1]
+        assert status["done"] and status["missing_segments"] == ["2024-01-11/2024-01-12"]
+    assert time.monotonic() - started < 3
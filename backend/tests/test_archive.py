@@ -0,0 +1,122 @@
+from datetime import date
+
+import pytest
+from fastapi import Response
+
+from app.services.fires import FireService
+from app.storage import ColumnarArchive
+
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+
+def _row(day, lat, lon, time="0100", frp="1.5"):
+    return {
+        "acq_date": day,
+        "acq_time": time,
+        "latitude": lat,
+        "longitude": lon,
+        "frp": frp,
+        "confidence": "n",
+        "satellite": "N",
+        "instrument": "VIIRS",
+        "daynight": "D",
+    }
+
+
+def test_archive_roundtrip_and_bbox_filter(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    rows = [
+        _row("2023-03-02", "10.5", "20.25"),
+        _row("2023-03-01", "11", "21"),
+        _row("2023-03-01", "50", "21"),
+    ]
+    written = archive.append(
+        "VIIRS_SNPP_SP", rows, days=[date(2023, 3, 1), date(2023, 3, 2)], bbox=WORLD
+    )
+    assert written == 3
+
+    # Appending the same days again is a no-op: the archive is append-only.
+    assert archive.append("VIIRS_SNPP_SP", rows, days=[date(2023, 3, 1)], bbox=WORLD) == 0
+
+    result = archive.read("VIIRS_SNPP_SP", date(2023, 3, 1), date(2023, 3, 2), (0, 0, 30, 30))
+    assert sorted((r["acq_date"], r["latitude"]) for r in result) == [
+        ("2023-03-01", "11.0"),
+        ("2023-03-02", "10.5"),
+    ]
+    assert result[0]["source"] == "VIIRS_SNPP_SP"
+    assert result[0]["frp"] == "1.5"
+
+    archive.rebuild_index()
+    indexed = archive.read("VIIRS_SNPP_SP", date(2023, 3, 2), date(2023, 3, 2), WORLD)
+    assert [r["acq_time"] for r in indexed] == ["0100"]
+    archive.close()
+
+
+def test_rebuild_index_sorts_by_day_and_keeps_append_order(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    batches = [
+        [_row("2024-12-31", "1", "1", time="0009"), _row("2024-01-01", "2", "2"), _row("2024-12-31", "3", "3")],
+        [_row("2024-06-15", "4", "4", time="0300", frp="9.75")],
+    ]
+    days = [[date(2024, 12, 31), date(2024, 1, 1)], [date(2024, 6, 15)]]
+    for rows, covered in zip(batches, days):
+        archive.append("VIIRS_SNPP_SP", rows, days=covered, bbox=WORLD)
+    before = archive.read("VIIRS_SNPP_SP", date(2024, 1, 1), date(2024, 12, 31), WORLD)
+
+    archive.rebuild_index()
+    after = archive.read("VIIRS_SNPP_SP", date(2024, 1, 1), date(2024, 12, 31), WORLD)
+    # Sorted by day; the two 2024-12-31 rows keep their append order
+    assert [r["latitude"] for r in after] == ["2.0", "4.0", "1.0", "3.0"]
+    assert sorted(map(sorted, (r.items() for r in after))) == sorted(map(sorted, (r.items() for r in before)))
+    june = archive.read("VIIRS_SNPP_SP", date(2024, 6, 15), date(2024, 6, 15), WORLD)
+    assert [(r["acq_date"], r["frp"]) for r in june] == [("2024-06-15", "9.75")]
+    archive.close()
+
+
+def test_archive_coverage_requires_containing_extent(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    archive.append("MODIS_SP", [], days=[date(2022, 7, 1)], bbox=(0, 0, 10, 10))
+
+    assert archive.covered_days("MODIS_SP", date(2022, 6, 30), date(2022, 7, 2), (1, 1, 5, 5)) == {
+        date(2022, 7, 1)
+    }
+    assert archive.covered_days("MODIS_SP", date(2022, 7, 1), date(2022, 7, 1), (5, 5, 20, 20)) == set()
+
+
+@pytest.mark.asyncio
+async def test_prepare_query_only_fetches_archive_gaps(monkeypatch, tmp_path):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+    service = FireService()
+    service.archive = ColumnarArchive(tmp_path)
+    service.archive.append(
+        "VIIRS_SNPP_SP",
+        [_row("2023-03-02", "10", "10")],
+        days=[date(2023, 3, 2), date(2023, 3, 3)],
+        bbox=WORLD,
+    )
+
+    async def fake_to_thread(func, *args, **kwargs):
+        if func in (service.archive.covered_days, service.archive.read):
+            return func(*args, **kwargs)
+        return {"VIIRS_SNPP_SP": ("2020-01-01", "2023-12-31")}
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+
+    ctx = await service.prepare_query(
+        response=Response(),
+        country=None,
+        west=0,
+        south=0,
+        east=20,
+        north=20,
+        start_date="2023-03-01",
+        end_date="2023-03-04",
+        source_priority="VIIRS_SNPP_SP",
+    )
+
+    assert ctx.archived_days == [date(2023, 3, 2), date(2023, 3, 3)]
+    assert [u.rsplit("/", 2)[-2:] for u in ctx.urls] == [["1", "2023-03-01"], ["1", "2023-03-04"]]
+    archived = await service.read_archive(ctx)
+    assert [r["acq_date"] for r in archived] == ["2023-03-02"]
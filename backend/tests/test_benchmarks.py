@@ -0,0 +1,22 @@
+from benchmarks.run import run
+from benchmarks.synth import HEADERS, generate_csv
+
+from app.clients.firms import parse_csv_rows
+
+
+def test_synthetic_csv_is_deterministic_and_parseable():
+    for sensor in HEADERS:
+        text = generate_csv(sensor, 50, seed=7)
+        assert text == generate_csv(sensor, 50, seed=7)
+        assert text != generate_csv(sensor, 50, seed=8)
+
+        header, _, body = text.partition("\n")
+        records = parse_csv_rows(tuple(header.split(",")), body, "SRC")
+        assert len(records) == 50
+        assert all(r["acq_date"].startswith("2024-07-") and r["latitude"] for r in records)
+
+
+def test_run_reports_machine_readable_results():
+    results = run([20], ["viirs"], ["parse_csv_rows", "deduplicate"], repeat=1)
+    assert [r["benchmark"] for r in results] == ["parse_csv_rows", "deduplicate"]
+    assert all(r["rows"] == 20 and r["seconds"] > 0 and r["peak_bytes"] > 0 for r in results)
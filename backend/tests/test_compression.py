@@ -0,0 +1,35 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport
+
+from app.core.compression import SelectiveGZipMiddleware
+
+
+@pytest.mark.asyncio
+async def test_event_streams_bypass_gzip():
+    app = FastAPI()
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=10)
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            for i in range(3):
+                yield f"data: {'x' * 100} {i}\n\n".encode()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 1000)
+
+    headers = {"Accept-Encoding": "gzip"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/events", headers=headers)
+        assert "content-encoding" not in resp.headers
+        assert resp.text.count("data: ") == 3
+
+        resp = await client.get("/text", headers=headers)
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.text == "x" * 1000
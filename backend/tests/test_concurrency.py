@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients.concurrency import AdaptiveLimiter
+from app.clients.firms import FIRMSClient
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    limiter = AdaptiveLimiter(8, cooldown=0)
+    limiter.observe(0.1, 429)
+    assert limiter.current == 4
+    limiter.observe(0.1, 503)
+    limiter.observe(0.1, None)
+    assert limiter.current == 1
+    for _ in range(6):
+        limiter.observe(0.1, 200)
+    assert limiter.current == 3
+    for _ in range(200):
+        limiter.observe(0.1, 200)
+    assert limiter.limit == 8
+
+
+def test_latency_spike_backs_off_and_cooldown_groups_signals():
+    limiter = AdaptiveLimiter(8, cooldown=60)
+    limiter.observe(0.1, 200)
+    limiter.observe(1.0, 200)
+    assert limiter.current == 4
+    limiter.observe(0.1, 429)
+    assert limiter.current == 4
+
+
+def test_static_mode_pins_limit_to_ceiling():
+    limiter = AdaptiveLimiter(5, adaptive=False)
+    limiter.observe(0.1, 429)
+    assert limiter.current == 5
+    assert limiter.gate(20).capacity == 5
+    assert limiter.gate(2).capacity == 2
+
+
+@pytest.mark.asyncio
+async def test_gate_follows_the_shared_limit():
+    limiter = AdaptiveLimiter(4, cooldown=0)
+    gate = limiter.gate()
+    active = peak = 0
+
+    async def task():
+        nonlocal active, peak
+        async with gate:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(task() for _ in range(8)))
+    assert peak == 4
+
+    limiter.observe(0.1, 429)
+    peak = 0
+    await asyncio.gather(*(task() for _ in range(8)))
+    assert peak == 2
+
+
+def test_latency_baseline_is_per_call_size():
+    limiter = AdaptiveLimiter(8, cooldown=0)
+    # A tiny bbox answers fast; a continent-sized call is slower but normal for its size
+    limiter.observe(0.05, 200, size=4)
+    limiter.observe(2.0, 200, size=50_000)
+    limiter.observe(2.5, 200, size=60_000)
+    assert limiter.current == 8
+    limiter.observe(9.0, 200, size=55_000)
+    assert limiter.current == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_the_limit():
+    limiter = AdaptiveLimiter(4, cooldown=0)
+    active = peak = 0
+    per_request = {}
+
+    async def call(gate, name):
+        nonlocal active, peak
+        async with gate:
+            active += 1
+            per_request[name] = per_request.get(name, 0) + 1
+            peak = max(peak, active)
+            assert per_request[name] <= gate.cap
+            await asyncio.sleep(0.01)
+            per_request[name] -= 1
+            active -= 1
+
+    async def request(name, cap=None):
+        gate = limiter.gate(cap)
+        await asyncio.gather(*(call(gate, name) for _ in range(6)))
+
+    # Three requests at once never put more than the limit upstream together
+    await asyncio.gather(request("a"), request("b"), request("c", cap=1))
+    assert peak == 4 and limiter.inflight == 0
+
+    limiter.observe(0.1, 429)
+    peak = 0
+    await asyncio.gather(request("a"), request("b"))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_client_reports_throttling_to_limiter():
+    limiter = AdaptiveLimiter(6, cooldown=0)
+    client = FIRMSClient(limiter=limiter)
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, text="slow down"))
+    async with httpx.AsyncClient(transport=transport) as http:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_records("http://firms.test/area", "VIIRS_SNPP_NRT", client=http)
+    assert limiter.current == 3
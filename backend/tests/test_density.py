@@ -0,0 +1,120 @@
+import asyncio
+import random
+from datetime import date
+
+import httpx
+import numpy as np
+import pytest
+from httpx import ASGITransport
+
+from app.services.density import BASE_RES, DayPyramid, DensityService, level_res, render
+from app.services.fires import FireQueryContext, FireService
+
+
+def _points(n, seed=0, area=(-10.0, 30.0, 10.0, 50.0), day="2024-01-05"):
+    rng = random.Random(seed)
+    west, south, east, north = area
+    return [
+        {
+            "latitude": str(rng.uniform(south, north)),
+            "longitude": str(rng.uniform(west, east)),
+            "frp": str(rng.uniform(0, 20)),
+            "acq_date": day,
+        }
+        for _ in range(n)
+    ]
+
+
+def _direct(records, bbox, res, weight):
+    """Reference: bin points straight into the requested grid."""
+    west, south, east, north = bbox
+    nx, ny = int(round((east - west) / res)), int(round((north - south) / res))
+    grid = np.zeros((ny, nx))
+    for row in records:
+        lon, lat = float(row["longitude"]), float(row["latitude"])
+        ix, iy = int((lon - west) // res), int((lat - south) // res)
+        if 0 <= ix < nx and 0 <= iy < ny:
+            grid[iy, ix] += 1 if weight == "count" else float(row["frp"])
+    return grid[::-1]
+
+
+@pytest.mark.parametrize("weight", ["count", "frp"])
+def test_coarse_levels_match_direct_binning(weight):
+    records = _points(3000)
+    pyramid = DayPyramid.from_records(records)
+    bbox = (-8.0, 32.0, 8.0, 48.0)
+    for res in (BASE_RES * 4, 0.5, 2.0):
+        grid = render([pyramid], bbox, res, weight)
+        dtype = "<u2" if weight == "count" else "<f4"
+        values = np.frombuffer(grid.data, dtype=dtype).reshape(grid.height, grid.width)
+        assert grid.res == res
+        assert grid.bbox == bbox
+        assert np.allclose(values, _direct(records, bbox, res, weight), rtol=1e-4)
+
+
+def test_render_sums_days_and_snaps_to_cell_edges():
+    day1 = DayPyramid.from_records(_points(100, seed=1))
+    day2 = DayPyramid.from_records(_points(50, seed=2))
+    grid = render([day1, day2], (-10.1, 29.9, 10.1, 50.1), 1.0, "count")
+    assert grid.dtype == "uint16"
+    assert grid.bbox == (-11.0, 29.0, 11.0, 51.0)
+    assert grid.points == 150
+    assert np.frombuffer(grid.data, dtype="<u2").sum() == 150
+    assert grid.res == level_res(6)
+
+
+@pytest.mark.asyncio
+async def test_density_service_caches_day_pyramids(monkeypatch):
+    service = FireService()
+    density = DensityService(service)
+    calls = []
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        calls.append((ctx.start, ctx.end))
+        return _points(200, day="2024-01-05") + _points(100, seed=3, day="2024-01-06")
+
+    monkeypatch.setattr(service, "fetch", fake_fetch)
+    monkeypatch.setattr(service, "compose_days", lambda source, area, days: ["u"])
+
+    area = (-10.0, 30.0, 10.0, 50.0)
+    ctx = FireQueryContext(urls=["u"], selected_source="SRC", area=area, start=date(2024, 1, 5), end=date(2024, 1, 6))
+    grid = await density.grid(ctx, bbox=area, res=0.25, weight="count")
+    assert grid.points == 300
+    # Coarser zoom and a sub-area are served from cached pyramids
+    await density.grid(ctx, bbox=area, res=2.0, weight="frp")
+    inner = FireQueryContext(urls=["u"], selected_source="SRC", area=(0.0, 40.0, 5.0, 45.0), start=date(2024, 1, 6), end=date(2024, 1, 6))
+    await density.grid(inner, bbox=inner.area, res=0.5, weight="count")
+    assert calls == [(date(2024, 1, 5), date(2024, 1, 6))]
+
+
+@pytest.mark.asyncio
+async def test_density_route_returns_binary_grid(monkeypatch):
+    from app.core.config import settings
+    from app.main import app
+    from app.api.routes.fires import service
+
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+    real_to_thread = asyncio.to_thread
+
+    async def fake_to_thread(func, *args, **kwargs):
+        if getattr(func, "__name__", "") == "check_data_availability":
+            return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+        return await real_to_thread(func, *args, **kwargs)
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return _points(500, area=(1.0, 1.0, 3.0, 3.0), day="2024-01-05")
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service, "fetch", fake_fetch)
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get(
+            "/api/fires/density",
+            params={"bbox": "0,0,4,4", "start_date": "2024-01-05", "end_date": "2024-01-05", "res": 0.5},
+        )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/octet-stream"
+    width, height = int(resp.headers["x-grid-width"]), int(resp.headers["x-grid-height"])
+    assert (width, height, resp.headers["x-grid-dtype"]) == (8, 8, "uint16")
+    values = np.frombuffer(resp.content, dtype="<u2")
+    assert values.size == width * height and values.sum() == 500
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from benchmarks.emulator import EmulatorConfig, create_emulator
+from benchmarks.loadtest import percentile
+from utils.data_availability import check_data_availability
+from utils.urlbuilder import build_area_url
+
+
+@pytest.mark.asyncio
+async def test_emulator_serves_area_csv_for_built_urls():
+    app = create_emulator(EmulatorConfig(latency_ms=0, jitter_ms=0, rows_per_day=5))
+    base = "http://emulator/api"
+    url = build_area_url("KEY", "VIIRS_SNPP_NRT", (0, 0, 10, 10), 2, base_url=base)
+    assert url.startswith(base + "/area/csv/KEY/")
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app)) as client:
+        resp = await client.get(url)
+        assert resp.status_code == 200
+        lines = resp.text.strip().splitlines()
+        assert lines[0].startswith("latitude,longitude,bright_ti4")
+        assert len(lines) == 1 + 10
+        assert (await client.get(url)).text == resp.text
+
+        avail = await client.get(f"{base}/data_availability/csv/KEY/ALL")
+        assert "VIIRS_SNPP_SP" in avail.text
+
+
+@pytest.mark.asyncio
+async def test_emulator_error_injection():
+    app = create_emulator(EmulatorConfig(latency_ms=0, jitter_ms=0, error_rate=1.0))
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://emulator") as client:
+        resp = await client.get("/api/country/csv/KEY/MODIS_NRT/USA/1")
+        assert resp.status_code in (429, 503)
+
+
+def test_availability_uses_configured_base_url(monkeypatch):
+    seen = {}
+
+    class FakeResponse:
+        text = "data_id,min_date,max_date\nMODIS_NRT,2024-01-01,2024-02-01\n"
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, timeout):
+        seen["url"] = url
+        return FakeResponse()
+
+    monkeypatch.setattr("utils.data_availability.requests.get", fake_get)
+    result = check_data_availability("KEY-BASEURL", force_refresh=True, base_url="http://127.0.0.1:9000/api/")
+    assert seen["url"] == "http://127.0.0.1:9000/api/data_availability/csv/KEY-BASEURL/ALL"
+    assert result == {"MODIS_NRT": ("2024-01-01", "2024-02-01")}
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(101)), 99) == 99
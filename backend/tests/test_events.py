@@ -0,0 +1,133 @@
+import math
+import random
+
+from utils.events import KM_PER_DEG_LAT, KM_PER_DEG_LON, group_events
+
+
+def fire(lat, lon, day="2024-07-01", time="1200", frp=1.5):
+    """A detection as the CSV parser yields it, with text values."""
+    return {"latitude": str(lat), "longitude": str(lon), "acq_date": day, "acq_time": time, "frp": str(frp)}
+
+
+def km_east(lat, km):
+    """Degrees of longitude spanning ``km`` at ``lat``."""
+    return km / (KM_PER_DEG_LON * math.cos(math.radians(lat)))
+
+
+def brute_force_counts(records, distance_km, gap_hours):
+    """Event sizes by checking every pair, for comparison."""
+    parent = list(range(len(records)))
+    coords = [(float(r["latitude"]), float(r["longitude"])) for r in records]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def hours(row):
+        day = int(row["acq_date"][-2:])
+        return day * 24 + int(row["acq_time"][:2]) + int(row["acq_time"][2:]) / 60
+
+    for i, a in enumerate(records):
+        for j in range(i + 1, len(records)):
+            b = records[j]
+            (lat_a, lon_a), (lat_b, lon_b) = coords[i], coords[j]
+            dy = (lat_a - lat_b) * KM_PER_DEG_LAT
+            mid = math.radians((lat_a + lat_b) / 2)
+            dx = (lon_a - lon_b) * KM_PER_DEG_LON * math.cos(mid)
+            if dx * dx + dy * dy <= distance_km**2 and abs(hours(a) - hours(b)) <= gap_hours:
+                parent[find(i)] = find(j)
+    sizes = {}
+    for i in range(len(records)):
+        sizes[find(i)] = sizes.get(find(i), 0) + 1
+    return sorted(sizes.values())
+
+
+def test_chains_adjacent_detections_into_one_event():
+    records = [
+        fire(10.0, 20.0, time="0100"),
+        fire(10.0, 20.008, time="0300"),  # ~0.9 km east
+        fire(10.0, 20.016, day="2024-07-02", time="0200"),  # chained through the previous one
+        fire(10.0, 20.5),  # far away
+        fire(10.0, 20.0, day="2024-07-05"),  # same place, days later
+    ]
+    events = group_events(records, distance_km=1.0, gap_hours=24)
+    assert [e["count"] for e in events] == [3, 1, 1]
+    first = events[0]
+    assert first["bbox"] == [20.0, 10.0, 20.016, 10.0]
+    assert (first["first_seen"], first["last_seen"]) == ("2024-07-01T01:00Z", "2024-07-02T02:00Z")
+    assert first["frp"] == 4.5
+    assert [e["id"] for e in events] == [1, 2, 3]
+
+
+def test_distance_and_gap_thresholds():
+    records = [fire(0.0, 0.0), fire(0.0, 0.02, time="1500")]  # ~2.2 km, 3 h apart
+    assert len(group_events(records, distance_km=2.0, gap_hours=24)) == 2
+    assert len(group_events(records, distance_km=2.5, gap_hours=24)) == 1
+    assert len(group_events(records, distance_km=2.5, gap_hours=2)) == 2
+
+
+def test_skips_unusable_rows_and_filters_small_events():
+    records = [fire(1.0, 1.0), fire(1.0, 1.001), {"latitude": None, "longitude": "1"}, fire(5.0, 5.0, day="bad")]
+    events = group_events(records, min_count=2)
+    assert len(events) == 1 and events[0]["count"] == 2
+
+
+def test_result_does_not_depend_on_unrelated_detections():
+    apart = [fire(0.0, 0.0), fire(0.0, km_east(0.0, 1.5))]
+    assert len(group_events(apart, distance_km=1.0)) == 2
+    # A far poleward detection used to widen every cell and merge the pair
+    assert len(group_events(apart + [fire(80.0, 0.0)], distance_km=1.0)) == 3
+
+    close = [fire(0.0, 0.0), fire(0.0, km_east(0.0, 0.9))]
+    assert len(group_events(close + [fire(80.0, 0.0)], distance_km=1.0)) == 2
+
+
+def test_links_across_latitudes():
+    for lat in (-75.0, -30.0, 0.0, 45.0, 70.0, 85.0):
+        near = [fire(lat, 10.0), fire(lat, 10.0 + km_east(lat, 0.95))]
+        far = [fire(lat, 10.0), fire(lat, 10.0 + km_east(lat, 1.05))]
+        assert len(group_events(near, distance_km=1.0)) == 1, lat
+        assert len(group_events(far, distance_km=1.0)) == 2, lat
+
+
+def test_matches_pairwise_reference():
+    rng = random.Random(7)
+    records = []
+    for _ in range(150):
+        lat = rng.choice((-60.0, 0.0, 40.0, 78.0)) + rng.uniform(0, 0.03)
+        lon = 20.0 + rng.uniform(0, km_east(lat, 4.0))
+        records.append(fire(lat, lon, day=f"2024-07-0{rng.randint(1, 3)}", time=f"{rng.randint(0, 23):02d}00"))
+    events = group_events(records, distance_km=1.0, gap_hours=12)
+    assert sorted(e["count"] for e in events) == brute_force_counts(records, 1.0, 12)
+
+
+def test_time_gap_is_inclusive():
+    at_gap = [fire(5.0, 5.0, time="0000"), fire(5.0, 5.0, time="1200")]
+    assert len(group_events(at_gap, gap_hours=12)) == 1
+    past_gap = [fire(5.0, 5.0, time="0000"), fire(5.0, 5.0, time="1201")]
+    assert len(group_events(past_gap, gap_hours=12)) == 2
+    across_midnight = [fire(5.0, 5.0, time="2330"), fire(5.0, 5.0, day="2024-07-02", time="0030")]
+    assert len(group_events(across_midnight, gap_hours=1)) == 1
+
+
+def test_min_count_drops_small_events():
+    records = [fire(1.0, 1.0), fire(1.0, 1.001), fire(1.0, 1.002), fire(3.0, 3.0, frp=50.0)]
+    assert [e["count"] for e in group_events(records)] == [1, 3]
+    kept = group_events(records, min_count=2)
+    assert [e["count"] for e in kept] == [3] and kept[0]["id"] == 1
+    assert group_events(records, min_count=4) == []
+
+
+def test_empty_and_single_row():
+    assert group_events([]) == []
+    [event] = group_events([fire(-12.5, 130.25, time="0315", frp=7.25)])
+    assert event == {
+        "id": 1,
+        "bbox": [130.25, -12.5, 130.25, -12.5],
+        "first_seen": "2024-07-01T03:15Z",
+        "last_seen": "2024-07-01T03:15Z",
+        "count": 1,
+        "frp": 7.25,
+    }
@@ -101,6 +101,52 @@ async def test_fetch_deduplicates(monkeypatch):
     assert len(records) == 2
 
 
+
+@pytest.mark.asyncio
+async def test_fetch_applies_filter_before_dedup(monkeypatch):
+    service = FireService()
+    predicate = service.compile_filter(min_confidence="high", min_frp=5, daynight="D", time_from="2200", time_to="0300")
+    ctx = FireQueryContext(urls=["u1"], selected_source="SRC", predicate=predicate)
+
+    async def fake_fetch_records(self, url, source, client):
+        return [
+            {"acq_date": "2024-01-01", "acq_time": "2330", "latitude": "1", "longitude": "1", "confidence": "h", "frp": "9", "daynight": "D"},
+            {"acq_date": "2024-01-01", "acq_time": "0115", "latitude": "2", "longitude": "2", "confidence": "85", "frp": "6", "daynight": "D"},
+            {"acq_date": "2024-01-01", "acq_time": "1200", "latitude": "3", "longitude": "3", "confidence": "h", "frp": "9", "daynight": "D"},
+            {"acq_date": "2024-01-01", "acq_time": "2330", "latitude": "4", "longitude": "4", "confidence": "n", "frp": "9", "daynight": "D"},
+            {"acq_date": "2024-01-01", "acq_time": "2330", "latitude": "5", "longitude": "5", "confidence": "h", "frp": "1", "daynight": "D"},
+            {"acq_date": "2024-01-01", "acq_time": "2330", "latitude": "6", "longitude": "6", "confidence": "h", "frp": "9", "daynight": "N"},
+        ]
+
+    class DummyAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(FIRMSClient, "fetch_records", fake_fetch_records, raising=False)
+    monkeypatch.setattr("app.services.fires.httpx.AsyncClient", DummyAsyncClient)
+
+    records = await service.fetch(ctx)
+    assert [r["latitude"] for r in records] == ["1", "2"]
+
+
+def test_compile_filter_validation():
+    from fastapi import HTTPException
+
+    assert FireService.compile_filter() is None
+    with pytest.raises(HTTPException):
+        FireService.compile_filter(min_confidence="very")
+    with pytest.raises(HTTPException):
+        FireService.compile_filter(time_from="2500")
+    with pytest.raises(HTTPException):
+        FireService.compile_filter(min_frp=10, max_frp=1)
+
+
 @pytest.mark.asyncio
 async def test_stream_ndjson(monkeypatch):
     service = FireService()
@@ -152,3 +198,47 @@ def test_compute_stats():
     assert stats["frpLowCount"] == 1
     assert stats["dayCount"] == 1
     assert stats["nightCount"] == 2
+
+
+@pytest.mark.asyncio
+async def test_partition_cache_serves_repeat_and_sub_area_queries(monkeypatch):
+    service = FireService()
+    calls = []
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    async def fake_fetch_records(self, url, source, client):
+        calls.append(url)
+        return [
+            {"acq_date": "2024-01-05", "acq_time": "0100", "latitude": "40", "longitude": "-100", "source": source},
+            {"acq_date": "2024-01-06", "acq_time": "0100", "latitude": "30", "longitude": "-90", "source": source},
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(FIRMSClient, "fetch_records", fake_fetch_records, raising=False)
+
+    async def query(**area):
+        params = {"country": None, "west": None, "south": None, "east": None, "north": None, **area}
+        return await service.prepare_query(
+            response=Response(), start_date="2024-01-05", end_date="2024-01-06", source_priority=None, **params
+        )
+
+    ctx = await query(country="USA")
+    assert ctx.upstream_days and not ctx.cached
+    assert len(await service.fetch(ctx)) == 2
+
+    again = await query(country="USA")
+    assert again.urls == [] and sorted(again.cached) == ctx.upstream_days
+    assert len(await service.fetch(again)) == 2
+
+    inner = await query(west=-110, south=35, east=-95, north=45)
+    assert inner.urls == []
+    assert [r["latitude"] for r in await service.fetch(inner)] == ["40"]
+    assert len(calls) == 1
+
+    refreshed = await service.prepare_query(
+        response=Response(), country="USA", west=None, south=None, east=None, north=None,
+        start_date="2024-01-05", end_date="2024-01-06", source_priority=None, refresh=True,
+    )
+    assert len(refreshed.urls) == 1
@@ -0,0 +1,77 @@
+import csv
+import io
+
+import httpx
+import pytest
+
+from app.clients.firms import FIRMSClient, parse_csv_rows
+
+CSV = (
+    "latitude,longitude,brightness,bright_t31,acq_date,acq_time,satellite,confidence,frp,daynight\r\n"
+    + "".join(
+        f"{i % 90}.5,{i % 180}.25,330.{i % 10},290.1,2024-01-0{1 + i % 9},{i % 2400:04d},T,{i % 100},{i % 50}.5,D\r\n"
+        for i in range(2000)
+    )
+    + "\r\n"
+)
+
+
+def _reference(text, source):
+    client = FIRMSClient()
+    return [client._transform_row(row, source) for row in csv.DictReader(io.StringIO(text)) if any(row.values())]
+
+
+def test_parse_csv_rows_matches_transform_row():
+    header, _, body = CSV.partition("\r\n")
+    assert parse_csv_rows(tuple(header.split(",")), body, "MODIS_NRT") == _reference(CSV, "MODIS_NRT")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("thread_bytes,process_bytes", [(10**9, 10**9), (0, 10**9), (0, 0)])
+async def test_parse_batches_inline_thread_and_process(thread_bytes, process_bytes):
+    client = FIRMSClient(thread_parse_bytes=thread_bytes, process_parse_bytes=process_bytes, parse_chunk_bytes=4096)
+    batches = [batch async for batch in client.parse_batches(CSV, "MODIS_NRT")]
+    if thread_bytes:
+        assert len(batches) == 1
+    else:
+        assert len(batches) > 1
+    assert [row for batch in batches for row in batch] == _reference(CSV, "MODIS_NRT")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("step", [1, 7, 4096])
+async def test_decode_batches_handles_rows_split_across_chunks(step):
+    text = CSV.replace("T,", "É,")  # multi-byte characters may also straddle chunks
+    data = text.encode("utf-8")
+
+    async def chunks():
+        for i in range(0, len(data), step):
+            yield data[i : i + step]
+
+    client = FIRMSClient(thread_parse_bytes=0, parse_chunk_bytes=1024)
+    batches = [batch async for batch in client.decode_batches(chunks(), "MODIS_NRT", size_hint=len(data))]
+    assert len(batches) > 1
+    assert [row for batch in batches for row in batch] == _reference(text, "MODIS_NRT")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("thread_bytes", [10**9, 0])
+async def test_parse_timing_excludes_the_consumer(monkeypatch, thread_bytes):
+    import asyncio
+
+    recorded = []
+    monkeypatch.setattr("app.core.metrics.record_stage", lambda stage, seconds: recorded.append((stage, seconds)))
+    client = FIRMSClient(thread_parse_bytes=thread_bytes, parse_chunk_bytes=4096)
+    async for _ in client.parse_batches(CSV, "MODIS_NRT"):
+        await asyncio.sleep(0.05)  # dedup/serialization in the caller
+    parse = [seconds for stage, seconds in recorded if stage == "parse"]
+    assert parse and all(seconds < 0.05 for seconds in parse)
+
+
+@pytest.mark.asyncio
+async def test_stream_batches_decodes_response_incrementally():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=CSV.encode("utf-8")))
+    async with httpx.AsyncClient(transport=transport) as http:
+        client = FIRMSClient(thread_parse_bytes=0, parse_chunk_bytes=2048)
+        records = await client.fetch_records("https://firms.test/area.csv", "MODIS_NRT", client=http)
+    assert records == _reference(CSV, "MODIS_NRT")
@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+
+from app.ingest import infer_source, ingest, main, plan_chunks
+from app.storage import ColumnarArchive
+
+CSV = """latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight,type
+-10.1,-50.2,330.1,0.4,0.4,2023-08-01,412,N,VIIRS,n,2,290.0,4.2,N,0
+-10.1,-50.2,330.1,0.4,0.4,2023-08-01,412,N,VIIRS,n,2,290.0,4.2,N,0
+-11.5,-51.0,340.0,0.4,0.4,2023-08-03,1650,N,VIIRS,h,2,295.5,12.0,D,0
+"""
+
+
+def test_infer_source_from_archive_filenames(tmp_path):
+    assert infer_source(tmp_path / "viirs-snpp_2023_Brazil.csv") == "VIIRS_SNPP_SP"
+    assert infer_source(tmp_path / "viirs-jpss1_2023_Brazil.csv") == "VIIRS_NOAA20_SP"
+    assert infer_source(tmp_path / "modis_2023_Brazil.csv") == "MODIS_SP"
+    assert infer_source(tmp_path / "notes.csv") is None
+
+
+def test_plan_chunks_aligns_to_lines(tmp_path):
+    path = tmp_path / "viirs-snpp_2023_Brazil.csv"
+    path.write_text(CSV)
+    header, ranges = plan_chunks(path, chunk_bytes=10)
+    assert header.startswith("latitude,longitude")
+    body = path.read_bytes()
+    assert all(body[end - 1 : end] == b"\n" for _, end in ranges)
+    assert len(ranges) == 3
+
+
+def test_ingest_dedups_and_is_resumable(tmp_path):
+    path = tmp_path / "viirs-snpp_2023_Brazil.csv"
+    path.write_text(CSV)
+    archive = ColumnarArchive(tmp_path / "archive")
+    bbox = (-74.0, -34.0, -34.0, 6.0)
+
+    totals = ingest([path], archive=archive, bbox=bbox, workers=1)
+    assert totals["parsed"] == 3
+    assert totals["written"] == 2
+
+    # Days between the first and last detection count as covered, even without fires.
+    assert archive.covered_days("VIIRS_SNPP_SP", date(2023, 8, 1), date(2023, 8, 3), bbox) == {
+        date(2023, 8, 1),
+        date(2023, 8, 2),
+        date(2023, 8, 3),
+    }
+    rows = archive.read("VIIRS_SNPP_SP", date(2023, 8, 1), date(2023, 8, 3), bbox)
+    assert [(r["acq_date"], r["acq_time"], r["confidence"]) for r in rows] == [
+        ("2023-08-01", "412", "n"),
+        ("2023-08-03", "1650", "h"),
+    ]
+
+    again = ingest([path], archive=archive, bbox=bbox, workers=1)
+    assert again["parsed"] == 0
+    archive.close()
+
+
+def test_ingest_appends_each_file(tmp_path):
+    header, *rows = CSV.splitlines(keepends=True)
+    first = tmp_path / "fire_archive_SV-C2_1.csv"
+    second = tmp_path / "fire_archive_SV-C2_2.csv"
+    first.write_text(header + rows[0])
+    second.write_text(header + rows[2])
+    archive = ColumnarArchive(tmp_path / "archive")
+    bbox = (-74.0, -34.0, -34.0, 6.0)
+
+    assert ingest([first, second], archive=archive, bbox=bbox, workers=1)["written"] == 2
+    assert archive.covered_days("VIIRS_SNPP_SP", date(2023, 8, 1), date(2023, 8, 3), bbox) == {
+        date(2023, 8, 1),
+        date(2023, 8, 3),
+    }
+    assert len(archive.read("VIIRS_SNPP_SP", date(2023, 8, 1), date(2023, 8, 3), bbox)) == 2
+    archive.close()
+
+
+def test_country_extent_is_rejected(tmp_path):
+    # Country files only hold in-border detections, so they cannot vouch for a whole bbox.
+    with pytest.raises(SystemExit):
+        main(["--archive-dir", str(tmp_path), "--country", "BRA", str(tmp_path / "viirs-snpp_2023_Brazil.csv")])
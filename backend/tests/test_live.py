@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.services.fires import FireService
+from app.services.live import LiveHub
+
+USA = (-125.0, 24.0, -66.0, 49.0)
+
+
+def row(lon, lat, time="0100"):
+    return {"acq_date": date.today().isoformat(), "acq_time": time, "latitude": lat, "longitude": lon}
+
+
+def test_tiles_cover_bbox_and_world_edges():
+    hub = LiveHub(FireService(), tile_degrees=10)
+    assert hub.tiles((1.0, 1.0, 9.0, 9.0)) == [(18, 9)]
+    assert hub.tiles((0.0, 0.0, 20.0, 20.0)) == [(18, 9), (19, 9), (18, 10), (19, 10)]
+    assert len(hub.tiles(USA)) == 7 * 3
+    assert hub.tile_of(180.0, 90.0) == (35, 17)
+    assert hub.tile_area((35, 17)) == (170.0, 80.0, 180.0, 90.0)
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_one_poll_per_tile_and_get_backlog():
+    hub = LiveHub(FireService(), interval=0.01, tile_degrees=10)
+    polls = []
+    upstream = [row(2.0, 2.0)]
+
+    async def fake_poll(source, area, days):
+        polls.append(area)
+        return list(upstream)
+
+    hub.poll = fake_poll
+    async with hub.subscribe("VIIRS_SNPP_NRT", (1.0, 1.0, 9.0, 9.0)) as (first, backlog):
+        assert backlog == []
+        assert await asyncio.wait_for(first.queue.get(), 1) == [row(2.0, 2.0)]
+
+        async with hub.subscribe("VIIRS_SNPP_NRT", (0.0, 0.0, 5.0, 5.0)) as (second, backlog):
+            assert backlog == [row(2.0, 2.0)]
+            assert hub.status()["pollers"] == 1
+            assert hub.status()["subscribers"] == 2
+
+            upstream.append(row(3.0, 3.0, "0200"))
+            assert await asyncio.wait_for(first.queue.get(), 1) == [row(3.0, 3.0, "0200")]
+            assert await asyncio.wait_for(second.queue.get(), 1) == [row(3.0, 3.0, "0200")]
+
+        assert set(polls) == {(0.0, 0.0, 10.0, 10.0)}
+    assert hub.pollers == {}
+
+
+@pytest.mark.asyncio
+async def test_cold_tile_is_seeded_from_partition_cache():
+    service = FireService()
+    hub = LiveHub(service, interval=60, tile_degrees=10)
+    days = hub.window()
+    service.partitions.store("VIIRS_SNPP_NRT", (0.0, 0.0, 10.0, 10.0), days, [row(2.0, 2.0)])
+
+    async def fail_poll(source, area, days):
+        raise AssertionError("should not poll before the interval")
+
+    hub.poll = fail_poll
+    async with hub.subscribe("VIIRS_SNPP_NRT", (1.0, 1.0, 9.0, 9.0)) as (sub, _):
+        assert await asyncio.wait_for(sub.queue.get(), 1) == [row(2.0, 2.0)]
+    await hub.close()
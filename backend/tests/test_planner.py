@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from app.services.planner import pack_days
+
+
+def _days(first, count):
+    return [date(2024, 7, first) + timedelta(days=i) for i in range(count)]
+
+
+def test_pack_days_uses_fewest_windows():
+    assert pack_days([]) == []
+    # A 10-day query with 9 cached days is one single-day call
+    assert pack_days([date(2024, 7, 10)]) == [(date(2024, 7, 10), date(2024, 7, 10))]
+    # Gaps around a cached day share one call, trimmed to the last needed day
+    assert pack_days(_days(1, 3) + _days(5, 3)) == [(date(2024, 7, 1), date(2024, 7, 7))]
+    assert pack_days(_days(1, 12)) == [(date(2024, 7, 1), date(2024, 7, 10)), (date(2024, 7, 11), date(2024, 7, 12))]
+    assert pack_days([date(2024, 7, 1), date(2024, 7, 11)]) == [
+        (date(2024, 7, 1), date(2024, 7, 1)),
+        (date(2024, 7, 11), date(2024, 7, 11)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_debug_compose_shows_plan_over_cached_days(monkeypatch):
+    from app.core.config import settings
+    from app.main import app
+    from app.api.routes.fires import service
+
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-31")}
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    area = (30.0, 30.0, 31.0, 31.0)
+    cached = [date(2024, 1, d) for d in range(1, 11) if d not in (3, 6)]
+    service.partitions.store("VIIRS_SNPP_NRT", area, cached, [])
+
+    params = {"west": 30, "south": 30, "east": 31, "north": 31, "start_date": "2024-01-01", "end_date": "2024-01-10"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires/debug/compose", params=params)
+    body = resp.json()
+    assert len(body["urls"]) == 1
+    assert body["urls"][0].endswith("/4/2024-01-03")
+    plan = body["plan"]
+    assert plan["cached"] == [["2024-01-01", "2024-01-02"], ["2024-01-04", "2024-01-05"], ["2024-01-07", "2024-01-10"]]
+    assert plan["calls"] == [
+        {"first": "2024-01-03", "last": "2024-01-06", "areas": [[30.0, 30.0, 31.0, 31.0]], "bridged": 2}
+    ]
+    assert plan["upstream_requests"] == 1
@@ -0,0 +1,68 @@
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from app.core.config import settings
+
+PARAMS = {
+    "west": 10,
+    "south": 10,
+    "east": 11,
+    "north": 11,
+    "start_date": "2024-03-05",
+    "end_date": "2024-03-06",
+    "profile": "1",
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_upstream(monkeypatch):
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return {"VIIRS_SNPP_NRT": ("2024-03-01", "2024-03-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        return [
+            {"acq_date": "2024-03-05", "acq_time": "0000", "latitude": 10.5, "longitude": 10.5, "source": ctx.selected_source}
+        ]
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr("app.api.routes.fires.service.fetch", fake_fetch)
+
+
+@pytest.mark.asyncio
+async def test_profile_param_ignored_unless_enabled(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/fires", params=PARAMS, headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    assert resp.json()["type"] == "FeatureCollection"
+
+
+@pytest.mark.asyncio
+async def test_profile_returns_call_tree_summary(monkeypatch, tmp_path):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/api/fires", params=PARAMS)).status_code == 401
+
+        resp = await client.get("/api/fires", params=PARAMS, headers={"X-Admin-Token": "s3cret"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["status"] == 200 and body["response_bytes"] > 0
+        assert "profile" not in body["query"]
+        assert {"prepare_query", "to_geojson"} <= set(body["focus"])
+        top = body["top"][0]
+        assert top["cumulative_seconds"] >= top["own_seconds"] and top["callees"]
+
+        resp = await client.get(
+            "/api/fires", params={**PARAMS, "profile": "file"}, headers={"X-Admin-Token": "s3cret"}
+        )
+        saved = resp.json()["file"]
+        assert saved.startswith(str(tmp_path)) and saved.endswith(".prof")
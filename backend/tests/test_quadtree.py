@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.services.fires import FireQueryContext, FireService
+from app.services.quadtree import QuadtreePlanner
+
+DAY = date(2024, 7, 1)
+
+
+def _points(west, south, east, north, side):
+    """A ``side`` x ``side`` grid of detections spread evenly over the area."""
+    return [
+        {
+            "latitude": str(south + (north - south) * (j + 0.5) / side),
+            "longitude": str(west + (east - west) * (i + 0.5) / side),
+        }
+        for j in range(side)
+        for i in range(side)
+    ]
+
+
+def test_unknown_or_sparse_areas_are_not_split():
+    planner = QuadtreePlanner(target_rows=1000)
+    area = (0.0, 0.0, 20.0, 20.0)
+    assert planner.split("SRC", area, 1) == [area]
+    planner.observe("SRC", area, [DAY], _points(0, 0, 20, 20, 20))
+    assert planner.split("SRC", area, 1) == [area]
+    assert planner.estimate("SRC", area, 2) == pytest.approx(800)
+
+
+def test_dense_quadrant_is_split_and_sparse_siblings_merged():
+    planner = QuadtreePlanner(target_rows=1000)
+    area = (0.0, 0.0, 20.0, 20.0)
+    # All detections in the north-east 10-degree quadrant
+    planner.observe("SRC", area, [DAY], _points(10, 10, 20, 20, 60))
+    parts = planner.split("SRC", area, 1)
+    # The empty south half goes out as one call, the north-west quadrant as another
+    assert (0.0, 0.0, 20.0, 10.0) in parts
+    assert (0.0, 10.0, 10.0, 20.0) in parts
+    dense = [p for p in parts if p[0] >= 10 and p[1] >= 10]
+    assert len(dense) > 1
+    assert all(planner.estimate("SRC", p, 1) <= 1000 for p in dense)
+    assert planner.split("OTHER", area, 1) == [area]
+
+
+@pytest.mark.asyncio
+async def test_split_fetch_deduplicates_edges_and_caches_whole_area(monkeypatch):
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+    service = FireService()
+    service.quadtree = QuadtreePlanner(target_rows=100)
+    area = (0.0, 0.0, 20.0, 20.0)
+    service.quadtree.observe("MODIS_NRT", area, [DAY], _points(0, 0, 20, 20, 20))
+    urls = service.compose_days("MODIS_NRT", area, [DAY])
+    assert len(urls) > 1
+
+    edge = {"acq_date": "2024-07-01", "acq_time": "0100", "latitude": "10.0", "longitude": "10.0", "source": "MODIS_NRT"}
+
+    async def fake_fetch_records(url, source, client=None):
+        return [dict(edge)]
+
+    monkeypatch.setattr(service.client, "fetch_records", fake_fetch_records)
+    ctx = FireQueryContext(urls=urls, selected_source="MODIS_NRT", area=area, start=DAY, end=DAY, upstream_days=[DAY])
+    assert len(await service.fetch(ctx)) == 1
+    assert len(service.partitions.lookup("MODIS_NRT", area, [DAY])[DAY]) == 1
@@ -0,0 +1,86 @@
+import gzip
+import time
+from datetime import date
+
+from app.core.snapshot import CacheSnapshot
+from app.services.partitions import PartitionCache
+from utils import data_availability
+
+AREA = (-10.0, -5.0, 10.0, 5.0)
+ROW = {"latitude": 1.0, "longitude": 2.0, "acq_date": "2024-01-02"}
+
+
+def make_snapshot(path, partitions):
+    snapshot = CacheSnapshot(path)
+    snapshot.register("partitions", partitions.dump, partitions.restore)
+    return snapshot
+
+
+def test_snapshot_round_trip_restores_partitions(tmp_path):
+    path = tmp_path / "snapshot.json.gz"
+    cache = PartitionCache(ttl_seconds=900)
+    cache.store("VIIRS_SNPP_NRT", AREA, [date(2024, 1, 2), date(2024, 1, 3)], [ROW])
+    assert make_snapshot(path, cache).save() == {"partitions": 2}
+
+    restored = PartitionCache(ttl_seconds=900)
+    assert make_snapshot(path, restored).load() == {"partitions": 2}
+    found = restored.lookup("VIIRS_SNPP_NRT", (0.0, 0.0, 5.0, 5.0), [date(2024, 1, 2), date(2024, 1, 3)])
+    assert found == {date(2024, 1, 2): [ROW], date(2024, 1, 3): []}
+
+
+def test_snapshot_keeps_original_timestamps(tmp_path, monkeypatch):
+    path = tmp_path / "snapshot.json.gz"
+    cache = PartitionCache(ttl_seconds=60)
+    cache.store("VIIRS_SNPP_NRT", AREA, [date(2024, 1, 2)], [ROW])
+    make_snapshot(path, cache).save()
+
+    later = time.time() + 120
+    monkeypatch.setattr("app.core.cache.time.time", lambda: later)
+    restored = PartitionCache(ttl_seconds=60)
+    assert make_snapshot(path, restored).load() == {"partitions": 0}
+    assert len(restored.entries) == 0
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "snapshot.json.gz"
+    cache = PartitionCache()
+    assert make_snapshot(path, cache).load() == {}
+
+    path.write_bytes(b"not gzip")
+    assert make_snapshot(path, cache).load() == {}
+
+    with gzip.open(path, "wt") as fh:
+        fh.write('{"version": 99, "caches": {}}')
+    assert make_snapshot(path, cache).load() == {}
+    assert len(cache.entries) == 0
+
+
+def test_availability_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_availability, "_CACHE", {})
+    payload = {"VIIRS_SNPP_NRT": ("2024-01-01", "2024-01-10")}
+    calls = []
+
+    class FakeResponse:
+        text = "data_id,min_date,max_date\nVIIRS_SNPP_NRT,2024-01-01,2024-01-10\n"
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(data_availability.requests, "get", fake_get)
+    assert data_availability.check_data_availability("secret-map-key") == payload
+
+    path = tmp_path / "snapshot.json.gz"
+    snapshot = CacheSnapshot(path)
+    snapshot.register("availability", data_availability.dump_cache, data_availability.restore_cache)
+    snapshot.save()
+    with gzip.open(path, "rt") as fh:
+        assert "secret-map-key" not in fh.read()
+
+    data_availability._CACHE.clear()
+    assert snapshot.load() == {"availability": 1}
+    assert data_availability.check_data_availability("secret-map-key") == payload
+    assert len(calls) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.fires import FireService
+from app.services.warmup import CacheWarmer
+
+
+@pytest.fixture(autouse=True)
+def mock_map_key(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "firms_map_key", "mock-key")
+
+
+@pytest.mark.asyncio
+async def test_warmer_fetches_regions_and_refreshes(monkeypatch):
+    service = FireService()
+    fetched = []
+
+    async def fake_to_thread(func, *args, **kwargs):
+        if func.__name__ == "load_countries":
+            return {}
+        return {"VIIRS_SNPP_NRT": ("2000-01-01", "2999-12-31")}
+
+    async def fake_fetch(ctx, max_concurrency=None):
+        fetched.append((ctx.area, len(ctx.upstream_days), max_concurrency))
+        service.partitions.store(ctx.selected_source, ctx.area, ctx.upstream_days, [])
+        return []
+
+    monkeypatch.setattr("app.services.fires.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(service, "fetch", fake_fetch)
+
+    warmer = CacheWarmer(service, regions=["USA", "BRA", "ZZZ"], days=3, interval=0, pause=0)
+    assert warmer.status()["state"] == "pending"
+    await warmer.run_once()
+    status = warmer.status()
+    assert status["state"] == "idle" and status["regions_done"] == 3 and status["passes"] == 1
+    assert status["failed"] == ["ZZZ"]
+    assert [(n, c) for _, n, c in fetched] == [(3, 1), (3, 1)]
+
+    # Warmed days are cached; a refresh pass still goes upstream
+    await warmer.run_once()
+    assert len(fetched) == 2
+    await warmer.run_once(refresh=True)
+    assert len(fetched) == 4
@@ -1,13 +1,74 @@
 import csv
+import hashlib
 import threading
 import time
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Tuple, Optional
 
 import requests
 
+from .urlbuilder import BASE_URL
+
 _CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Tuple[str, str]]]] = {}
 _CACHE_TTL_SECONDS = 600
 _CACHE_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters of the availability cache."""
+    return dict(_STATS)
+
+
+def cache_ages() -> List[float]:
+    """Seconds since each cached availability response was stored."""
+    now = time.time()
+    with _CACHE_LOCK:
+        return [now - stamp for stamp, _ in _CACHE.values()]
+
+
+def cache_ttl() -> int:
+    return _CACHE_TTL_SECONDS
+
+
+def set_cache_ttl(seconds: int) -> None:
+    """Override the default TTL at runtime; applies to entries already cached."""
+    global _CACHE_TTL_SECONDS
+    _CACHE_TTL_SECONDS = seconds
+
+
+def clear_cache(sensor: Optional[str] = None) -> int:
+    """Drop cached responses, all or those for ``sensor`` plus ``ALL``; returns how many."""
+    with _CACHE_LOCK:
+        doomed = [key for key in _CACHE if sensor is None or key[1] in (sensor.upper(), "ALL")]
+        for key in doomed:
+            del _CACHE[key]
+    return len(doomed)
+
+
+def dump_cache() -> List[List[Any]]:
+    """Cache entries as ``[key_digest, sensor, stored_at, payload]`` for snapshots."""
+    with _CACHE_LOCK:
+        return [[key[0], key[1], stamp, _clone(payload)] for key, (stamp, payload) in _CACHE.items()]
+
+
+def restore_cache(entries: Iterable[List[Any]], ttl_seconds: Optional[int] = None) -> int:
+    """Load snapshot entries that are still within ``ttl_seconds``; newer entries win."""
+    ttl_seconds = _CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    now = time.time()
+    restored = 0
+    with _CACHE_LOCK:
+        for key_digest, sensor, stamp, payload in entries:
+            key = (key_digest, sensor)
+            if now - stamp > ttl_seconds or (key in _CACHE and _CACHE[key][0] >= stamp):
+                continue
+            _CACHE[key] = (stamp, {k: (v[0], v[1]) for k, v in payload.items()})
+            restored += 1
+    return restored
+
+
+def _key_digest(map_key: str) -> str:
+    """Cache keys hold a digest of the MAP_KEY so snapshots never contain the credential."""
+    return hashlib.sha256(map_key.encode("utf-8")).hexdigest()
 
 
 def _clone(data: Dict[str, Tuple[str, str]]) -> Dict[str, Tuple[str, str]]:
@@ -24,7 +85,8 @@ def _get_cached(key: Tuple[str, str], ttl_seconds: int) -> Optional[Dict[str, Tu
     timestamp, payload = cached
     if now - timestamp > ttl_seconds:
         with _CACHE_LOCK:
-            _CACHE.pop(key, None)
+            if _CACHE.pop(key, None) is not None:
+                _STATS["evictions"] += 1
         return None
     return _clone(payload)
 
@@ -46,7 +108,8 @@ def check_data_availability(
     sensor: str = "ALL",
     *,
     force_refresh: bool = False,
-    cache_ttl: int = _CACHE_TTL_SECONDS,
+    cache_ttl: Optional[int] = None,
+    base_url: str = BASE_URL,
 ) -> Dict[str, Tuple[str, str]]:
     """Return available date ranges for given sensor(s).
 
@@ -58,8 +121,11 @@ def check_data_availability(
         Sensor dataset identifier or "ALL" for all datasets.
     force_refresh: bool, default False
         When True, bypass any cached entry and fetch from FIRMS.
-    cache_ttl: int, default 600
-        Time-to-live for cached availability responses (seconds).
+    cache_ttl: int, optional
+        Time-to-live for cached availability responses (seconds); defaults
+        to the module TTL (600 unless changed by ``set_cache_ttl``).
+    base_url: str, default FIRMS API root
+        API root, e.g. a local FIRMS emulator for load tests.
 
     Returns
     -------
@@ -67,14 +133,16 @@ def check_data_availability(
         Mapping of dataset id to (min_date, max_date).
     """
     normalized_sensor = sensor.upper() if sensor else "ALL"
-    cache_key = (map_key, normalized_sensor)
+    cache_key = (_key_digest(map_key), normalized_sensor)
 
     if not force_refresh:
-        cached = _get_cached(cache_key, cache_ttl)
+        cached = _get_cached(cache_key, _CACHE_TTL_SECONDS if cache_ttl is None else cache_ttl)
         if cached is not None:
+            _STATS["hits"] += 1
             return cached
+    _STATS["misses"] += 1
 
-    url = f"https://firms.modaps.eosdis.nasa.gov/api/data_availability/csv/{map_key}/{normalized_sensor}"
+    url = f"{base_url.rstrip('/')}/data_availability/csv/{map_key}/{normalized_sensor}"
     try:
         resp = requests.get(url, timeout=30)
         resp.raise_for_status()
@@ -1,10 +1,6 @@
 from collections import OrderedDict
 from datetime import date, timedelta
 from typing import List, Dict, Any, Optional
-import re
-
-# ISO date format regex (YYYY-MM-DD)
-ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 def bucket_by_date(
     rows: Optional[List[Dict[str, Any]]],
@@ -38,19 +34,19 @@ def bucket_by_date(
         bucket[cur.isoformat()] = []
         cur += timedelta(days=1)
         
-    # Fill data
+    # Fill data in one pass; the bucket keys are exactly the valid ISO dates
+    # in range, so a key lookup also rejects missing or malformed dates.
+    get = bucket.get
     for row in rows:
         if not isinstance(row, dict):
             raise TypeError(f"expected dict, got {type(row)}")
-            
+
         acq_date = row.get("acq_date")
-        if not acq_date:
-            continue  # Skip records without date
-            
-        if not isinstance(acq_date, str) or not ISO_DATE_RE.match(acq_date):
-            continue  # Skip records with incorrect date format
-            
-        if acq_date in bucket:
-            bucket[acq_date].append(row)
-            
-    return bucket 
\ No newline at end of file
+        if type(acq_date) is not str:
+            continue  # Skip records without a string date
+
+        target = get(acq_date)
+        if target is not None:
+            target.append(row)
+
+    return bucket
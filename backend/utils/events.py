@@ -0,0 +1,233 @@
+"""Group fire detections into events by space-time adjacency.
+
+Two detections belong to the same event when a chain of detections links
+them, each step at most ``distance_km`` apart and ``gap_hours`` apart in
+time. Detections are hashed into space-time cells small enough that all
+members of a cell are adjacent, so a cell is one component from the start
+and only neighbouring cells need distance checks. Cells are joined with a
+vectorised union-find (hooking plus pointer jumping), which keeps the whole
+pass near linear in the number of detections. Longitudes are not wrapped
+across the antimeridian.
+
+Cells are at most ``distance_km / sqrt(2)`` on each side at every latitude:
+the longitude step is sized for the equator, where a degree is widest, so
+cells only get narrower poleward. How many cells east and west a neighbour
+can be therefore grows with latitude and is worked out per latitude band.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON = 111.320
+# Bounds the longitude reach near the poles
+MIN_COS_LAT = 0.01
+# Cells span distance/sqrt(2) north-south, so neighbours are at most two bands away
+REACH = 2
+# Upper bound on candidate point pairs checked at once
+PAIR_CHUNK = 1_000_000
+# date.toordinal() of 1970-01-01, the datetime64 epoch
+EPOCH_ORDINAL = 719163
+
+
+def _column(rows: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """One record field as float64, NaN where missing or malformed."""
+    values = [row.get(key) for row in rows]
+    try:
+        # numpy parses numeric strings in C; None becomes NaN
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def _day_column(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """``acq_date`` as days since 1970-01-01, NaN where unparseable."""
+    days: Dict[Any, float] = {}
+    for value in {row.get("acq_date") for row in rows}:
+        try:
+            days[value] = date.fromisoformat(value).toordinal() - EPOCH_ORDINAL
+        except (TypeError, ValueError):
+            days[value] = np.nan
+    return np.asarray([days[row.get("acq_date")] for row in rows], dtype=np.float64)
+
+
+def _parse_points(records: Iterable[Dict[str, Any]]) -> Tuple[np.ndarray, ...]:
+    """Latitude, longitude, hours since 1970-01-01 and FRP of each usable record."""
+    rows = records if isinstance(records, list) else list(records)
+    lat = _column(rows, "latitude")
+    lon = _column(rows, "longitude")
+    hhmm = np.nan_to_num(_column(rows, "acq_time"), nan=0.0)
+    hours = _day_column(rows) * 24 + hhmm // 100 + (hhmm % 100) / 60
+    frp = np.nan_to_num(_column(rows, "frp"), nan=0.0, posinf=0.0, neginf=0.0)
+    usable = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(hours)
+    return lat[usable], lon[usable], hours[usable], frp[usable]
+
+
+def _components(size: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Component label (smallest member) of each node of an undirected graph."""
+    labels = np.arange(size)
+    while len(u):
+        lu, lv = labels[u], labels[v]
+        differ = lu != lv
+        if not differ.any():
+            break
+        u, v = u[differ], v[differ]
+        lo, hi = np.minimum(lu[differ], lv[differ]), np.maximum(lu[differ], lv[differ])
+        # Hook each root under the smallest root it touches, then flatten the trees
+        np.minimum.at(labels, hi, lo)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+
+def group_events(
+    records: Iterable[Dict[str, Any]],
+    distance_km: float = 1.0,
+    gap_hours: float = 24.0,
+    min_count: int = 1,
+) -> List[Dict[str, Any]]:
+    """Cluster ``records`` into events, largest total FRP first.
+
+    Each event has its footprint ``bbox`` (west, south, east, north),
+    ``first_seen``/``last_seen`` (UTC, minute precision), ``count`` and
+    ``frp`` (sum). Events with fewer than ``min_count`` detections are
+    dropped. Rows without coordinates or a parseable date are skipped.
+    """
+    if distance_km <= 0 or gap_hours <= 0:
+        raise ValueError("distance_km and gap_hours must be positive")
+    lat, lon, hours, frp = _parse_points(records)
+    n = len(lat)
+    if n == 0:
+        return []
+
+    # Square cells at the equator and narrower ones poleward, never wider than side km
+    side = distance_km / math.sqrt(2)
+    step_lat = side / KM_PER_DEG_LAT
+    step_lon = side / KM_PER_DEG_LON
+
+    # Cells east/west a neighbour may be in a band: a pair within the distance spans at
+    # most sqrt(2) / cos(lat) cells, taking the latitude at the poleward edge of the bands
+    # within REACH, where the pair's midpoint can lie
+    band = np.floor((lat - lat.min()) / step_lat)
+    edge = lat.min() + band * step_lat
+    band_lat = np.maximum(np.abs(edge), np.abs(edge + step_lat)) + REACH * step_lat
+    cos_lat = np.maximum(MIN_COS_LAT, np.cos(np.radians(np.minimum(90.0, band_lat))))
+    point_reach = (np.floor(math.sqrt(2) / cos_lat) + 1).astype(np.int64)
+    reach_x = int(point_reach.max())
+
+    # Padding keeps every neighbour offset inside the key space, so keys never wrap
+    iy = band.astype(np.int64) + REACH
+    ix = np.floor((lon - lon.min()) / step_lon).astype(np.int64) + reach_x
+    it = np.floor((hours - hours.min()) / gap_hours).astype(np.int64) + 1
+    nx, nt = int(ix.max()) + reach_x + 1, int(it.max()) + 2
+    key = (iy * nx + ix) * nt + it
+
+    order = np.argsort(key, kind="stable")
+    key, lat, lon, hours, frp = key[order], lat[order], lon[order], hours[order], frp[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(key)) + 1))
+    counts = np.diff(np.append(starts, n))
+    cells = key[starts]
+    # Cells by decreasing reach, so the cells needing an offset are a prefix
+    cell_reach = point_reach[order][starts]
+    by_reach = np.argsort(-cell_reach, kind="stable")
+    reach_sorted = cell_reach[by_reach]
+
+    limit_sq = distance_km * distance_km
+    edge_u: List[np.ndarray] = []
+    edge_v: List[np.ndarray] = []
+
+    def link(a: np.ndarray, b: np.ndarray) -> None:
+        """Record an edge for every cell pair with at least one adjacent point pair."""
+        reps = counts[a] * counts[b]
+        total = np.cumsum(reps)
+        first = 0
+        while first < len(a):
+            base = total[first] - reps[first]
+            last = max(first + 1, int(np.searchsorted(total, base + PAIR_CHUNK, side="right")))
+            ca, cb, cr = a[first:last], b[first:last], reps[first:last]
+            pair = np.repeat(np.arange(len(ca)), cr)
+            k = np.arange(int(cr.sum())) - np.repeat(np.cumsum(cr) - cr, cr)
+            pa = starts[ca][pair] + k // counts[cb][pair]
+            pb = starts[cb][pair] + k % counts[cb][pair]
+            dy = (lat[pa] - lat[pb]) * KM_PER_DEG_LAT
+            dx = (lon[pa] - lon[pb]) * KM_PER_DEG_LON * np.cos(np.radians((lat[pa] + lat[pb]) / 2))
+            close = (dx * dx + dy * dy <= limit_sq) & (np.abs(hours[pa] - hours[pb]) <= gap_hours)
+            linked = np.unique(pair[close])
+            edge_u.append(ca[linked])
+            edge_v.append(cb[linked])
+            first = last
+
+    for dx in range(-reach_x, reach_x + 1):
+        # Only cells in bands whose reach covers this many cells east or west
+        source = by_reach[: int(np.count_nonzero(reach_sorted >= abs(dx)))]
+        for dy in range(-REACH, REACH + 1):
+            for dt in (-1, 0, 1):
+                offset = (dy * nx + dx) * nt + dt
+                # Each unordered pair of cells once; the cell itself is already one component
+                if offset <= 0:
+                    continue
+                target = cells[source] + offset
+                pos = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+                hit = np.flatnonzero(cells[pos] == target)
+                if len(hit):
+                    link(source[hit], pos[hit])
+
+    u = np.concatenate(edge_u) if edge_u else np.empty(0, dtype=np.int64)
+    v = np.concatenate(edge_v) if edge_v else np.empty(0, dtype=np.int64)
+    labels = _components(len(cells), u, v)
+    _, event_of = np.unique(np.repeat(labels, counts), return_inverse=True)
+    size = int(event_of.max()) + 1
+
+    count = np.bincount(event_of, minlength=size)
+    total_frp = np.round(np.bincount(event_of, weights=frp, minlength=size), 3)
+    bounds = {}
+    for name, values in (("west", lon), ("south", lat), ("first", hours)):
+        low = np.full(size, np.inf)
+        np.minimum.at(low, event_of, values)
+        bounds[name] = low
+    for name, values in (("east", lon), ("north", lat), ("last", hours)):
+        high = np.full(size, -np.inf)
+        np.maximum.at(high, event_of, values)
+        bounds[name] = high
+
+    def stamps(values: np.ndarray) -> List[str]:
+        minutes = np.round(values * 60).astype("datetime64[m]")
+        return [stamp + "Z" for stamp in np.datetime_as_string(minutes, unit="m").tolist()]
+
+    rank = np.lexsort((bounds["first"], -total_frp))
+    rank = rank[count[rank] >= min_count]
+    columns = zip(
+        bounds["west"][rank].tolist(),
+        bounds["south"][rank].tolist(),
+        bounds["east"][rank].tolist(),
+        bounds["north"][rank].tolist(),
+        stamps(bounds["first"][rank]),
+        stamps(bounds["last"][rank]),
+        count[rank].tolist(),
+        total_frp[rank].tolist(),
+    )
+    return [
+        {
+            "id": number,
+            "bbox": [west, south, east, north],
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "count": size,
+            "frp": total,
+        }
+        for number, (west, south, east, north, first_seen, last_seen, size, total) in enumerate(columns, 1)
+    ]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from .geojson import _normalize_confidence, _parse_float
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# Same class boundaries as the frontend's confidence filter (filterUtils.ts).
+CONFIDENCE_LEVELS = {"low": 0, "l": 0, "nominal": 30, "n": 30, "medium": 30, "m": 30, "high": 80, "h": 80}
+
+HHMM_RE = re.compile(r"^([01]\d|2[0-3])[0-5]\d$")
+
+
+def parse_confidence(raw: Optional[str]) -> Optional[int]:
+    """Parse ``minConfidence``: a 0-100 number or a low/nominal/high label."""
+    if raw is None or not raw.strip():
+        return None
+    text = raw.strip().lower()
+    if text.isdigit():
+        return max(0, min(100, int(text)))
+    if text in CONFIDENCE_LEVELS:
+        return CONFIDENCE_LEVELS[text]
+    raise ValueError("minConfidence must be 0-100 or one of low, nominal, high")
+
+
+def parse_time(raw: Optional[str], name: str) -> Optional[int]:
+    """Parse an ``HHMM`` (UTC) time-of-day bound into minutes past midnight."""
+    if raw is None or not raw.strip():
+        return None
+    text = raw.strip().replace(":", "")
+    if not HHMM_RE.match(text):
+        raise ValueError(f"{name} must be HHMM (UTC)")
+    return int(text[:2]) * 60 + int(text[2:])
+
+
+def _minutes(acq_time: Any) -> Optional[int]:
+    text = str(acq_time or "").strip().zfill(4)
+    if not text.isdigit():
+        return None
+    return int(text[:-2]) * 60 + int(text[-2:])
+
+
+@dataclass(frozen=True)
+class RecordFilter:
+    """Server-side filters for FIRMS records.
+
+    ``compile`` turns the non-empty criteria into a single predicate, so rows
+    can be dropped before deduplication and serialization.
+    """
+
+    min_confidence: Optional[int] = None
+    min_frp: Optional[float] = None
+    max_frp: Optional[float] = None
+    daynight: Optional[str] = None
+    satellites: Optional[FrozenSet[str]] = None
+    # Minutes past midnight UTC; a window with time_from > time_to wraps midnight
+    time_from: Optional[int] = None
+    time_to: Optional[int] = None
+
+    def compile(self) -> Optional[Predicate]:
+        """Return a predicate for the active criteria, or ``None`` when nothing filters."""
+        checks: List[Predicate] = []
+
+        if self.min_confidence:
+            threshold = self.min_confidence
+
+            def confidence_ok(row: Dict[str, Any]) -> bool:
+                value = _normalize_confidence(row.get("confidence"))
+                return value is not None and value >= threshold
+
+            checks.append(confidence_ok)
+
+        if self.min_frp is not None or self.max_frp is not None:
+            low = self.min_frp if self.min_frp is not None else float("-inf")
+            high = self.max_frp if self.max_frp is not None else float("inf")
+
+            def frp_ok(row: Dict[str, Any]) -> bool:
+                # Missing FRP counts as 0, as in the frontend filter
+                value = _parse_float(row.get("frp"))
+                return low <= (value if value is not None else 0.0) <= high
+
+            checks.append(frp_ok)
+
+        if self.daynight:
+            wanted = self.daynight.upper()
+            checks.append(lambda row: str(row.get("daynight") or "").upper() == wanted)
+
+        if self.satellites:
+            satellites = frozenset(s.upper() for s in self.satellites)
+            checks.append(lambda row: str(row.get("satellite") or "").upper() in satellites)
+
+        if self.time_from is not None or self.time_to is not None:
+            start = self.time_from if self.time_from is not None else 0
+            end = self.time_to if self.time_to is not None else 24 * 60 - 1
+            wraps = start > end
+
+            def time_ok(row: Dict[str, Any]) -> bool:
+                minutes = _minutes(row.get("acq_time"))
+                if minutes is None:
+                    return False
+                if wraps:
+                    return minutes >= start or minutes <= end
+                return start <= minutes <= end
+
+            checks.append(time_ok)
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda row: all(check(row) for check in checks)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 CONFIDENCE_MAP = {
     "l": 0,
@@ -42,46 +42,150 @@ def _combine_datetime(date_str: str | None, time_str: str | None) -> str | None:
         return None
 
 
-def to_geojson(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _brightness(row: Dict[str, Any]) -> float | None:
+    # Prefer TI4 then TI5
+    bright_ti4 = _parse_float(row.get("bright_ti4"))
+    return bright_ti4 if bright_ti4 is not None else _parse_float(row.get("bright_ti5"))
+
+
+# Feature properties in output order; each is only computed when requested.
+PROPERTY_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    # Normalized/derived fields
+    "brightness": _brightness,
+    "frp": lambda row: _parse_float(row.get("frp")),
+    "satellite": lambda row: row.get("satellite"),
+    "instrument": lambda row: row.get("instrument"),
+    "daynight": lambda row: row.get("daynight"),
+    "source": lambda row: row.get("source"),
+    "country_id": lambda row: row.get("country_id"),
+    "confidence": lambda row: _normalize_confidence(row.get("confidence")),
+    "confidence_text": lambda row: row.get("confidence"),
+    "acq_datetime": lambda row: _combine_datetime(row.get("acq_date"), row.get("acq_time")),
+    # Raw fields preserved for UI components
+    "acq_date": lambda row: row.get("acq_date"),
+    "acq_time": lambda row: row.get("acq_time"),
+    "bright_ti4": lambda row: row.get("bright_ti4"),
+    "bright_ti5": lambda row: row.get("bright_ti5"),
+}
+
+# Raw record fields, as produced by the FIRMS client.
+RECORD_FIELDS = (
+    "latitude",
+    "longitude",
+    "bright_ti4",
+    "bright_ti5",
+    "frp",
+    "acq_date",
+    "acq_time",
+    "confidence",
+    "satellite",
+    "instrument",
+    "daynight",
+    "country_id",
+    "source",
+)
+
+FIELD_ALIASES = {"lat": "latitude", "lon": "longitude", "lng": "longitude"}
+
+
+def parse_fields(raw: str | None) -> Tuple[str, ...] | None:
+    """Parse a comma-separated ``fields=`` value into canonical field names.
+
+    Returns ``None`` when no projection is requested; raises ``ValueError``
+    naming any unknown field.
+    """
+    if raw is None or not raw.strip():
+        return None
+    names: List[str] = []
+    unknown: List[str] = []
+    for part in raw.split(","):
+        name = part.strip()
+        if not name:
+            continue
+        name = FIELD_ALIASES.get(name.lower(), name)
+        if name not in PROPERTY_BUILDERS and name not in RECORD_FIELDS:
+            unknown.append(part.strip())
+        elif name not in names:
+            names.append(name)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(names)
+
+
+def _round_coord(value: Any, precision: int | None) -> float | None:
+    number = _parse_float(value)
+    if number is None or precision is None:
+        return number
+    return round(number, precision)
+
+
+def to_geojson(
+    records: List[Dict[str, Any]],
+    fields: Sequence[str] | None = None,
+    precision: int | None = None,
+    id_of: Callable[[Dict[str, Any]], Any] | None = None,
+) -> Dict[str, Any]:
     """Convert FIRMS records to GeoJSON FeatureCollection.
 
     Includes commonly used raw fields to maximize frontend compatibility.
+    ``fields`` limits the properties that are built (coordinates always form
+    the geometry); ``precision`` rounds coordinates to that many decimals.
+    ``id_of`` sets each feature's ``id``.
     """
+    if fields is None:
+        builders = list(PROPERTY_BUILDERS.items())
+    else:
+        builders = [(name, PROPERTY_BUILDERS[name]) for name in fields if name in PROPERTY_BUILDERS]
     features: List[Dict[str, Any]] = []
     for row in records:
-        lat = _parse_float(row.get("latitude"))
-        lon = _parse_float(row.get("longitude"))
+        lat = _round_coord(row.get("latitude"), precision)
+        lon = _round_coord(row.get("longitude"), precision)
         if lat is None or lon is None:
             continue
 
-        # Brightness fields (prefer TI4 then TI5)
-        bright_ti4 = _parse_float(row.get("bright_ti4"))
-        bright_ti5 = _parse_float(row.get("bright_ti5"))
-        brightness = bright_ti4 if bright_ti4 is not None else bright_ti5
-
-        properties: Dict[str, Any] = {
-            # Normalized/derived fields
-            "brightness": brightness,
-            "frp": _parse_float(row.get("frp")),
-            "satellite": row.get("satellite"),
-            "instrument": row.get("instrument"),
-            "daynight": row.get("daynight"),
-            "source": row.get("source"),
-            "country_id": row.get("country_id"),
-            "confidence": _normalize_confidence(row.get("confidence")),
-            "confidence_text": row.get("confidence"),
-            "acq_datetime": _combine_datetime(row.get("acq_date"), row.get("acq_time")),
-            # Raw fields preserved for UI components
-            "acq_date": row.get("acq_date"),
-            "acq_time": row.get("acq_time"),
-            "bright_ti4": row.get("bright_ti4"),
-            "bright_ti5": row.get("bright_ti5"),
-        }
-
         feature = {
             "type": "Feature",
             "geometry": {"type": "Point", "coordinates": [lon, lat]},
-            "properties": properties,
+            "properties": {name: build(row) for name, build in builders},
         }
+        if id_of is not None:
+            feature["id"] = id_of(row)
         features.append(feature)
     return {"type": "FeatureCollection", "features": features}
+
+
+def project_records(
+    records: List[Dict[str, Any]],
+    fields: Sequence[str] | None = None,
+    precision: int | None = None,
+    id_of: Callable[[Dict[str, Any]], Any] | None = None,
+) -> List[Dict[str, Any]]:
+    """Apply ``fields``/``precision`` to plain-JSON records.
+
+    Raw record fields keep their original values; derived property names such
+    as ``acq_datetime`` are computed with the GeoJSON builders. Rounded
+    coordinates stay strings, like the rest of the raw record. ``id_of`` adds
+    an ``id`` key to each record.
+    """
+    if fields is None and precision is None and id_of is None:
+        return records
+    names = list(fields) if fields is not None else None
+    result: List[Dict[str, Any]] = []
+    for row in records:
+        if names is None:
+            out = dict(row)
+        else:
+            out = {
+                name: row.get(name) if name in RECORD_FIELDS else PROPERTY_BUILDERS[name](row)
+                for name in names
+            }
+        if precision is not None:
+            for coord in ("latitude", "longitude"):
+                if coord in out:
+                    number = _round_coord(out[coord], precision)
+                    if number is not None:
+                        out[coord] = str(number)
+        if id_of is not None:
+            out["id"] = id_of(row)
+        result.append(out)
+    return result
@@ -1,18 +1,39 @@
 from fastapi import HTTPException
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 class HTTPExceptionFactory:
     """Factory to create HTTPException with unified structure."""
 
     @staticmethod
-    def create(status_code: int, message: str, details: Optional[Any] = None) -> HTTPException:
-        return HTTPException(status_code, {"code": status_code, "message": message, "details": details})
+    def create(
+        status_code: int, message: str, details: Optional[Any] = None, headers: Optional[Dict[str, str]] = None
+    ) -> HTTPException:
+        return HTTPException(status_code, {"code": status_code, "message": message, "details": details}, headers)
 
     @classmethod
     def bad_request(cls, message: str, details: Optional[Any] = None) -> HTTPException:
         return cls.create(400, message, details)
 
+    @classmethod
+    def unauthorized(cls, message: str, details: Optional[Any] = None) -> HTTPException:
+        return cls.create(401, message, details)
+
+    @classmethod
+    def not_found(cls, message: str, details: Optional[Any] = None) -> HTTPException:
+        return cls.create(404, message, details)
+
+    @classmethod
+    def gone(cls, message: str, details: Optional[Any] = None) -> HTTPException:
+        return cls.create(410, message, details)
+
+    @classmethod
+    def too_many_requests(
+        cls, message: str, details: Optional[Any] = None, retry_after: Optional[int] = None
+    ) -> HTTPException:
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        return cls.create(429, message, details, headers)
+
     @classmethod
     def bad_gateway(cls, message: str, details: Optional[Any] = None) -> HTTPException:
         return cls.create(502, message, details)
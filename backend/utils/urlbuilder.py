@@ -35,6 +35,7 @@ def build_country_url(
     country: str,
     day_range: int,
     start: Optional[date] = None,
+    base_url: str = BASE_URL,
 ) -> str:
     """构造 Country 查询的 URL。
 
@@ -44,6 +45,7 @@ def build_country_url(
         country: ISO‑3 国家代码。
         day_range: 查询的天数范围（1-10）。
         start: 起始日期，未提供则使用默认（今日）数据。
+        base_url: API 根地址，默认为 NASA FIRMS，可指向本地模拟服务。
 
     Returns:
         拼接好的 URL 字符串。
@@ -55,7 +57,7 @@ def build_country_url(
     path = f"/country/csv/{map_key}/{params.source.value}/{params.country}/{params.day_range}"
     if params.start:
         path += f"/{params.start.isoformat()}"
-    return BASE_URL + path
+    return base_url.rstrip("/") + path
 
 
 def build_area_url(
@@ -64,6 +66,7 @@ def build_area_url(
     area: Union[str, Tuple[float, float, float, float]],
     day_range: int,
     start: Optional[date] = None,
+    base_url: str = BASE_URL,
 ) -> str:
     """构造 Area 查询的 URL。
 
@@ -73,6 +76,7 @@ def build_area_url(
         area: 传入 "world" 或 `(west, south, east, north)` 元组。
         day_range: 查询的天数范围（1-10）。
         start: 起始日期，未提供则使用默认（今日）数据。
+        base_url: API 根地址，默认为 NASA FIRMS，可指向本地模拟服务。
 
     Returns:
         拼接好的 URL 字符串。
@@ -90,7 +94,7 @@ def build_area_url(
     path = f"/area/csv/{map_key}/{params.source.value}/{area_part}/{params.day_range}"
     if params.start:
         path += f"/{params.start.isoformat()}"
-    return BASE_URL + path
+    return base_url.rstrip("/") + path
 
 
 def compose_urls(
@@ -100,6 +104,7 @@ def compose_urls(
     end: date,
     country: Optional[str] = None,
     area: Union[Tuple[float, float, float, float], str, None] = None,
+    base_url: str = BASE_URL,
 ) -> List[str]:
     """根据日期区间生成一组请求 URL。
 
@@ -112,6 +117,7 @@ def compose_urls(
         end: 结束日期（包含）。
         country: ISO‑3 国家代码，与 `area` 二选一。
         area: "world" 或 `(west, south, east, north)`，与 `country` 二选一。
+        base_url: API 根地址，默认为 NASA FIRMS。
 
     Returns:
         覆盖整个日期区间的 URL 列表。
@@ -124,7 +130,7 @@ def compose_urls(
     for seg_start, seg_end in split_date_range(start, end):
         day_range = (seg_end - seg_start).days + 1
         if country:
-            url = build_country_url(map_key, source, country, day_range, seg_start)
+            url = build_country_url(map_key, source, country, day_range, seg_start, base_url)
         else:
             url = build_area_url(
                 map_key,
@@ -132,6 +138,7 @@ def compose_urls(
                 area,
                 day_range,
                 seg_start,
+                base_url,
             )  # type: ignore[arg-type]
         urls.append(url)
 